@@ -0,0 +1,79 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+# 보류 항목 재시도 간격(초): RETRY_BASE_DELAY * 3^시도 (+-20% 흔들림), 최대 RETRY_MAX_DELAY
+RETRY_BASE_DELAY = 10.0
+RETRY_MAX_DELAY = 120.0
+RETRY_MAX_ATTEMPTS = 3
+
+
+class AIRetryQueue:
+    """AI 생성에 실패한 항목을 백그라운드에서 다시 생성한다
+
+    add(item, generate)로 넣으면 메인 루프가 다음 대상을 처리하는 동안 같은 이벤트 루프에서
+    backoff를 두고 generate()를 다시 부른다 (동시에 하나씩, 할당량은 생성기의 limiter가 관리).
+    성공한 항목은 item["generated"]에 결과를 넣어 ready로, 끝까지 실패한 항목은 failed로 모인다.
+    페이지를 다시 방문할 항목은 drain()이 돌려주는 ready뿐이다.
+
+        retry = AIRetryQueue(self.log)
+        retry.add(item, lambda: ai_generator.generate(title, body))
+        ...
+        ready, failed = await retry.drain()
+    """
+
+    def __init__(self, log: Callable[[str], None],
+                 max_attempts: int = RETRY_MAX_ATTEMPTS,
+                 base_delay: float = RETRY_BASE_DELAY,
+                 max_delay: float = RETRY_MAX_DELAY):
+        self.log = log
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.ready: List[dict] = []
+        self.failed: List[dict] = []
+        self._tasks: List[asyncio.Task] = []
+        self._slot = asyncio.Semaphore(1)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def pending(self) -> int:
+        return sum(1 for t in self._tasks if not t.done())
+
+    def add(self, item: dict, generate: Callable[[], Awaitable[Optional[str]]]):
+        """generate는 호출할 때마다 새 생성 코루틴을 만드는 함수"""
+        self._tasks.append(asyncio.create_task(self._retry(item, generate)))
+
+    def _delay(self, attempt: int) -> float:
+        delay = min(self.base_delay * (3 ** attempt), self.max_delay)
+        return delay * random.uniform(0.8, 1.2)
+
+    async def _retry(self, item: dict, generate: Callable[[], Awaitable[Optional[str]]]):
+        for attempt in range(self.max_attempts):
+            await asyncio.sleep(self._delay(attempt))
+            async with self._slot:
+                try:
+                    generated = await generate()
+                except Exception as e:
+                    self.log(f"  [보류 재시도] 오류: {str(e)[:80]}")
+                    generated = None
+            if generated:
+                item["generated"] = generated
+                item["attempts"] = attempt + 1
+                self.ready.append(item)
+                return
+        item["attempts"] = self.max_attempts
+        self.failed.append(item)
+
+    async def drain(self) -> Tuple[List[dict], List[dict]]:
+        """남은 재시도가 끝날 때까지 기다린 뒤 (ready, failed)를 반환"""
+        waiting = self.pending()
+        if waiting:
+            self.log(f"AI 보류 재시도 {waiting}건 완료 대기 중...")
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        return self.ready, self.failed
+
+    def cancel(self):
+        for t in self._tasks:
+            t.cancel()
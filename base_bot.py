@@ -1,9 +1,15 @@
 from playwright.async_api import async_playwright, Page, BrowserContext
 from playwright_stealth import Stealth
-from utils import HumanDelay
+from naver_urls import NaverUrls
+from run_events import EventRecorder
+from run_ledger import RunLedger
+from utils import HumanDelay, DATA_DIR
 import asyncio
+import contextlib
+import json
 import os
 import random
+import time
 from typing import Callable, Optional
 
 _USER_AGENTS = [
@@ -14,63 +20,270 @@ _USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36',
 ]
 
+# 로그인 세션 쿠키와 쿠키 확인만으로 로그인 확인을 대신할 수 있는 기간
+_LOGIN_COOKIES = ("NID_AUT", "NID_SES")
+LOGIN_VERIFY_TTL = 12 * 3600
+# 만료 직전 쿠키는 만료된 것으로 본다
+_COOKIE_EXPIRY_MARGIN = 600
+
+# scrape_only() 안에서 차단할 리소스 종류와 추적/광고 호스트 (DOM 텍스트만 필요한 탐색용)
+SCRAPE_BLOCKED_TYPES = {"image", "media", "font"}
+SCRAPE_BLOCKED_HOSTS = (
+    "wcs.naver.net", "lcs.naver.com", "nlog.naver.com", "tivan.naver.com",
+    "siape.veta.naver.com", "adcr.naver.com", "veta.naver.com",
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+)
+
+
+async def launch_context(playwright, profile_dir: str, headless: bool = False):
+    """계정 프로필로 persistent context를 띄우고 stealth를 적용한 첫 페이지와 함께 반환"""
+    os.makedirs(profile_dir, exist_ok=True)
+    context = await playwright.chromium.launch_persistent_context(
+        user_data_dir=profile_dir,
+        headless=headless,
+        args=[
+            '--disable-blink-features=AutomationControlled',
+            '--no-sandbox',
+        ],
+        viewport={'width': 1280, 'height': 900},
+        user_agent=random.choice(_USER_AGENTS),
+        locale='ko-KR',
+        timezone_id='Asia/Seoul',
+    )
+    page = context.pages[0] if context.pages else await context.new_page()
+
+    stealth = Stealth()
+    await stealth.apply_stealth_async(page)
+    return context, page
+
 
 class NaverBaseBot:
-    def __init__(self, log_callback: Callable[[str], None] = print):
+    def __init__(self, log_callback: Callable[[str], None] = print,
+                 data_dir: str = DATA_DIR,
+                 base_url: Optional[str] = None,
+                 headless: bool = False,
+                 session_manager=None,
+                 block_resources: bool = True,
+                 record_events: bool = True):
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.playwright = None
         self.log = log_callback
         self.is_running = False
+        self.data_dir = data_dir
+        # base_url 지정 시 네이버 대신 해당 서버(로컬 mock 등)로 접속
+        self.urls = NaverUrls(base_url)
+        self.headless = headless
+        self.ledger: Optional[RunLedger] = None
+        self.ledger_owner = ""
+        # SessionManager를 주면 브라우저를 빌려 쓰고 실행이 끝나도 닫지 않는다
+        self.session = session_manager
+        self._borrowed_profile: Optional[str] = None
+        # False면 scrape_only()가 아무것도 차단하지 않는다
+        self.block_resources = block_resources
+        self._scrape_only_depth = 0
+        # 구조화 이벤트: data_dir/events/*.jsonl + 메모리 집계 (record_events=False면 메모리만)
+        self.events = EventRecorder(
+            os.path.join(data_dir, "events") if record_events else None,
+            source=type(self).__name__,
+        )
+        self.last_summary: Optional[dict] = None
+
+    # ── 구조화 이벤트 ──
+
+    def event(self, event: str, message: Optional[str] = None, **fields):
+        """이벤트 기록. message가 있으면 사람이 읽는 로그로도 출력한다."""
+        self.events.emit(event, **fields)
+        if message is not None:
+            self.log(message)
+
+    @contextlib.asynccontextmanager
+    async def timed(self, phase: str, target=None, **fields):
+        """구간 소요 시간을 phase 이벤트로 기록한다.
+
+        yield되는 dict에 outcome/reason 등을 넣으면 같은 이벤트에 함께 남는다.
+        예외가 나면 outcome=error, reason=예외 클래스 이름으로 기록하고 다시 던진다.
+        """
+        result = {}
+        start = time.perf_counter()
+        try:
+            yield result
+        except Exception as e:
+            result.setdefault("outcome", "error")
+            result.setdefault("reason", type(e).__name__)
+            raise
+        finally:
+            self.events.emit("phase", target=target, phase=phase,
+                             duration=time.perf_counter() - start, **{**fields, **result})
+
+    def begin_run(self, **fields):
+        self.events.start_run(**fields)
+
+    def finish_run(self, **fields) -> dict:
+        """run_end 이벤트를 남기고 오래 걸린 단계를 로그로 요약한다"""
+        summary = self.events.end_run(**fields)
+        self.last_summary = summary
+        slowest = sorted(summary["phases"].items(), key=lambda kv: kv[1]["total_s"], reverse=True)[:5]
+        if slowest:
+            self.log("단계별 소요 시간: " + ", ".join(
+                f"{name} {st['total_s']:.1f}초/{st['count']}회" for name, st in slowest
+            ))
+        if self.events.path:
+            self.log(f"이벤트 기록: {self.events.path}")
+        return summary
+
+    def open_ledger(self, owner: str) -> RunLedger:
+        """owner: 기록을 나누는 기준. 세 봇 모두 로그인한 계정 ID(user_id)를 쓴다"""
+        self.ledger = RunLedger(os.path.join(self.data_dir, "ledger.db"))
+        self.ledger_owner = owner
+        return self.ledger
+
+    def close_ledger(self):
+        if self.ledger:
+            self.ledger.close()
+            self.ledger = None
 
     async def start_browser(self, user_id: str = "default"):
-        profile_dir = os.path.join(
-            os.path.expanduser("~"), ".naver_automation", "profiles", user_id
-        )
-        os.makedirs(profile_dir, exist_ok=True)
-
-        self.playwright = await async_playwright().start()
-        user_agent = random.choice(_USER_AGENTS)
-        self.context = await self.playwright.chromium.launch_persistent_context(
-            user_data_dir=profile_dir,
-            headless=False,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--no-sandbox',
-            ],
-            viewport={'width': 1280, 'height': 900},
-            user_agent=user_agent,
-            locale='ko-KR',
-            timezone_id='Asia/Seoul',
-        )
-        self.page = self.context.pages[0] if self.context.pages else await self.context.new_page()
+        async with self.timed("browser_start", target=user_id) as result:
+            result["outcome"] = await self._start_browser(user_id)
 
-        stealth = Stealth()
-        await stealth.apply_stealth_async(self.page)
+    async def _start_browser(self, user_id: str) -> str:
+        profile_dir = os.path.join(self.data_dir, "profiles", user_id)
 
-        self.log(f"브라우저 시작됨 (프로필: {user_id})")
+        if self.session:
+            self.context, self.page, reused = await self.session.borrow(
+                user_id, profile_dir, self.headless
+            )
+            self._borrowed_profile = user_id
+            if reused:
+                self.log(f"기존 브라우저 재사용 (프로필: {user_id})")
+            else:
+                self.log(f"브라우저 시작됨 (프로필: {user_id})")
+        else:
+            reused = False
+            self.playwright = await async_playwright().start()
+            self.context, self.page = await launch_context(self.playwright, profile_dir, self.headless)
+            self.log(f"브라우저 시작됨 (프로필: {user_id})")
         self.log("⚠️  주의: 실행 중 Cmd+W / Ctrl+W를 누르지 마세요. 브라우저가 종료됩니다.")
+        return "reused" if reused else "launched"
 
     async def close_browser(self):
+        if self._borrowed_profile:
+            await self.session.give_back(self._borrowed_profile)
+            self._borrowed_profile = None
+            self.context = None
+            self.page = None
+            self.log("브라우저 유지됨 (다음 실행에서 재사용)")
+            return
         if self.context:
             await self.context.close()
         if self.playwright:
             await self.playwright.stop()
         self.log("브라우저 종료됨")
 
+    async def _block_scrape_resources(self, route):
+        request = route.request
+        if (request.resource_type in SCRAPE_BLOCKED_TYPES
+                or any(host in request.url for host in SCRAPE_BLOCKED_HOSTS)):
+            await route.abort()
+        else:
+            await route.fallback()
+
+    @contextlib.asynccontextmanager
+    async def scrape_only(self):
+        """DOM 텍스트만 읽는 탐색 구간. 이미지/미디어/폰트/추적 스크립트 요청을 차단한다.
+
+        클릭/입력이 필요한 페이지(글 본문, 공감, 댓글 작성)는 이 구간 밖에서 연다.
+        """
+        if not self.block_resources or self.context is None:
+            yield
+            return
+        self._scrape_only_depth += 1
+        if self._scrape_only_depth == 1:
+            await self.context.route("**/*", self._block_scrape_resources)
+        try:
+            yield
+        finally:
+            self._scrape_only_depth -= 1
+            if self._scrape_only_depth == 0:
+                try:
+                    await self.context.unroute("**/*", self._block_scrape_resources)
+                except Exception:
+                    pass
+
     async def check_login_status(self) -> bool:
-        await self.page.goto('https://www.naver.com')
+        await self.page.goto(self.urls.home)
         await HumanDelay.page_load()
         login_btn = await self.page.query_selector('a.MyView-module__link_login___HpHMW')
         return login_btn is None
 
+    # ── 로그인 확인 캐시 ──
+
+    def _login_state_path(self) -> str:
+        return os.path.join(self.data_dir, "login_state.json")
+
+    def _load_login_state(self) -> dict:
+        try:
+            with open(self._login_state_path(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_login_verified(self, user_id: str, verified: bool = True):
+        state = self._load_login_state()
+        if verified:
+            state[user_id] = {"verified_at": time.time()}
+        else:
+            state.pop(user_id, None)
+        try:
+            os.makedirs(self.data_dir, exist_ok=True)
+            with open(self._login_state_path(), "w", encoding="utf-8") as f:
+                json.dump(state, f)
+        except OSError:
+            pass
+
+    async def _has_login_cookies(self) -> bool:
+        """NID_AUT/NID_SES 쿠키가 모두 있고 만료되지 않았는지"""
+        try:
+            cookies = await self.context.cookies(self.urls.home)
+        except Exception:
+            return False
+        now = time.time()
+        valid = set()
+        for c in cookies:
+            if c.get("name") not in _LOGIN_COOKIES or not c.get("value"):
+                continue
+            expires = c.get("expires", -1)
+            # -1은 세션 쿠키 (브라우저가 살아 있는 동안 유효)
+            if expires == -1 or expires > now + _COOKIE_EXPIRY_MARGIN:
+                valid.add(c["name"])
+        return valid == set(_LOGIN_COOKIES)
+
+    async def _login_cached(self, user_id: str) -> bool:
+        """쿠키가 살아 있고 최근(LOGIN_VERIFY_TTL 이내)에 페이지로 로그인을 확인했으면 True"""
+        entry = self._load_login_state().get(user_id)
+        if not entry or time.time() - entry.get("verified_at", 0) > LOGIN_VERIFY_TTL:
+            return False
+        return await self._has_login_cookies()
+
     async def ensure_login(self, user_id: str):
+        async with self.timed("login", target=user_id) as result:
+            result["outcome"] = await self._ensure_login(user_id)
+
+    async def _ensure_login(self, user_id: str) -> str:
+        """로그인 보장. 확인 방법을 반환: cookie / page / manual"""
+        if await self._login_cached(user_id):
+            self.log("로그인 상태 확인됨 (쿠키 확인, 페이지 확인 생략)")
+            return "cookie"
+
         if await self.check_login_status():
+            self._save_login_verified(user_id)
             self.log("로그인 상태 확인됨 (기존 세션 유지)")
-            return
+            return "page"
+        self._save_login_verified(user_id, verified=False)
 
         self.log("로그인이 필요합니다. 브라우저에서 직접 로그인해주세요.")
-        await self.page.goto('https://nid.naver.com/nidlogin.login')
+        await self.page.goto(f'{self.urls.nid}/nidlogin.login')
         await HumanDelay.page_load()
 
         id_input = await self.page.query_selector('#id')
@@ -88,10 +301,11 @@ class NaverBaseBot:
             current_url = self.page.url
             if 'nidlogin.login' not in current_url:
                 if await self.check_login_status():
+                    self._save_login_verified(user_id)
                     self.log("로그인 성공!")
-                    return
+                    return "manual"
                 else:
-                    await self.page.goto('https://nid.naver.com/nidlogin.login')
+                    await self.page.goto(f'{self.urls.nid}/nidlogin.login')
                     await HumanDelay.page_load()
             remaining = max_wait - elapsed
             if remaining > 0 and elapsed % 15 == 0:
@@ -0,0 +1,321 @@
+"""봇 전체 흐름 벤치마크 (로컬 mock 서버 대상)
+
+    python -m bench.flows [--profile zero|production|0.1] [--flows reply,buddy,neighbor]
+                          [--ai-latency 0.0] [--output result.json]
+
+흐름마다 새 mock 서버와 임시 data_dir(프로필/기록/캐시)을 쓰고 headless로 돌린다.
+Gemini는 호출 수만 세는 CountingGenerator로 대신한다. 결과는 JSON으로
+  - wall_s / sleep_s / own_s  : 전체 시간, 딜레이 프로필로 쉰 시간, 나머지(실제 작업)
+  - cdp_calls                  : Playwright 드라이버 왕복 수 (Channel.send 기준)
+  - gemini_calls               : 생성기 호출 수 (배치 1회 = 1)
+  - phases                     : 단계별 호출 수/시간/쉰 시간/드라이버 왕복 수 (중첩 포함)
+  - per_target                 : 대상(글/이웃/계정) 1개당 평균
+  - page_loads                 : 문서(HTML) 요청 수, 그 외 XHR/이미지는 server_hits에서 확인
+  - server_hits                : mock 서버 경로별 요청 수
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+import utils
+from mock_naver import MockNaverServer, MockNaverState
+
+FLOWS = ("reply", "buddy", "neighbor")
+
+# 흐름별로 시간을 재는 단계: (모듈 이름, 객체 이름 또는 None, 속성 이름)
+_PHASES = {
+    "common": [
+        ("base_bot", "NaverBaseBot", "start_browser"),
+        ("base_bot", "NaverBaseBot", "ensure_login"),
+        ("base_bot", "NaverBaseBot", "close_browser"),
+    ],
+    "reply": [
+        ("reply_bot", "ReplyBot", "_collect_posts_from_postlist"),
+        ("reply_bot", "ReplyBot", "_process_comments_on_page"),
+        ("reply_bot", None, "fetch_comments"),
+        ("reply_bot", None, "get_post_content"),
+        ("reply_bot", None, "load_comments"),
+        ("reply_bot", None, "extract_comments"),
+        ("reply_bot", None, "write_reply"),
+    ],
+    "buddy": [
+        ("buddy_comment", "BuddyCommentBot", "_navigate_to_buddy_page"),
+        ("buddy_comment", "BuddyCommentBot", "_select_buddy_group"),
+        ("buddy_comment", "BuddyCommentBot", "_change_sort_order"),
+        ("buddy_comment", "BuddyCommentBot", "_extract_buddy_list"),
+        ("buddy_comment", "BuddyCommentBot", "_go_to_next_buddy_page"),
+        ("buddy_comment", None, "fetch_latest_log_no"),
+        ("buddy_comment", None, "get_latest_post_log_no"),
+        ("buddy_comment", None, "get_post_content"),
+        ("buddy_comment", None, "open_post"),
+        ("buddy_comment", None, "simulate_reading"),
+        ("buddy_comment", None, "click_sympathy_on_frame"),
+        ("buddy_comment", None, "check_my_comment_exists"),
+        ("buddy_comment", None, "write_comment"),
+    ],
+    "neighbor": [
+        ("neighbor_request", "NeighborRequestBot", "click_sympathy"),
+        ("neighbor_request", "NeighborRequestBot", "_init_sympathy_page"),
+        ("neighbor_request", "NeighborRequestBot", "_get_available_accounts"),
+        ("neighbor_request", "NeighborRequestBot", "_load_next_page"),
+        ("neighbor_request", "NeighborRequestBot", "request_neighbor"),
+        ("neighbor_request", "NeighborRequestBot", "_reload_sympathy_page"),
+        ("neighbor_request", "NeighborRequestBot", "_restore_page_depth"),
+        ("neighbor_request", "NeighborRequestBot", "_recover_sympathy_page"),
+    ],
+}
+
+# 대상 1개를 처리할 때 꼭 한 번 거치는 단계 (per_target 분모)
+_TARGET_PHASE = {
+    "reply": "fetch_comments",
+    "buddy": "fetch_latest_log_no",
+    "neighbor": "request_neighbor",
+}
+
+
+class CountingGenerator:
+    """Gemini 대신 고정 응답을 돌려주고 호출 수만 센다"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = Counter()
+
+    async def _call(self, kind: str):
+        self.calls[kind] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def generate(self, title: str, body: str):
+        await self._call("generate")
+        return "잘 보고 갑니다 😊"
+
+    async def generate_reply(self, title: str, body: str, comment_text: str, comment_no: str = ""):
+        await self._call("generate_reply")
+        return "감사합니다 😊"
+
+    async def generate_replies_batch(self, title: str, body: str, comments, comment_nos=None):
+        await self._call("generate_replies_batch")
+        return ["감사합니다 😊" for _ in comments]
+
+    def close(self):
+        pass
+
+
+class Recorder:
+    """단계별 시간/드라이버 왕복 수 기록 (몽키패치는 run() 동안만 유지)"""
+
+    def __init__(self):
+        self.cdp_calls = 0
+        self.cdp_methods = Counter()
+        self.phases = {}
+        self._restore = []
+
+    # ── 드라이버 왕복 ──
+
+    def _count(self, method):
+        self.cdp_calls += 1
+        self.cdp_methods[str(method)] += 1
+
+    def patch_channel(self) -> bool:
+        try:
+            from playwright._impl._connection import Channel
+        except ImportError:
+            return False
+        recorder = self
+        patched = False
+        for attr in ("send", "send_return_as_dict"):
+            original = getattr(Channel, attr, None)
+            if original is None:
+                continue
+
+            def make(original):
+                async def wrapper(self, method, *args, **kwargs):
+                    recorder._count(method)
+                    return await original(self, method, *args, **kwargs)
+                return wrapper
+
+            self._set(Channel, attr, make(original))
+            patched = True
+        original = getattr(Channel, "send_no_reply", None)
+        if original is not None:
+            def send_no_reply(self, method, *args, **kwargs):
+                recorder._count(method)
+                return original(self, method, *args, **kwargs)
+            self._set(Channel, "send_no_reply", send_no_reply)
+        return patched
+
+    # ── 단계 ──
+
+    def _set(self, owner, attr, value):
+        self._restore.append((owner, attr, getattr(owner, attr)))
+        setattr(owner, attr, value)
+
+    def patch_phase(self, owner, attr: str):
+        original = getattr(owner, attr)
+        stats = self.phases.setdefault(attr, {"calls": 0, "wall_s": 0.0, "sleep_s": 0.0, "cdp_calls": 0})
+        recorder = self
+
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            slept = utils.slept_total()
+            cdp = recorder.cdp_calls
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                stats["calls"] += 1
+                stats["wall_s"] += time.perf_counter() - start
+                stats["sleep_s"] += utils.slept_total() - slept
+                stats["cdp_calls"] += recorder.cdp_calls - cdp
+
+        self._set(owner, attr, wrapper)
+
+    def restore(self):
+        for owner, attr, value in reversed(self._restore):
+            setattr(owner, attr, value)
+        self._restore.clear()
+
+
+def _resolve(module_name: str, owner_name):
+    module = __import__(module_name)
+    return getattr(module, owner_name) if owner_name else module
+
+
+# HTML 문서가 아닌 요청 (내부 API, 댓글 JSON, 폰트/통계 스크립트)
+_NON_DOCUMENT_PREFIXES = ("GET mock/", "GET apis.naver.com/", "GET ssl.pstatic.net/", "GET wcs.naver.net/")
+
+
+def _page_loads(hits: Counter) -> int:
+    """mock 서버가 HTML을 돌려준 GET 요청 수"""
+    return sum(
+        n for key, n in hits.items()
+        if key.startswith("GET ") and not key.startswith(_NON_DOCUMENT_PREFIXES)
+    )
+
+
+def _round(value):
+    if isinstance(value, float):
+        return round(value, 3)
+    if isinstance(value, dict):
+        return {k: _round(v) for k, v in value.items()}
+    return value
+
+
+async def _run_flow(flow: str, base_url: str, state: MockNaverState, data_dir: str,
+                    generator: CountingGenerator, log, args):
+    cutoff = (date.today() - timedelta(days=args.days)).strftime("%Y-%m-%d")
+    common = {"log_callback": log, "data_dir": data_dir, "base_url": base_url, "headless": True}
+    if flow == "reply":
+        from reply_bot import ReplyBot
+        bot = ReplyBot(**common)
+        await bot.run_reply(state.my_id, "", blog_id=state.my_id, cutoff_date=cutoff,
+                            ai_generator=generator)
+    elif flow == "buddy":
+        from buddy_comment import BuddyCommentBot
+        bot = BuddyCommentBot(**common)
+        await bot.run_buddy_comment(state.my_id, group_name="이웃1", cutoff_date=cutoff,
+                                    ai_generator=generator)
+    else:
+        from neighbor_request import NeighborRequestBot
+        bot = NeighborRequestBot(**common)
+        log_no = state.blogs[state.my_id]["posts"][0]["log_no"]
+        await bot.run(f"{base_url}/blog.naver.com/{state.my_id}/{log_no}", state.my_id,
+                      max_success=args.neighbors)
+
+
+def bench_flow(flow: str, args) -> dict:
+    accounts = args.accounts
+    if args.sympathy_depths:
+        accounts = args.sympathy_depths * args.sympathy_page_size
+    state = MockNaverState.sample(
+        posts=args.posts, comments_per_post=args.comments,
+        buddies=args.buddies, sympathy_accounts=accounts,
+        sympathy_page_size=args.sympathy_page_size,
+    )
+    server = MockNaverServer(state)
+    base_url = server.start()
+    recorder = Recorder()
+    generator = CountingGenerator(args.ai_latency)
+    lines = []
+
+    cdp_supported = recorder.patch_channel()
+    for module_name, owner_name, attr in _PHASES["common"] + _PHASES[flow]:
+        recorder.patch_phase(_resolve(module_name, owner_name), attr)
+
+    slept = utils.slept_total()
+    start = time.perf_counter()
+    try:
+        with tempfile.TemporaryDirectory(prefix="naver_bench_") as data_dir:
+            asyncio.run(_run_flow(flow, base_url, state, data_dir, generator, lines.append, args))
+    finally:
+        wall = time.perf_counter() - start
+        recorder.restore()
+        server.stop()
+    sleep_s = utils.slept_total() - slept
+
+    targets = recorder.phases.get(_TARGET_PHASE[flow], {}).get("calls", 0)
+    gemini_calls = sum(generator.calls.values())
+    per = (lambda v: v / targets) if targets else (lambda v: None)
+    return _round({
+        "targets": targets,
+        "wall_s": wall,
+        "sleep_s": sleep_s,
+        "own_s": wall - sleep_s,
+        "cdp_calls": recorder.cdp_calls if cdp_supported else None,
+        "gemini_calls": gemini_calls,
+        "gemini_calls_by_kind": dict(generator.calls),
+        "per_target": {
+            "wall_s": per(wall),
+            "own_s": per(wall - sleep_s),
+            "cdp_calls": per(recorder.cdp_calls) if cdp_supported else None,
+            "gemini_calls": per(gemini_calls),
+        },
+        "phases": recorder.phases,
+        "cdp_top_methods": dict(recorder.cdp_methods.most_common(10)),
+        "page_loads": _page_loads(state.hits),
+        "server_hits": dict(state.hits.most_common()),
+        "errors": [line for line in lines if "오류" in line],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 mock 서버 대상 봇 흐름 벤치마크")
+    parser.add_argument("--profile", default="zero", help="production | zero | 배율 숫자 (기본 zero)")
+    parser.add_argument("--flows", default=",".join(FLOWS), help="쉼표로 구분 (reply,buddy,neighbor)")
+    parser.add_argument("--ai-latency", type=float, default=0.0, help="생성기 응답 지연 (초)")
+    parser.add_argument("--days", type=int, default=7, help="cutoff 날짜 (오늘로부터 N일 전)")
+    parser.add_argument("--posts", type=int, default=6)
+    parser.add_argument("--comments", type=int, default=6)
+    parser.add_argument("--buddies", type=int, default=10)
+    parser.add_argument("--accounts", type=int, default=30)
+    parser.add_argument("--sympathy-page-size", type=int, default=10)
+    parser.add_argument("--sympathy-depths", type=int, default=0,
+                        help="공감 목록 '더보기' 단계 수 (지정하면 --accounts 대신 depth x page size)")
+    parser.add_argument("--neighbors", type=int, default=5, help="서로이웃 신청 최대 성공 수")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (없으면 stdout만)")
+    args = parser.parse_args()
+
+    flows = [f.strip() for f in args.flows.split(",") if f.strip()]
+    unknown = [f for f in flows if f not in FLOWS]
+    if unknown:
+        parser.error(f"알 수 없는 흐름: {', '.join(unknown)}")
+
+    scale = utils.set_delay_profile(args.profile)
+    result = {
+        "profile": args.profile,
+        "delay_scale": scale,
+        "ai_latency": args.ai_latency,
+        "flows": {flow: bench_flow(flow, args) for flow in flows},
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""진입점별 import(콜드 스타트) 시간 측정
+
+    python -m bench.import_time [--repeat 5] [--top 8] [--output result.json]
+
+대상마다 새 파이썬 프로세스에서 모듈을 import 하고
+  - import_s : import에 걸린 시간 (repeat번 중 중앙값)
+  - top      : python -X importtime 기준 누적 시간이 큰 모듈 (첫 실행 기준)
+  - error    : import 실패 시 메시지 (의존성 미설치 등)
+을 JSON으로 출력한다.
+  gui        : main.py가 창을 띄우기 전에 불러오는 모든 것 (customtkinter + 봇 3개)
+  cli        : python -m cli 자체 (작업 모듈 import 전)
+  cli:<job>  : cli가 해당 작업을 실행할 때 불러오는 모듈
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from cli import JOBS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_TIMER = (
+    "import time; t = time.perf_counter(); "
+    "import {modules}; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def targets() -> dict:
+    result = {"gui": ["main"], "cli": ["cli"]}
+    for job, (module_name, _, _) in JOBS.items():
+        result[f"cli:{job}"] = ["cli", module_name]
+    return result
+
+
+def _run(code: str, extra_args=()) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *extra_args, "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+
+
+def _top_modules(stderr: str, top: int) -> list:
+    """-X importtime 출력에서 누적(cumulative) 시간이 큰 모듈"""
+    rows = []
+    for line in stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue
+        rows.append((cumulative_us, parts[2].strip()))
+    rows.sort(reverse=True)
+    return [{"module": name, "cumulative_s": round(us / 1e6, 4)} for us, name in rows[:top]]
+
+
+def measure(modules: list, repeat: int, top: int) -> dict:
+    code = _TIMER.format(modules=", ".join(modules))
+    samples = []
+    for _ in range(repeat):
+        proc = _run(code)
+        if proc.returncode != 0:
+            return {"modules": modules, "error": proc.stderr.strip().splitlines()[-1]}
+        samples.append(float(proc.stdout.strip()))
+
+    profile = _run(f"import {', '.join(modules)}", ("-X", "importtime"))
+    return {
+        "modules": modules,
+        "import_s": round(statistics.median(samples), 4),
+        "min_s": round(min(samples), 4),
+        "top": _top_modules(profile.stderr, top),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="진입점별 import 시간 측정")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="누적 시간이 큰 모듈 몇 개를 보여줄지")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (없으면 stdout만)")
+    args = parser.parse_args()
+
+    result = {
+        "python": sys.version.split()[0],
+        "repeat": args.repeat,
+        "targets": {name: measure(modules, args.repeat, args.top) for name, modules in targets().items()},
+    }
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Gemini 호출 중 이벤트 루프 지연(lag) 측정
+
+    python -m bench.loop_lag [--latency 2.0] [--calls 3]
+
+네트워크 없이 측정하기 위해 모델 지연을 흉내 내는 클라이언트를 CommentGenerator에
+붙인다. google-genai가 설치되지 않은 환경에서는 comment_ai가 import 하는 부분만
+흉내 낸 google.genai 모듈을 먼저 넣고 측정한다 (결과의 genai_stub).
+
+10ms 주기 ticker가 깨어나기까지 얼마나 늦었는지를 기록해서
+  - before: async def 안에서 동기 generate_content 호출 (기존 방식)
+  - after : CommentGenerator._request (client.aio + wait_for)
+두 경우의 최대/평균 lag를 JSON으로 출력한다.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import types
+
+from rate_limiter import TokenBucketLimiter
+
+TICK = 0.01
+
+
+class _Response:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _SimulatedModels:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def generate_content(self, model: str, contents: str, config=None):
+        time.sleep(self.latency)
+        return _Response("벤치마크 응답이에요 ㅎㅎ")
+
+
+class _SimulatedAsyncModels:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def generate_content(self, model: str, contents: str, config=None):
+        await asyncio.sleep(self.latency)
+        return _Response("벤치마크 응답이에요 ㅎㅎ")
+
+
+class _SimulatedClient:
+    def __init__(self, latency: float):
+        self.models = _SimulatedModels(latency)
+        self.aio = type("Aio", (), {})()
+        self.aio.models = _SimulatedAsyncModels(latency)
+
+
+def _install_genai_stub() -> bool:
+    """google.genai를 import 할 수 없으면 Client/types.GenerateContentConfig만 있는 모듈을 넣는다"""
+    try:
+        from google import genai  # noqa: F401
+        return False
+    except ImportError:
+        pass
+
+    genai = types.ModuleType("google.genai")
+    genai_types = types.ModuleType("google.genai.types")
+
+    class GenerateContentConfig:
+        def __init__(self, **kwargs):
+            self.__dict__.update(kwargs)
+
+    class Client:
+        def __init__(self, api_key: str = ""):
+            # main()에서 _SimulatedClient로 바꿔 끼운다
+            self.models = None
+            self.aio = None
+
+    genai_types.GenerateContentConfig = GenerateContentConfig
+    genai.types = genai_types
+    genai.Client = Client
+    google = sys.modules.get("google") or types.ModuleType("google")
+    google.genai = genai
+    sys.modules.setdefault("google", google)
+    sys.modules["google.genai"] = genai
+    sys.modules["google.genai.types"] = genai_types
+    return True
+
+
+async def _ticker(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def _measure(call, calls: int) -> dict:
+    lags = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    await asyncio.sleep(0)  # ticker가 먼저 돌기 시작해야 첫 호출의 지연도 잡힌다
+    start = time.perf_counter()
+    for _ in range(calls):
+        await call()
+        # 실제 봇처럼 호출 사이에 루프로 돌아가서, 막혀 있던 tick이 호출마다 지연을 기록하게 한다
+        await asyncio.sleep(TICK * 2)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return {
+        "wall_s": round(elapsed, 3),
+        "ticks": len(lags),
+        "max_lag_ms": round(max(lags) * 1000, 1) if lags else None,
+        "mean_lag_ms": round(sum(lags) / len(lags) * 1000, 2) if lags else None,
+    }
+
+
+async def main(latency: float, calls: int):
+    stubbed = _install_genai_stub()
+    from comment_ai import CommentGenerator
+
+    # 할당량 대기가 측정에 섞이지 않도록 넉넉한 limiter 사용
+    generator = CommentGenerator(api_key="bench", limiter=TokenBucketLimiter(rpm=100_000, tpm=10 ** 9))
+    generator.client = _SimulatedClient(latency)
+
+    async def blocking_call():
+        generator.client.models.generate_content(model=generator.model, contents="prompt")
+
+    async def async_call():
+        await generator._request("prompt")
+
+    result = {
+        "latency_s": latency,
+        "calls": calls,
+        "genai_stub": stubbed,
+        "before_sync_client": await _measure(blocking_call, calls),
+        "after_async_client": await _measure(async_call, calls),
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=2.0, help="모델 응답 지연(초)")
+    parser.add_argument("--calls", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.calls))
@@ -0,0 +1,123 @@
+"""scrape_only() 리소스 차단 효과 측정 (로컬 mock 서버 대상)
+
+    python -m bench.scrape_nav [--repeat 5] [--output result.json]
+
+목록만 읽는 탐색(PostList, 이웃 관리, 글 셸)을 차단 없이/scrape_only() 안에서 각각
+repeat번씩 열고, 탐색 1회당
+  - goto_s   : page.goto(load 이벤트까지) 시간
+  - bytes    : 끝난 요청의 응답 헤더+본문 크기 합
+  - requests : 끝난 요청 수 / blocked: 차단(실패)된 요청 수
+평균을 JSON으로 출력한다.
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+
+from base_bot import NaverBaseBot
+from mock_naver import MockNaverServer, MockNaverState
+
+
+class _Traffic:
+    def __init__(self, page):
+        self.pending = []
+        self.blocked = 0
+        page.on("requestfinished", lambda req: self.pending.append(asyncio.ensure_future(req.sizes())))
+        page.on("requestfailed", self._on_failed)
+
+    def _on_failed(self, _req):
+        self.blocked += 1
+
+    def reset(self):
+        self.pending = []
+        self.blocked = 0
+
+    async def collect(self) -> tuple:
+        sizes = await asyncio.gather(*self.pending, return_exceptions=True)
+        total = 0
+        count = 0
+        for s in sizes:
+            if isinstance(s, dict):
+                total += s.get("responseBodySize", 0) + s.get("responseHeadersSize", 0)
+                count += 1
+        return total, count, self.blocked
+
+
+async def _measure(bot: NaverBaseBot, traffic: _Traffic, url: str, repeat: int) -> dict:
+    goto_s = bytes_ = requests = blocked = 0.0
+    for _ in range(repeat):
+        traffic.reset()
+        start = time.perf_counter()
+        await bot.page.goto(url, wait_until="load")
+        goto_s += time.perf_counter() - start
+        # load 이후에 끝나는 요청(통계 비콘 등)까지 모은다
+        await asyncio.sleep(0.3)
+        b, n, x = await traffic.collect()
+        bytes_ += b
+        requests += n
+        blocked += x
+    return {
+        "goto_s": round(goto_s / repeat, 4),
+        "bytes": round(bytes_ / repeat),
+        "requests": round(requests / repeat, 1),
+        "blocked": round(blocked / repeat, 1),
+    }
+
+
+async def run(base_url: str, state: MockNaverState, repeat: int) -> dict:
+    buddy_id = next(b for b in state.blogs if b != state.my_id)
+    log_no = state.blogs[buddy_id]["posts"][0]["log_no"]
+    blog = f"{base_url}/blog.naver.com"
+    targets = {
+        "post_list": f"{blog}/PostList.naver?blogId={buddy_id}&categoryNo=0&from=postList",
+        "buddy_manage": f"{base_url}/admin.blog.naver.com/AdminMain.naver?blogId={state.my_id}",
+        "post_shell": f"{blog}/{buddy_id}/{log_no}",
+    }
+
+    with tempfile.TemporaryDirectory(prefix="naver_bench_") as data_dir:
+        bot = NaverBaseBot(log_callback=lambda msg: None, data_dir=data_dir,
+                           base_url=base_url, headless=True)
+        await bot.start_browser("bench")
+        try:
+            traffic = _Traffic(bot.page)
+            result = {}
+            for name, url in targets.items():
+                # 첫 방문(연결 수립 등)은 측정에서 뺀다
+                await bot.page.goto(url)
+                full = await _measure(bot, traffic, url, repeat)
+                async with bot.scrape_only():
+                    scrape = await _measure(bot, traffic, url, repeat)
+                result[name] = {
+                    "full": full,
+                    "scrape_only": scrape,
+                    "bytes_saved_pct": round(100 * (1 - scrape["bytes"] / full["bytes"]), 1) if full["bytes"] else None,
+                }
+            return result
+        finally:
+            await bot.close_browser()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="scrape_only() 리소스 차단 효과 측정")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (없으면 stdout만)")
+    args = parser.parse_args()
+
+    state = MockNaverState.sample()
+    server = MockNaverServer(state)
+    base_url = server.start()
+    try:
+        result = {"repeat": args.repeat, "navigations": asyncio.run(run(base_url, state, args.repeat))}
+    finally:
+        server.stop()
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
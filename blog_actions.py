@@ -1,5 +1,7 @@
 import re
+import time
 from typing import Callable, Optional
+from naver_urls import NaverUrls, DEFAULT_URLS
 from utils import random_sleep
 
 
@@ -39,8 +41,88 @@ async def click_sympathy_on_frame(main_frame, log: Callable[[str], None]) -> boo
         return False
 
 
-async def get_latest_post_log_no(page, target_id: str, log: Callable[[str], None]) -> Optional[str]:
-    post_list_url = f'https://blog.naver.com/PostList.naver?blogId={target_id}&categoryNo=0&from=postList'
+# (블로그 호스트, blog_id) -> (logNo, 조회 시각). 같은 세션에서 연달아 조회할 때 재요청을 줄인다
+_latest_log_no_cache: dict = {}
+LATEST_LOG_NO_TTL = 300
+LATEST_LOG_NO_CACHE_MAX = 500
+
+
+def _remember_log_no(key: tuple, log_no: str, ttl: float):
+    """캐시에 넣고, 최대 개수를 넘으면 만료된 항목 → 오래된 항목 순으로 비운다"""
+    now = time.time()
+    _latest_log_no_cache.pop(key, None)
+    _latest_log_no_cache[key] = (log_no, now)
+    if len(_latest_log_no_cache) <= LATEST_LOG_NO_CACHE_MAX:
+        return
+    for k in [k for k, (_, at) in _latest_log_no_cache.items() if now - at >= ttl]:
+        del _latest_log_no_cache[k]
+    while len(_latest_log_no_cache) > LATEST_LOG_NO_CACHE_MAX:
+        del _latest_log_no_cache[next(iter(_latest_log_no_cache))]
+
+
+def _parse_post_list_log_no(html: str, target_id: str) -> Optional[str]:
+    match = re.search(r'sympathyFrm(\d+)', html)
+    if match:
+        return match.group(1)
+    # 글 목록 표 안의, 대상 블로그 글 링크만 본다 (인기글/관련글 위젯, 다른 블로그 링크 제외)
+    table = re.search(r'<table[^>]*class="[^"]*blog2_categorylist[^"]*"[^>]*>(.*?)</table>', html, re.S)
+    if not table:
+        return None
+    blog = re.escape(target_id)
+    match = re.search(rf'blogId={blog}&(?:amp;)?logNo=(\d+)|/{blog}/(\d+)', table.group(1))
+    if not match:
+        return None
+    return match.group(1) or match.group(2)
+
+
+def _parse_rss_log_no(xml: str, target_id: str) -> Optional[str]:
+    item = re.search(r'<item>(.*?)</item>', xml, re.S)
+    if not item:
+        return None
+    match = re.search(rf'/{re.escape(target_id)}/(\d+)|logNo=(\d+)', item.group(1))
+    if not match:
+        return None
+    return match.group(1) or match.group(2)
+
+
+async def fetch_latest_log_no(context, target_id: str, log: Callable[[str], None],
+                              urls: NaverUrls = DEFAULT_URLS,
+                              ttl: float = LATEST_LOG_NO_TTL) -> Optional[str]:
+    """브라우저 탭을 쓰지 않고 최신 글 logNo 조회
+
+    context.request로 PostList(로그인 쿠키 포함, 이웃공개 글도 보임)를 받아 파싱하고,
+    실패하면 RSS를 본다. 결과는 blog_id별로 ttl초 동안 캐시한다.
+    둘 다 실패하면 None을 반환하므로 호출한 쪽에서 get_latest_post_log_no로 대체한다.
+    """
+    key = (urls.blog, target_id)
+    cached = _latest_log_no_cache.get(key)
+    if cached and time.time() - cached[1] < ttl:
+        log(f"[{target_id}] 최신 글 logNo: {cached[0]} (캐시)")
+        return cached[0]
+
+    sources = [
+        (f'{urls.blog}/PostList.naver?blogId={target_id}&categoryNo=0&from=postList', _parse_post_list_log_no),
+        (f'{urls.rss}/{target_id}.xml', _parse_rss_log_no),
+    ]
+    for url, parse in sources:
+        try:
+            response = await context.request.get(url, timeout=10000)
+            if not response.ok:
+                continue
+            log_no = parse(await response.text(), target_id)
+        except Exception as e:
+            log(f"[{target_id}] 글 목록 조회 오류: {str(e)[:50]}")
+            continue
+        if log_no:
+            _remember_log_no(key, log_no, ttl)
+            log(f"[{target_id}] 최신 글 logNo: {log_no}")
+            return log_no
+    return None
+
+
+async def get_latest_post_log_no(page, target_id: str, log: Callable[[str], None],
+                                 urls: NaverUrls = DEFAULT_URLS) -> Optional[str]:
+    post_list_url = f'{urls.blog}/PostList.naver?blogId={target_id}&categoryNo=0&from=postList'
     log(f"[{target_id}] 최신글 목록 접속...")
     await page.goto(post_list_url)
     from utils import HumanDelay
@@ -72,31 +154,72 @@ async def get_latest_post_log_no(page, target_id: str, log: Callable[[str], None
     return None
 
 
-async def get_post_content(page, target_id: str, log_no: str,
-                           log: Callable[[str], None], get_main_frame) -> tuple:
-    post_url = f'https://blog.naver.com/{target_id}/{log_no}'
+# get_post_content가 넘겨받는 본문 최대 길이 (Gemini 프롬프트에는 이보다 짧게 들어간다)
+POST_BODY_CHARS = 1000
+
+# SmartEditor 컴포넌트를 돌며 제목, 앞부분 본문(maxChars), 이미지 수, 전체 글자 수를 한 번에 뽑는다.
+# 본문 전체를 CDP로 넘기지 않으므로 긴 글에서도 전송량이 일정하다.
+_EXTRACT_POST_JS = """
+(maxChars) => {
+    const titleEl = document.querySelector('.se-title-text');
+    const result = {
+        title: titleEl ? (titleEl.innerText || '').trim() : '',
+        body: '', image_count: 0, text_length: 0,
+    };
+    const container = document.querySelector('.se-main-container');
+    if (!container) return result;
+
+    const blocks = container.querySelectorAll('.se-component');
+    const parts = [];
+    let taken = 0;
+    for (const block of (blocks.length ? blocks : [container])) {
+        if (block.classList.contains('se-documentTitle')) continue;
+        result.image_count += block.querySelectorAll('img.se-image-resource, .se-image img, .se-imageStrip img').length;
+        const paragraphs = block.querySelectorAll('.se-text-paragraph');
+        const texts = paragraphs.length
+            ? Array.from(paragraphs, p => p.textContent)
+            : [block.classList.contains('se-image') ? '' : (block.innerText || '')];
+        for (const raw of texts) {
+            const text = raw.replace(/\\u200b/g, '').trim();
+            if (!text) continue;
+            result.text_length += text.length;
+            if (taken < maxChars) {
+                const piece = text.slice(0, maxChars - taken);
+                parts.push(piece);
+                taken += piece.length + 1;
+            }
+        }
+    }
+    result.body = parts.join('\\n').slice(0, maxChars);
+    return result;
+}
+"""
+
+
+async def open_post(page, target_id: str, log_no: str,
+                    log: Callable[[str], None], get_main_frame,
+                    urls: NaverUrls = DEFAULT_URLS):
+    """글 페이지로 이동만 하고 mainFrame을 반환 (내용은 추출하지 않음)"""
+    post_url = f'{urls.blog}/{target_id}/{log_no}'
     log(f"[{target_id}] 글 접속: {post_url}")
     await page.goto(post_url)
     from utils import HumanDelay
     await HumanDelay.page_load()
     await random_sleep(2.0, 4.0)
+    return get_main_frame()
 
-    main_frame = get_main_frame()
-    if not main_frame:
-        return {'title': '', 'body': ''}, None
-
-    title = ''
-    title_el = await main_frame.query_selector('.se-title-text')
-    if title_el:
-        title = await title_el.inner_text()
 
-    body = ''
-    body_el = await main_frame.query_selector('.se-main-container')
-    if body_el:
-        body = await body_el.inner_text()
+async def get_post_content(page, target_id: str, log_no: str,
+                           log: Callable[[str], None], get_main_frame,
+                           urls: NaverUrls = DEFAULT_URLS) -> tuple:
+    main_frame = await open_post(page, target_id, log_no, log, get_main_frame, urls)
+    if not main_frame:
+        return {'title': '', 'body': '', 'image_count': 0, 'text_length': 0}, None
 
-    log(f"[{target_id}] 제목: {title[:50]}")
-    return {'title': title.strip(), 'body': body.strip()[:1000]}, main_frame
+    content = await main_frame.evaluate(_EXTRACT_POST_JS, POST_BODY_CHARS)
+    log(f"[{target_id}] 제목: {content['title'][:50]} "
+        f"(본문 {content['text_length']}자, 이미지 {content['image_count']}장)")
+    return content, main_frame
 
 
 async def check_my_comment_exists(main_frame, my_blog_id: str) -> bool:
@@ -146,6 +269,40 @@ async def load_comments(main_frame, log: Callable[[str], None]) -> bool:
     return False
 
 
+_EXTRACT_COMMENTS_JS = """
+() => Array.from(document.querySelectorAll('li.u_cbox_comment')).map(li => {
+    const info = {};
+    (li.getAttribute('data-info') || '').split(',').forEach(kv => {
+        const idx = kv.indexOf(':');
+        if (idx < 0) return;
+        info[kv.slice(0, idx).trim()] = kv.slice(idx + 1).trim().replace(/^['"]+|['"]+$/g, '');
+    });
+    const text = sel => {
+        const el = li.querySelector(sel);
+        return el ? el.innerText.trim() : '';
+    };
+    const nameEl = li.querySelector('.u_cbox_name');
+    return {
+        comment_no: info.commentNo || '',
+        parent_comment_no: info.parentCommentNo || '',
+        reply_level: info.replyLevel || '',
+        info: info,
+        nick: text('.u_cbox_nick'),
+        text: text('.u_cbox_contents'),
+        author_href: nameEl ? (nameEl.getAttribute('href') || '') : '',
+        is_editor: !!li.querySelector('.u_cbox_ico_editor'),
+    };
+})
+"""
+
+
+async def extract_comments(main_frame) -> list:
+    """현재 로드된 댓글 페이지의 li.u_cbox_comment 전체를 한 번의 evaluate로 추출한다.
+    각 항목: comment_no, parent_comment_no, reply_level, info(data-info 전체),
+    nick, text, author_href, is_editor"""
+    return await main_frame.evaluate(_EXTRACT_COMMENTS_JS)
+
+
 async def _find_comment_element(main_frame, comment_no: str):
     """data-info에서 commentNo가 일치하는 li.u_cbox_comment 요소를 찾는다.
     따옴표 유무, 공백 등에 관계없이 매칭한다."""
@@ -0,0 +1,152 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Dict, Optional
+
+from playwright.async_api import async_playwright
+from playwright_stealth import Stealth
+
+from base_bot import launch_context
+
+
+class _ProfileSession:
+    """프로필 하나의 persistent context와 메인 페이지"""
+
+    def __init__(self, user_id: str, context, page):
+        self.user_id = user_id
+        self.context = context
+        self.page = page
+        self.in_use = False
+        self.closed = False
+        context.on("close", self._on_close)
+
+    def _on_close(self, *_):
+        # 사용자가 브라우저 창을 직접 닫은 경우
+        self.closed = True
+
+    async def main_page(self):
+        if self.page.is_closed():
+            pages = [p for p in self.context.pages if not p.is_closed()]
+            self.page = pages[0] if pages else await self.context.new_page()
+            stealth = Stealth()
+            await stealth.apply_stealth_async(self.page)
+        return self.page
+
+    async def close_extra_pages(self):
+        """팝업 등 메인 페이지 외에 남은 탭 정리"""
+        for p in list(self.context.pages):
+            if p is not self.page and not p.is_closed():
+                try:
+                    await p.close()
+                except Exception:
+                    pass
+
+
+class SessionManager:
+    """GUI 연속 실행용 브라우저 세션 관리자
+
+    이벤트 루프 스레드 하나와 Playwright 드라이버 하나를 계속 띄워두고, 프로필(계정)마다
+    BrowserContext를 하나씩 유지한다. 봇은 session_manager로 받아 start_browser에서 빌리고
+    close_browser에서 돌려준다. 브라우저는 close_all()/shutdown()을 부를 때까지 열려 있다.
+
+        sessions = SessionManager()
+        bot = ReplyBot(log_callback=..., session_manager=sessions)
+        sessions.run(bot.run_reply(...))   # 작업 스레드에서 호출, 끝날 때까지 대기
+        sessions.shutdown()
+    """
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._playwright = None
+        self._sessions: Dict[str, _ProfileSession] = {}
+
+    # ── 루프 스레드 ──
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self.loop is None or not self._thread.is_alive():
+                self.loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run_loop, name="browser-session", daemon=True
+                )
+                self._thread.start()
+            return self.loop
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """세션 루프에서 coro 실행을 예약하고 Future를 반환"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """세션 루프에서 coro를 실행하고 끝날 때까지 기다린다 (GUI 스레드에서 호출 금지)"""
+        return self.submit(coro).result(timeout)
+
+    def open_profiles(self) -> list:
+        return [uid for uid, s in self._sessions.items() if not s.closed]
+
+    # ── 세션 대여/반납 (세션 루프 안에서 호출) ──
+
+    async def borrow(self, user_id: str, profile_dir: str, headless: bool = False) -> tuple:
+        """(context, page, 재사용 여부) 반환. 같은 프로필을 동시에 빌릴 수는 없다."""
+        session = self._sessions.get(user_id)
+        if session and session.closed:
+            del self._sessions[user_id]
+            session = None
+        if session:
+            if session.in_use:
+                raise RuntimeError(f"프로필 {user_id}의 브라우저가 이미 사용 중입니다.")
+            page = await session.main_page()
+            session.in_use = True
+            return session.context, page, True
+
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        context, page = await launch_context(self._playwright, profile_dir, headless)
+        session = _ProfileSession(user_id, context, page)
+        session.in_use = True
+        self._sessions[user_id] = session
+        return context, page, False
+
+    async def give_back(self, user_id: str):
+        session = self._sessions.get(user_id)
+        if not session:
+            return
+        session.in_use = False
+        if session.closed:
+            del self._sessions[user_id]
+            return
+        await session.close_extra_pages()
+
+    async def close_all(self, force: bool = False) -> int:
+        """사용 중이 아닌 브라우저를 모두 닫는다 (force면 사용 중인 것도). 닫은 수 반환"""
+        closed = 0
+        for user_id, session in list(self._sessions.items()):
+            if session.in_use and not force:
+                continue
+            del self._sessions[user_id]
+            if not session.closed:
+                try:
+                    await session.context.close()
+                except Exception:
+                    pass
+                closed += 1
+        if not self._sessions and self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        return closed
+
+    def shutdown(self, timeout: float = 15.0):
+        """브라우저를 모두 닫고 루프 스레드를 끝낸다 (프로그램 종료 시)"""
+        if self.loop is None or not self._thread.is_alive():
+            return
+        try:
+            self.run(self.close_all(force=True), timeout)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
@@ -1,19 +1,59 @@
+from ai_retry import AIRetryQueue
 from base_bot import NaverBaseBot
 from blog_actions import (
     click_sympathy_on_frame,
+    fetch_latest_log_no,
     get_latest_post_log_no,
     get_post_content,
+    open_post,
     check_my_comment_exists,
     write_comment,
 )
 from comment_ai import CommentGenerator
+from response_cache import ResponseCache
 from utils import HumanDelay, random_sleep, maybe_idle, DAILY_ACTION_LIMIT, simulate_reading
 import asyncio
+import functools
+import os
 import re
-from typing import Callable
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+
+# 이웃 목록 스냅샷을 믿는 기간. 지나면 표 전체를 다시 읽는다 (삭제/순서가 바뀐 이웃 반영)
+BUDDY_SNAPSHOT_MAX_AGE_DAYS = 2
+
+
+# 이웃 관리 표: 행마다 [blog_id, 닉네임, 최근글 날짜, 이웃추가일] (날짜는 표시 문자열 그대로)
+# 조건에 안 맞는 행은 이유별로 센다: columns(열 부족), no_link(블로그 링크 없음), bad_href
+_EXTRACT_BUDDY_ROWS_JS = """
+() => {
+    const rows = [];
+    const rejected = {};
+    const reject = (why) => { rejected[why] = (rejected[why] || 0) + 1; };
+    for (const tr of document.querySelectorAll('table.tbl_buddymanage tbody tr')) {
+        const tds = tr.querySelectorAll('td');
+        if (tds.length < 7) { reject('columns'); continue; }
+        const link = tr.querySelector("td.buddy a[href*='blog.naver.com']");
+        if (!link) { reject('no_link'); continue; }
+        const m = (link.getAttribute('href') || '').match(/blog\\.naver\\.com\\/([^\\/?&#]+)/);
+        if (!m) { reject('bad_href'); continue; }
+        const nickEl = tr.querySelector('td.buddy .nickname');
+        const nick = nickEl ? (nickEl.innerText || '').trim() : m[1];
+        rows.push([m[1], nick, (tds[5].innerText || '').trim(), (tds[6].innerText || '').trim()]);
+    }
+    return {rows, rejected};
+}
+"""
 
 
 class BuddyCommentBot(NaverBaseBot):
+    def __init__(self, log_callback: Callable[[str], None] = print, **kwargs):
+        super().__init__(log_callback, **kwargs)
+        # _extract_buddy_list에서 버린 행 수 (이유별)
+        self.rejected_rows = Counter()
+
     def _parse_naver_date(self, date_str: str) -> str:
         date_str = date_str.strip().rstrip(".")
         m = re.match(r"(\d{2})\.(\d{2})\.(\d{2})", date_str)
@@ -21,8 +61,58 @@ class BuddyCommentBot(NaverBaseBot):
             return f"20{m.group(1)}-{m.group(2)}-{m.group(3)}"
         return ""
 
+    @staticmethod
+    def _buddy_row(blog_id: str, nick: str, update_date: str, added_date: str,
+                   raw_date: str, sort_order: str) -> dict:
+        return {
+            "blog_id": blog_id,
+            "nick": nick,
+            "update_date": update_date,
+            "added_date": added_date,
+            "date": update_date if sort_order == "업데이트순" else added_date,
+            "raw_date": raw_date,
+        }
+
+    def _from_snapshot(self, row: dict, sort_order: str) -> dict:
+        date = row["update_date"] if sort_order == "업데이트순" else row["added_date"]
+        buddy = self._buddy_row(row["blog_id"], row["nick"], row["update_date"],
+                                row["added_date"], date or "-", sort_order)
+        # 다시 읽지 않은 행이므로 처음 수집한 시각을 유지 (스냅샷 만료 판단용)
+        buddy["synced_at"] = row.get("synced_at")
+        return buddy
+
+    @staticmethod
+    def _snapshot_key(row: dict) -> tuple:
+        return row["blog_id"], row["nick"], row["update_date"], row["added_date"]
+
+    def _find_snapshot_tail(self, page_rows: list, snapshot: list) -> Optional[int]:
+        """page_rows가 스냅샷 안에 그대로(연속으로) 있으면 그 다음 위치, 없으면 None
+
+        업데이트순에서 새 글을 쓴 이웃은 맨 위로 올라가고 나머지는 순서가 유지되므로,
+        한 페이지가 통째로 일치하면 그 뒤는 스냅샷과 같다고 본다.
+        """
+        if not page_rows or not snapshot:
+            return None
+        keys = [self._snapshot_key(r) for r in page_rows]
+        for i, row in enumerate(snapshot):
+            if self._snapshot_key(row) != keys[0]:
+                continue
+            if [self._snapshot_key(r) for r in snapshot[i:i + len(keys)]] == keys:
+                return i + len(keys)
+        return None
+
+    @staticmethod
+    def _snapshot_expired(synced_at: Optional[str]) -> bool:
+        if not synced_at:
+            return True
+        try:
+            synced = datetime.strptime(synced_at, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return True
+        return datetime.now() - synced > timedelta(days=BUDDY_SNAPSHOT_MAX_AGE_DAYS)
+
     async def _navigate_to_buddy_page(self, blog_id: str):
-        url = f"https://admin.blog.naver.com/AdminMain.naver?blogId={blog_id}&Redirect=Buddyinfo"
+        url = f"{self.urls.admin_blog}/AdminMain.naver?blogId={blog_id}&Redirect=Buddyinfo"
         self.log(f"이웃 관리 페이지 이동: {url}")
         await self.page.goto(url)
         await random_sleep(3.0, 6.0)
@@ -76,37 +166,31 @@ class BuddyCommentBot(NaverBaseBot):
         return False
 
     async def _extract_buddy_list(self, frame, sort_order: str = "업데이트순") -> list:
-        rows = await frame.query_selector_all("table.tbl_buddymanage tbody tr")
+        """이웃 관리 표의 현재 페이지 행 목록 (evaluate 한 번)
+
+        update_date(최근글)와 added_date(이웃추가일)를 모두 읽고, date/raw_date는
+        현재 정렬 기준 열의 값이다. 버린 행은 이유별로 self.rejected_rows에 쌓는다.
+        """
+        try:
+            result = await frame.evaluate(_EXTRACT_BUDDY_ROWS_JS)
+        except Exception as e:
+            self.log(f"  이웃 목록 추출 실패: {str(e)[:80]}")
+            self.rejected_rows["evaluate_error"] += 1
+            return []
+
+        rejected = result.get("rejected") or {}
+        if rejected:
+            self.rejected_rows.update(rejected)
+            self.log("  제외된 행: " + ", ".join(f"{k} {v}" for k, v in rejected.items()))
+
         buddies = []
-        date_col_index = 5 if sort_order == "업데이트순" else 6
-        for row in rows:
-            try:
-                tds = await row.query_selector_all("td")
-                if len(tds) < 7:
-                    continue
-                blog_link = await row.query_selector("td.buddy a[href*='blog.naver.com']")
-                if not blog_link:
-                    continue
-                href = await blog_link.get_attribute("href") or ""
-                m = re.search(r"blog\.naver\.com/([^/?&#]+)", href)
-                if not m:
-                    continue
-                blog_id = m.group(1)
-                nick_el = await row.query_selector("td.buddy .nickname")
-                nick = blog_id
-                if nick_el:
-                    nick = (await nick_el.inner_text()).strip()
-                date_td = tds[date_col_index]
-                date_text = (await date_td.inner_text()).strip()
-                parsed_date = self._parse_naver_date(date_text)
-                buddies.append({
-                    "blog_id": blog_id,
-                    "nick": nick,
-                    "update_date": parsed_date,
-                    "raw_date": date_text,
-                })
-            except:
-                continue
+        for blog_id, nick, update_text, added_text in result.get("rows", []):
+            buddies.append(self._buddy_row(
+                blog_id, nick,
+                self._parse_naver_date(update_text), self._parse_naver_date(added_text),
+                update_text if sort_order == "업데이트순" else added_text,
+                sort_order,
+            ))
         return buddies
 
     async def _go_to_next_buddy_page(self, frame) -> bool:
@@ -141,74 +225,134 @@ class BuddyCommentBot(NaverBaseBot):
                                 group_name: str = "이웃1",
                                 cutoff_date: str = "",
                                 sort_order: str = "업데이트순",
-                                progress_callback: Callable[[int, int], None] = None):
+                                progress_callback: Callable[[int, int], None] = None,
+                                prefetch: bool = True,
+                                ai_generator: Optional[CommentGenerator] = None):
+        """prefetch=True이면 글 내용을 읽자마자 AI 댓글 생성을 백그라운드로 시작해서
+        체류/스크롤/공감과 Gemini 응답 대기가 겹치도록 한다.
+        ai_generator를 넘기면 그 생성기를 쓰고 닫지 않는다 (호출한 쪽 소유)."""
         self.is_running = True
-        ai_generator = None
-        if gemini_api_key:
-            ai_generator = CommentGenerator(gemini_api_key)
+        owns_generator = ai_generator is None
+        if ai_generator:
+            self.log("AI 댓글 생성 모드 (외부 생성기)")
+        elif gemini_api_key:
+            ai_generator = CommentGenerator(
+                gemini_api_key, cache=ResponseCache(os.path.join(self.data_dir, "ai_cache.db"))
+            )
             self.log("AI 댓글 생성 모드 (Gemini)")
 
         from datetime import date
         if not cutoff_date:
             cutoff_date = date.today().strftime("%Y-%m-%d")
 
+        self.begin_run(flow="buddy_comment", user_id=user_id, group=group_name,
+                       cutoff_date=cutoff_date, sort_order=sort_order, prefetch=prefetch)
+        # AI 생성 실패 항목은 이웃 순회와 동시에 백그라운드에서 다시 생성한다
+        retry_queue = AIRetryQueue(self.log)
         try:
             await self.start_browser(user_id)
             await self.ensure_login(user_id)
 
             blog_id = user_id
+            ledger = self.open_ledger(user_id)
+            self.rejected_rows.clear()
 
             self.log("=" * 50)
             self.log("Phase 1: 이웃 목록 수집 시작")
             self.log(f"그룹: {group_name} | 기준일: {cutoff_date} | 정렬: {sort_order}")
             self.log("=" * 50)
 
-            await self._navigate_to_buddy_page(blog_id)
-            frame = self._get_papermain_frame()
-            if not frame:
-                self.log("papermain 프레임 못 찾음")
-                return
-
-            await self._select_buddy_group(frame, group_name)
-            await self._change_sort_order(frame, sort_order)
-
-            all_targets = []
-            page_num = 1
-
-            while self.is_running:
-                self.log(f"\n── 수집 페이지 {page_num} ──")
+            # Phase 1은 목록 텍스트만 읽으므로 이미지/폰트/추적 스크립트를 받지 않는다
+            async with self.scrape_only(), self.timed("collect_buddies", target=group_name) as collected:
+                await self._navigate_to_buddy_page(blog_id)
                 frame = self._get_papermain_frame()
                 if not frame:
-                    self.log("papermain 프레임 없음")
-                    break
+                    self.log("papermain 프레임 못 찾음")
+                    return
+
+                await self._select_buddy_group(frame, group_name)
+                await self._change_sort_order(frame, sort_order)
+
+                snapshot, synced_at = ledger.buddy_snapshot(user_id, group_name, sort_order)
+                if snapshot and self._snapshot_expired(synced_at):
+                    self.log(f"이웃 목록 스냅샷에 {BUDDY_SNAPSHOT_MAX_AGE_DAYS}일 넘게 다시 읽지 않은 행이 있음 → 전체 다시 수집")
+                    snapshot = []
+                elif snapshot:
+                    self.log(f"이웃 목록 스냅샷 {len(snapshot)}명 (가장 오래된 행 {synced_at}) - 일치하는 페이지부터는 스냅샷 사용")
+
+                all_targets = []
+                fresh = []          # 이번 실행에서 표에서 직접 읽은 행
+                tail = None         # 스냅샷과 일치한 페이지 이후 행 (스냅샷에서 가져옴)
+                complete = False    # 마지막 페이지까지 읽었는지
+                page_num = 1
+
+                def take(rows) -> bool:
+                    """기준일 필터를 적용해 대상에 추가. 오래된 날짜를 만나면 True"""
+                    for buddy in rows:
+                        if buddy["raw_date"] == "-":
+                            continue
+                        if buddy["date"] and buddy["date"] < cutoff_date:
+                            return True
+                        all_targets.append(buddy)
+                    return False
+
+                while self.is_running:
+                    self.log(f"\n── 수집 페이지 {page_num} ──")
+                    frame = self._get_papermain_frame()
+                    if not frame:
+                        self.log("papermain 프레임 없음")
+                        break
 
-                buddies = await self._extract_buddy_list(frame, sort_order)
-                self.log(f"이웃 수: {len(buddies)}")
-                if not buddies:
-                    break
+                    buddies = await self._extract_buddy_list(frame, sort_order)
+                    self.log(f"이웃 수: {len(buddies)}")
+                    if not buddies:
+                        complete = True
+                        break
+                    fresh.extend(buddies)
 
-                found_old = False
-                for buddy in buddies:
-                    raw_date = buddy["raw_date"]
-                    update_date = buddy["update_date"]
-                    if raw_date == "-":
-                        continue
-                    if update_date and update_date < cutoff_date:
-                        found_old = True
+                    if take(buddies):
+                        self.log(f"기준일({cutoff_date})보다 오래된 날짜 발견 → 수집 종료")
                         break
-                    all_targets.append(buddy)
 
-                if found_old:
-                    self.log(f"기준일({cutoff_date})보다 오래된 날짜 발견 → 수집 종료")
-                    break
+                    index = self._find_snapshot_tail(buddies, snapshot)
+                    if index is not None:
+                        seen = {b["blog_id"] for b in fresh}
+                        tail = [
+                            self._from_snapshot(row, sort_order)
+                            for row in snapshot[index:] if row["blog_id"] not in seen
+                        ]
+                        self.log(f"스냅샷과 동일한 페이지 → 나머지 {len(tail)}명은 저장된 목록 사용")
+                        if take(tail):
+                            self.log(f"기준일({cutoff_date})보다 오래된 날짜 발견 → 수집 종료")
+                        break
 
-                has_next = await self._go_to_next_buddy_page(frame)
-                if not has_next:
-                    self.log("마지막 페이지 도달")
-                    break
-                page_num += 1
+                    has_next = await self._go_to_next_buddy_page(frame)
+                    if not has_next:
+                        self.log("마지막 페이지 도달")
+                        complete = True
+                        break
+                    page_num += 1
+
+                collected.update(count=len(all_targets), pages=page_num, snapshot_hit=tail is not None,
+                                 snapshot_rows=len(tail or []))
+                if fresh:
+                    if tail is not None:
+                        rows = fresh + tail
+                    elif complete:
+                        rows = fresh
+                    else:
+                        # 중간에 멈춤: 읽은 앞부분 + 스냅샷의 나머지 (순서 유지)
+                        seen = {b["blog_id"] for b in fresh}
+                        rows = fresh + [r for r in snapshot if r["blog_id"] not in seen]
+                    ledger.save_buddy_snapshot(user_id, group_name, sort_order, rows)
 
+            from_snapshot = sum(1 for b in all_targets if b.get("synced_at"))
             self.log(f"\nPhase 1 완료: {len(all_targets)}명 대상 수집됨")
+            if from_snapshot:
+                oldest = min(b["synced_at"] for b in all_targets if b.get("synced_at"))
+                self.log(f"  그중 {from_snapshot}명은 저장된 스냅샷에서 가져옴 (가장 오래된 행 {oldest}) - 방문 시 다시 확인")
+            if self.rejected_rows:
+                self.log("목록에서 제외된 행 합계: " + ", ".join(f"{k} {v}" for k, v in self.rejected_rows.items()))
 
             if not all_targets:
                 self.log("대상 없음. 종료.")
@@ -221,7 +365,6 @@ class BuddyCommentBot(NaverBaseBot):
             total = len(all_targets)
             comment_count = 0
             skip_count = 0
-            deferred = []
 
             for i, buddy in enumerate(all_targets):
                 if not self.is_running:
@@ -229,7 +372,8 @@ class BuddyCommentBot(NaverBaseBot):
                     break
 
                 if comment_count >= DAILY_ACTION_LIMIT:
-                    self.log(f"\n일일 액션 제한({DAILY_ACTION_LIMIT}건) 도달 → 중단")
+                    self.event("limit", f"\n일일 액션 제한({DAILY_ACTION_LIMIT}건) 도달 → 중단",
+                               reason="daily_limit")
                     break
 
                 target_id = buddy["blog_id"]
@@ -239,96 +383,168 @@ class BuddyCommentBot(NaverBaseBot):
                 if progress_callback:
                     progress_callback(i + 1, total)
 
-                log_no = await get_latest_post_log_no(self.page, target_id, self.log)
+                async with self.timed("resolve_log_no", target=target_id) as resolved:
+                    log_no = await fetch_latest_log_no(self.context, target_id, self.log, urls=self.urls)
+                    resolved["source"] = "request"
+                    if not log_no:
+                        async with self.scrape_only():
+                            log_no = await get_latest_post_log_no(self.page, target_id, self.log, urls=self.urls)
+                        resolved["source"] = "page"
                 if not log_no:
-                    self.log(f"  logNo 못 찾음 - skip")
+                    if buddy.get("synced_at"):
+                        # 표에서 다시 읽지 않은 행이라 삭제된 이웃일 수 있다 → 다음 실행부터 스냅샷에서 제외
+                        ledger.drop_buddy_snapshot_row(user_id, group_name, sort_order, target_id)
+                        self.event("buddy", f"  스냅샷 행 확인 실패(logNo 없음) - 스냅샷에서 제외하고 skip",
+                                   target=target_id, outcome="skipped", reason="snapshot_stale")
+                    else:
+                        self.event("buddy", f"  logNo 못 찾음 - skip",
+                                   target=target_id, outcome="skipped", reason="no_log_no")
+                    skip_count += 1
+                    continue
+
+                if ledger.is_post_commented(user_id, target_id, log_no):
+                    self.event("buddy", f"  [{target_id}] 실행 기록상 이미 댓글 작성한 글 - skip",
+                               target=target_id, outcome="skipped", reason="post_commented")
                     skip_count += 1
                     continue
 
-                content, main_frame = await get_post_content(
-                    self.page, target_id, log_no, self.log, self._get_main_frame
-                )
+                async with self.timed("post_open", target=target_id, log_no=log_no):
+                    content, main_frame = await get_post_content(
+                        self.page, target_id, log_no, self.log, self._get_main_frame, urls=self.urls
+                    )
 
                 if not main_frame:
-                    self.log(f"  [{target_id}] mainFrame 못 찾음 - skip")
+                    self.event("buddy", f"  [{target_id}] mainFrame 못 찾음 - skip",
+                               target=target_id, outcome="skipped", reason="no_main_frame")
                     skip_count += 1
                     continue
 
-                body_len = len(content.get("body", "")) if content else 0
-                await simulate_reading(body_len, self.log)
+                # 체류(읽기) 시간 동안 AI 댓글을 미리 생성한다. 이미 내 댓글이 있는지는 읽기/스크롤 뒤에야
+                # 알 수 있어서 그 경우 호출 1회가 낭비되지만, 봇이 단 댓글은 위의 ledger 확인에서 먼저
+                # 걸러지므로 직접 단 댓글이 있는 글에서만 생긴다.
+                gen_task = None
+                if prefetch and ai_generator and (content["title"] or content["body"]):
+                    gen_task = asyncio.create_task(
+                        ai_generator.generate(content["title"], content["body"])
+                    )
 
-                await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await random_sleep(0.8, 2.0)
-                await main_frame.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await random_sleep(1.5, 3.0)
+                try:
+                    body_len = content.get("text_length", len(content.get("body", ""))) if content else 0
+                    async with self.timed("reading", target=target_id, chars=body_len):
+                        await simulate_reading(body_len, self.log)
 
-                await click_sympathy_on_frame(main_frame, self.log)
+                    await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    await random_sleep(0.8, 2.0)
+                    await main_frame.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    await random_sleep(1.5, 3.0)
 
-                already = await check_my_comment_exists(main_frame, blog_id)
-                if already:
-                    self.log(f"  [{target_id}] 이미 내 댓글 존재 - skip")
-                    skip_count += 1
-                    continue
+                    async with self.timed("sympathy", target=target_id):
+                        await click_sympathy_on_frame(main_frame, self.log)
 
-                comment = None
-                if ai_generator and (content["title"] or content["body"]):
-                    generated = await ai_generator.generate(content["title"], content["body"])
-                    if generated:
-                        comment = generated
-                        self.log(f"  AI 댓글: '{comment}'")
-                    else:
-                        self.log(f"  AI 댓글 생성 3회 시도 모두 실패 - 보류")
-                        deferred.append(buddy)
+                    already = await check_my_comment_exists(main_frame, blog_id)
+                    if already:
+                        self.event("buddy", f"  [{target_id}] 이미 내 댓글 존재 - skip",
+                                   target=target_id, outcome="skipped", reason="already_commented")
+                        ledger.mark_post_commented(user_id, target_id, log_no, "already")
+                        skip_count += 1
                         continue
-                else:
-                    self.log(f"  글 내용 없음 - skip")
-                    skip_count += 1
-                    continue
 
-                result = await write_comment(main_frame, target_id, comment, self.log)
+                    comment = None
+                    if ai_generator and (content["title"] or content["body"]):
+                        async with self.timed("ai_wait", target=target_id, prefetched=gen_task is not None):
+                            if gen_task:
+                                generated = await gen_task
+                            else:
+                                generated = await ai_generator.generate(content["title"], content["body"])
+                        if generated:
+                            comment = generated
+                            self.log(f"  AI 댓글: '{comment}'")
+                        else:
+                            self.event("buddy", f"  AI 댓글 생성 3회 시도 모두 실패 - 보류",
+                                       target=target_id, outcome="deferred", reason="ai_failed")
+                            # 재방문 때 logNo 조회/본문 추출을 다시 하지 않도록 함께 보관
+                            retry_queue.add({**buddy, "log_no": log_no, "content": content}, functools.partial(
+                                ai_generator.generate, content["title"], content["body"]
+                            ))
+                            continue
+                    else:
+                        self.event("buddy", f"  글 내용 없음 - skip",
+                                   target=target_id, outcome="skipped", reason="no_content")
+                        skip_count += 1
+                        continue
+                finally:
+                    # 예외/중지로 빠져나가도 미리 시작한 생성이 남지 않게 (끝난 작업은 예외를 회수)
+                    if gen_task and not gen_task.done():
+                        gen_task.cancel()
+                    elif gen_task and not gen_task.cancelled():
+                        gen_task.exception()
+
+                async with self.timed("write_comment", target=target_id):
+                    result = await write_comment(main_frame, target_id, comment, self.log)
                 if result:
+                    self.event("buddy", target=target_id, outcome="commented", log_no=log_no)
                     comment_count += 1
+                    ledger.mark_post_commented(user_id, target_id, log_no)
                 else:
+                    self.event("buddy", target=target_id, outcome="failed", reason="write_failed")
                     skip_count += 1
 
                 await HumanDelay.between_requests()
                 await maybe_idle(self.log)
 
-            if deferred and self.is_running and comment_count < DAILY_ACTION_LIMIT:
+            # 보류 항목: 백그라운드 재시도에서 생성에 성공한 것만 다시 방문
+            ready = []
+            if len(retry_queue) and self.is_running and comment_count < DAILY_ACTION_LIMIT:
+                ready, failed = await retry_queue.drain()
+                for buddy in failed:
+                    self.event("buddy", f"  [{buddy['blog_id']}] AI 댓글 재시도 {buddy['attempts']}회 실패 - skip",
+                               target=buddy["blog_id"], outcome="failed", reason="ai_failed", retry=True)
+                skip_count += len(failed)
+
+            if ready and self.is_running:
                 self.log(f"\n{'=' * 50}")
-                self.log(f"보류 목록 재시도: {len(deferred)}건")
+                self.log(f"보류 목록 재방문: 재생성 성공 {len(ready)}건 / 실패 {len(retry_queue) - len(ready)}건")
                 self.log("=" * 50)
 
-                for i, buddy in enumerate(deferred):
+                for i, buddy in enumerate(ready):
                     if not self.is_running:
                         self.log("사용자에 의해 중단됨")
                         break
 
                     if comment_count >= DAILY_ACTION_LIMIT:
-                        self.log(f"\n일일 액션 제한({DAILY_ACTION_LIMIT}건) 도달 → 중단")
+                        self.event("limit", f"\n일일 액션 제한({DAILY_ACTION_LIMIT}건) 도달 → 중단",
+                                   reason="daily_limit")
                         break
 
                     target_id = buddy["blog_id"]
                     nick = buddy["nick"]
-                    self.log(f"\n[보류 {i+1}/{len(deferred)}] {nick} ({target_id})")
+                    self.log(f"\n[보류 {i+1}/{len(ready)}] {nick} ({target_id})")
 
-                    log_no = await get_latest_post_log_no(self.page, target_id, self.log)
-                    if not log_no:
-                        self.log(f"  logNo 못 찾음 - skip")
+                    # 첫 방문 때 읽은 글(logNo/본문)에 대해 이미 댓글을 생성했으므로 바로 그 글로 이동
+                    log_no = buddy["log_no"]
+                    content = buddy["content"]
+                    comment = buddy["generated"]
+
+                    if ledger.is_post_commented(user_id, target_id, log_no):
+                        self.event("buddy", f"  [{target_id}] 실행 기록상 이미 댓글 작성한 글 - skip",
+                                   target=target_id, outcome="skipped", reason="post_commented", retry=True)
                         skip_count += 1
                         continue
 
-                    content, main_frame = await get_post_content(
-                        self.page, target_id, log_no, self.log, self._get_main_frame
-                    )
+                    async with self.timed("post_open", target=target_id, retry=True, log_no=log_no):
+                        main_frame = await open_post(
+                            self.page, target_id, log_no, self.log, self._get_main_frame, urls=self.urls
+                        )
 
                     if not main_frame:
-                        self.log(f"  [{target_id}] mainFrame 못 찾음 - skip")
+                        self.event("buddy", f"  [{target_id}] mainFrame 못 찾음 - skip",
+                                   target=target_id, outcome="skipped", reason="no_main_frame", retry=True)
                         skip_count += 1
                         continue
 
-                    body_len = len(content.get("body", "")) if content else 0
-                    await simulate_reading(body_len, self.log)
+                    body_len = content.get("text_length", len(content.get("body", "")))
+                    async with self.timed("reading", target=target_id, retry=True, chars=body_len):
+                        await simulate_reading(body_len, self.log)
 
                     await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                     await random_sleep(0.8, 2.0)
@@ -337,29 +553,22 @@ class BuddyCommentBot(NaverBaseBot):
 
                     already = await check_my_comment_exists(main_frame, blog_id)
                     if already:
-                        self.log(f"  [{target_id}] 이미 내 댓글 존재 - skip")
+                        self.event("buddy", f"  [{target_id}] 이미 내 댓글 존재 - skip",
+                                   target=target_id, outcome="skipped", reason="already_commented", retry=True)
+                        ledger.mark_post_commented(user_id, target_id, log_no, "already")
                         skip_count += 1
                         continue
 
-                    comment = None
-                    if ai_generator and (content["title"] or content["body"]):
-                        generated = await ai_generator.generate(content["title"], content["body"])
-                        if generated:
-                            comment = generated
-                            self.log(f"  AI 댓글: '{comment}'")
-                        else:
-                            self.log(f"  AI 댓글 생성 재시도 실패 - skip")
-                            skip_count += 1
-                            continue
-                    else:
-                        self.log(f"  글 내용 없음 - skip")
-                        skip_count += 1
-                        continue
+                    self.log(f"  AI 댓글: '{comment}'")
 
-                    result = await write_comment(main_frame, target_id, comment, self.log)
+                    async with self.timed("write_comment", target=target_id, retry=True):
+                        result = await write_comment(main_frame, target_id, comment, self.log)
                     if result:
+                        self.event("buddy", target=target_id, outcome="commented", log_no=log_no, retry=True)
                         comment_count += 1
+                        ledger.mark_post_commented(user_id, target_id, log_no)
                     else:
+                        self.event("buddy", target=target_id, outcome="failed", reason="write_failed", retry=True)
                         skip_count += 1
 
                     await HumanDelay.between_requests()
@@ -369,7 +578,12 @@ class BuddyCommentBot(NaverBaseBot):
             self.log(f"{'=' * 50}")
 
         except Exception as e:
-            self.log(f"실행 오류: {str(e)}")
+            self.event("error", f"실행 오류: {str(e)}", reason=type(e).__name__)
         finally:
+            retry_queue.cancel()
             await self.close_browser()
+            self.close_ledger()
+            if ai_generator and owns_generator:
+                ai_generator.close()
+            self.finish_run()
             self.is_running = False
@@ -0,0 +1,229 @@
+"""GUI 없이 봇 하나를 실행 (cron 등 예약 실행용)
+
+    python -m cli neighbor --user-id myid --blog-url https://blog.naver.com/someone/123
+    python -m cli buddy --user-id myid --api-key KEY --group-name 이웃1
+    python -m cli reply --config reply.json --headless
+
+--config에는 아래 옵션 이름(dest)을 키로 하는 JSON을 쓰고, 명령줄 옵션이 우선한다.
+작업(job)도 config의 "job" 키로 줄 수 있다. Gemini 키는 GEMINI_API_KEY 환경 변수도 읽는다.
+
+    {"job": "reply", "user_id": "myid", "gemini_api_key": "...", "headless": true}
+
+작업에 필요한 봇 모듈만 실행 시점에 import 한다 (customtkinter/다른 봇은 불러오지 않음).
+로그는 stderr, 실행 요약(JSON)은 stdout으로 출력한다.
+종료 코드: 0 완료 / 1 실행 중 오류 / 2 인자 오류 / 130 중단(SIGINT/SIGTERM)
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import signal
+import sys
+import time
+
+# 작업 이름 -> (모듈, 봇 클래스, 실행 메서드)
+JOBS = {
+    "neighbor": ("neighbor_request", "NeighborRequestBot", "run"),
+    "buddy": ("buddy_comment", "BuddyCommentBot", "run_buddy_comment"),
+    "reply": ("reply_bot", "ReplyBot", "run_reply"),
+}
+
+# 작업별로 실행 메서드에 넘기는 인자와 기본값 (필수 인자는 REQUIRED)
+REQUIRED = object()
+JOB_PARAMS = {
+    "neighbor": {
+        "blog_url": REQUIRED,
+        "user_id": REQUIRED,
+        "neighbor_message": "블로그 글 잘 봤습니다. 서로이웃 신청드려요!",
+        "max_success": 100,
+    },
+    "buddy": {
+        "user_id": REQUIRED,
+        "gemini_api_key": "",
+        "group_name": "이웃1",
+        "cutoff_date": "",
+        "sort_order": "업데이트순",
+        "prefetch": True,
+    },
+    "reply": {
+        "user_id": REQUIRED,
+        "gemini_api_key": "",  # dry_run이 아니면 필수 (resolve_options에서 확인)
+        "blog_id": "",
+        "cutoff_date": "",
+        "dry_run": False,
+    },
+}
+
+# 봇 생성자에 넘기는 공통 옵션
+BOT_OPTIONS = ("headless", "base_url", "data_dir")
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_STOPPED = 130
+
+
+def build_parser() -> argparse.ArgumentParser:
+    # 기본값은 모두 None으로 두고 config/JOB_PARAMS와 합칠 때 채운다
+    parser = argparse.ArgumentParser(prog="python -m cli", description="네이버 서로이웃 매니저 (GUI 없이 실행)")
+    parser.add_argument("job", nargs="?", choices=sorted(JOBS), help="실행할 작업 (config의 job으로도 지정 가능)")
+    parser.add_argument("--config", help="옵션 JSON 파일")
+
+    common = parser.add_argument_group("공통")
+    common.add_argument("--user-id", dest="user_id", help="로그인할 네이버 아이디")
+    common.add_argument("--headless", action="store_const", const=True,
+                        help="브라우저 창 없이 실행 (로그인 쿠키가 살아 있어야 함)")
+    common.add_argument("--base-url", dest="base_url", help="네이버 대신 쓸 주소 (mock 서버)")
+    common.add_argument("--data-dir", dest="data_dir", help="프로필/기록 저장 위치 (기본 ~/.naver_automation)")
+    common.add_argument("--delay-profile", dest="delay_profile", help="딜레이 배율: production, zero 또는 숫자")
+    common.add_argument("--summary", help="실행 요약 JSON을 이 파일에도 저장")
+    common.add_argument("--quiet", action="store_const", const=True, help="진행 로그 출력 안 함")
+
+    neighbor = parser.add_argument_group("neighbor (서로이웃 신청)")
+    neighbor.add_argument("--blog-url", dest="blog_url", help="공감 계정을 추출할 블로그 글 주소")
+    neighbor.add_argument("--message", dest="neighbor_message", help="서로이웃 메시지")
+    neighbor.add_argument("--max-success", dest="max_success", type=int, help="최대 신청 수")
+
+    ai = parser.add_argument_group("buddy / reply (AI 댓글)")
+    ai.add_argument("--api-key", dest="gemini_api_key", help="Gemini API 키 (기본: GEMINI_API_KEY 환경 변수)")
+    ai.add_argument("--cutoff-date", dest="cutoff_date", help="기준 날짜 YYYY-MM-DD (기본: 오늘)")
+    ai.add_argument("--group-name", dest="group_name", help="buddy: 서로이웃 그룹 이름")
+    ai.add_argument("--sort-order", dest="sort_order", choices=["업데이트순", "이웃추가순"], help="buddy: 정렬 기준")
+    ai.add_argument("--no-prefetch", dest="prefetch", action="store_const", const=False,
+                    help="buddy: 체류 중 AI 댓글 미리 생성하지 않음")
+    ai.add_argument("--blog-id", dest="blog_id", help="reply: 대상 블로그 ID (기본: user-id)")
+    ai.add_argument("--dry-run", dest="dry_run", action="store_const", const=True,
+                    help="reply: 실제 등록 없이 검증만")
+    return parser
+
+
+def load_config(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError("config 파일은 JSON 객체여야 합니다")
+    return config
+
+
+def resolve_options(args: argparse.Namespace) -> tuple:
+    """config와 명령줄 옵션을 합쳐 (job, 실행 인자, 공통 옵션)을 반환. 잘못되면 ValueError"""
+    config = load_config(args.config) if args.config else {}
+    flags = {k: v for k, v in vars(args).items() if v is not None and k != "config"}
+    options = {**config, **flags}
+
+    job = options.pop("job", None)
+    if job not in JOBS:
+        raise ValueError(f"작업을 지정해주세요: {', '.join(sorted(JOBS))}")
+    if not options.get("gemini_api_key") and os.environ.get("GEMINI_API_KEY"):
+        options["gemini_api_key"] = os.environ["GEMINI_API_KEY"]
+
+    params = {}
+    for name, default in JOB_PARAMS[job].items():
+        value = options.get(name, default)
+        if value is REQUIRED or (default is REQUIRED and value in ("", None)):
+            raise ValueError(f"{job}: '{name}' 값이 필요합니다")
+        params[name] = value
+    # DRY-RUN은 Gemini를 부르지 않으므로 키 없이도 실행할 수 있다
+    if job == "reply" and not params["dry_run"] and not params["gemini_api_key"]:
+        raise ValueError("reply: 'gemini_api_key' 값이 필요합니다 (--dry-run이면 생략 가능)")
+
+    known = set(BOT_OPTIONS) | {"delay_profile", "summary", "quiet"}
+    for params_of in JOB_PARAMS.values():
+        known |= set(params_of)
+    unknown = sorted(set(options) - known)
+    if unknown:
+        raise ValueError(f"알 수 없는 옵션: {', '.join(unknown)}")
+    return job, params, options
+
+
+async def _run(bot, method_name: str, params: dict) -> bool:
+    """실행하고 중단 신호를 받았는지 반환.
+
+    SIGINT/SIGTERM을 받으면 bot.stop()으로 진행 중인 대상까지만 처리하고
+    브라우저/기록을 정리한 뒤 끝나게 한다.
+    """
+    loop = asyncio.get_running_loop()
+    stopped = False
+
+    def on_stop():
+        nonlocal stopped
+        stopped = True
+        bot.stop()
+
+    installed = []
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, on_stop)
+            installed.append(sig)
+        except (NotImplementedError, RuntimeError):
+            pass
+    try:
+        await getattr(bot, method_name)(**params)
+    finally:
+        for sig in installed:
+            loop.remove_signal_handler(sig)
+    return stopped
+
+
+def run_job(job: str, params: dict, options: dict, log) -> dict:
+    """작업 하나를 실행하고 요약 dict를 반환 (exit_code 포함)"""
+    started = time.perf_counter()
+    summary = {"job": job, "user_id": params.get("user_id")}
+
+    module_name, class_name, method_name = JOBS[job]
+    try:
+        bot_class = getattr(importlib.import_module(module_name), class_name)
+    except ImportError as e:
+        summary.update(ok=False, exit_code=EXIT_FAILED, error=f"import 실패: {e}")
+        return summary
+    summary["import_s"] = round(time.perf_counter() - started, 3)
+
+    bot_kwargs = {k: options[k] for k in BOT_OPTIONS if options.get(k) is not None}
+    bot = bot_class(log_callback=log, **bot_kwargs)
+    stopped = asyncio.run(_run(bot, method_name, params))
+
+    result = bot.last_summary or {}
+    failed = result.get("counters", {}).get("error", 0) > 0
+    summary.update(
+        ok=not failed and not stopped,
+        exit_code=EXIT_FAILED if failed else EXIT_STOPPED if stopped else EXIT_OK,
+        stopped=stopped,
+        events_path=bot.events.path,
+        **result,
+    )
+    summary["wall_s"] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        job, params, options = resolve_options(args)
+        if options.get("delay_profile"):
+            import utils
+            utils.set_delay_profile(options["delay_profile"])
+    except (OSError, ValueError) as e:
+        parser.print_usage(sys.stderr)
+        print(f"{parser.prog}: 오류: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    if options.get("quiet"):
+        def log(msg: str):
+            pass
+    else:
+        def log(msg: str):
+            print(msg, file=sys.stderr, flush=True)
+
+    summary = run_job(job, params, options, log)
+    text = json.dumps(summary, ensure_ascii=False, indent=2)
+    print(text)
+    if options.get("summary"):
+        with open(options["summary"], "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return summary["exit_code"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,52 @@
 import asyncio
-import time
+import json
 from google import genai
-from typing import Optional
+from google.genai import types
+from typing import List, Optional
+from rate_limiter import TokenBucketLimiter, get_shared_limiter, parse_retry_after
+from response_cache import ResponseCache
+
+# 프롬프트 문구를 바꾸면 올려서 이전 캐시가 재사용되지 않게 한다
+PROMPT_VERSION = 1
+
+# gemini-2.5-flash 기본 할당량 (유료 등급이면 생성 시 rpm/tpm으로 올려서 사용)
+DEFAULT_RPM = 10
+DEFAULT_TPM = 250_000
+
+# 한 번의 배치 요청에 넣을 최대 댓글 수
+REPLY_BATCH_SIZE = 20
+
+_REPLY_RULES = (
+    "- 25자 내외 (20~30자)\n"
+    "- 30대 여자 말투 (부드럽고 친근한 존댓말, 예: ~요, ~네요, ~좋아요)\n"
+    "- 'ㅎㅎㅎ' 또는 내용에 어울리는 표정, 제스처 등 다양한 이모티콘 쓰기 (예:😆,😌,🥹,😠,👍🏻)\n"
+    "- 댓글 내용에 공감하거나 감사를 표현해\n"
+    "- 쉼표, 물결(~) 사용금지\n"
+    "- 광고성/스팸 금지\n"
+)
 
 
 class CommentGenerator:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache: Optional[ResponseCache] = None,
+                 timeout: float = 30.0,
+                 limiter: Optional[TokenBucketLimiter] = None,
+                 rpm: float = DEFAULT_RPM, tpm: float = DEFAULT_TPM):
         self.client = genai.Client(api_key=api_key)
         self.model = 'gemini-2.5-flash'
-        self._last_request_time = 0.0
-        self._min_interval = 4.0
+        self.cache = cache
+        self.timeout = timeout  # 호출 1회당 최대 대기 시간(초)
+        # 같은 모델을 쓰는 생성기끼리 할당량을 공유
+        self.limiter = limiter or get_shared_limiter(self.model, rpm, tpm)
 
-    async def _wait_rate_limit(self):
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self._min_interval:
-            sleep_time = self._min_interval - elapsed
-            print(f"Rate limit 보호: {sleep_time:.1f}초 대기")
-            await asyncio.sleep(sleep_time)
+    def close(self):
+        if self.cache:
+            self.cache.close()
+
+    async def _wait_rate_limit(self, prompt: str):
+        # 토큰 수 추정: 한글 위주 프롬프트 기준 2글자당 1토큰 + 응답 여유분
+        waited = await self.limiter.acquire(len(prompt) // 2 + 200)
+        if waited > 0:
+            print(f"Rate limit 보호: {waited:.1f}초 대기")
 
     def _is_retryable_error(self, error_msg: str) -> bool:
         retryable_codes = ['429', '500', '503', '504',
@@ -24,61 +54,114 @@ class CommentGenerator:
                            'UNAVAILABLE', 'DEADLINE_EXCEEDED']
         return any(code in error_msg for code in retryable_codes)
 
-    async def generate(self, title: str, body: str) -> Optional[str]:
-        prompt = (
-            "너는 30대 여성 네이버 블로거야.\n"
-            "아래 블로그 글을 읽고, 글 내용에 맞는 자연스러운 댓글을 작성해.\n"
-            "규칙:\n"
-            "- 25자 내외 (20~30자)\n"
-            "- 30대 여자 말투 (부드럽고 친근한 존댓말, 예: ~요, ~네요, ~좋아요)\n"
-            "- 'ㅎㅎㅎ' 또는 내용에 어울리는 표정, 제스처 등 다양한 이모티콘 쓰기 (예:😆,😌,🥹,😠,👍🏻)\n"
-            "- 쉼표, 물결(~) 사용금지\n"
-            "- 광고성/스팸 금지\n"
-            "- 댓글 내용만 출력 (따옴표, 설명 없이)\n\n"
-            f"제목: {title}\n"
-            f"본문: {body[:500]}\n\n"
-            "댓글:"
-        )
+    def _cache_key(self, kind: str, title: str, body: str, comment_text: str = "",
+                   comment_no: str = "") -> str:
+        parts = [self.model, PROMPT_VERSION, kind, title, body[:500], comment_text[:200]]
+        if comment_no:
+            # 답글은 댓글마다 따로 캐시: 같은 짧은 댓글("잘 보고 갑니다")에 똑같은 답글이 달리지 않게
+            parts.append(comment_no)
+        return ResponseCache.make_key(*parts)
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        if not self.cache:
+            return None
+        cached = self.cache.get(key)
+        if cached:
+            print("AI 응답 캐시 사용")
+        return cached
+
+    def _cache_put(self, key: str, text: Optional[str]):
+        if self.cache and text:
+            self.cache.put(key, text)
+
+    @staticmethod
+    def _clean(text: str) -> str:
+        text = text.strip().strip('"').strip("'")
+        if len(text) > 50:
+            text = text[:50]
+        return text
+
+    async def _request(self, prompt: str) -> Optional[str]:
+        text = await self._request_raw(prompt)
+        if text is None:
+            return None
+        return self._clean(text)
 
+    async def _request_raw(self, prompt: str,
+                           config: Optional[types.GenerateContentConfig] = None) -> Optional[str]:
         for attempt in range(3):
             try:
-                await self._wait_rate_limit()
-                self._last_request_time = time.time()
+                await self._wait_rate_limit(prompt)
 
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt
+                # async 클라이언트 사용: 응답 대기 중에도 브라우저/로그/중지 처리가 계속 돈다
+                response = await asyncio.wait_for(
+                    self.client.aio.models.generate_content(
+                        model=self.model,
+                        contents=prompt,
+                        config=config,
+                    ),
+                    timeout=self.timeout,
                 )
+                self.limiter.record_success()
                 if not response.text:
                     print("Gemini API 응답 텍스트 없음")
                     continue
-                comment = response.text.strip().strip('"').strip("'")
-                if len(comment) > 50:
-                    comment = comment[:50]
-                return comment
+                return response.text
+            except asyncio.TimeoutError:
+                if attempt < 2:
+                    print(f"Gemini API 응답 시간 초과({self.timeout:.0f}초) - 재시도 ({attempt+1}/3)")
+                    continue
+                print(f"Gemini API 응답 시간 초과({self.timeout:.0f}초) - 포기")
+                return None
             except Exception as e:
                 error_msg = str(e)
                 if self._is_retryable_error(error_msg) and attempt < 2:
-                    wait = 15 * (2 ** attempt)
-                    print(f"Gemini API 일시적 오류 - {wait}초 후 재시도 ({attempt+1}/3): {error_msg[:80]}")
-                    await asyncio.sleep(wait)
+                    # 다음 _wait_rate_limit에서 backoff가 끝날 때까지 대기 (다른 생성기도 함께 멈춤)
+                    wait = self.limiter.backoff(parse_retry_after(error_msg))
+                    print(f"Gemini API 일시적 오류 - {wait:.0f}초 후 재시도 ({attempt+1}/3): {error_msg[:80]}")
                     continue
                 print(f"Gemini API 오류 (복구 불가): {e}")
                 return None
         return None
 
-    async def generate_reply(self, title: str, body: str, comment_text: str) -> Optional[str]:
+    async def generate(self, title: str, body: str) -> Optional[str]:
+        key = self._cache_key("comment", title, body)
+        cached = self._cache_get(key)
+        if cached:
+            return cached
+
         prompt = (
             "너는 30대 여성 네이버 블로거야.\n"
-            "아래는 내 블로그 글과, 다른 사람이 남긴 댓글이야.\n"
-            "댓글에 대한 자연스러운 답글(대댓글)을 작성해.\n"
+            "아래 블로그 글을 읽고, 글 내용에 맞는 자연스러운 댓글을 작성해.\n"
             "규칙:\n"
             "- 25자 내외 (20~30자)\n"
             "- 30대 여자 말투 (부드럽고 친근한 존댓말, 예: ~요, ~네요, ~좋아요)\n"
             "- 'ㅎㅎㅎ' 또는 내용에 어울리는 표정, 제스처 등 다양한 이모티콘 쓰기 (예:😆,😌,🥹,😠,👍🏻)\n"
-            "- 댓글 내용에 공감하거나 감사를 표현해\n"
             "- 쉼표, 물결(~) 사용금지\n"
             "- 광고성/스팸 금지\n"
+            "- 댓글 내용만 출력 (따옴표, 설명 없이)\n\n"
+            f"제목: {title}\n"
+            f"본문: {body[:500]}\n\n"
+            "댓글:"
+        )
+
+        comment = await self._request(prompt)
+        self._cache_put(key, comment)
+        return comment
+
+    async def generate_reply(self, title: str, body: str, comment_text: str,
+                             comment_no: str = "") -> Optional[str]:
+        key = self._cache_key("reply", title, body, comment_text, comment_no)
+        cached = self._cache_get(key)
+        if cached:
+            return cached
+
+        prompt = (
+            "너는 30대 여성 네이버 블로거야.\n"
+            "아래는 내 블로그 글과, 다른 사람이 남긴 댓글이야.\n"
+            "댓글에 대한 자연스러운 답글(대댓글)을 작성해.\n"
+            "규칙:\n"
+            + _REPLY_RULES +
             "- 답글 내용만 출력 (따옴표, 설명 없이)\n\n"
             f"제목: {title}\n"
             f"본문: {body[:500]}\n"
@@ -86,29 +169,88 @@ class CommentGenerator:
             "답글:"
         )
 
-        for attempt in range(3):
-            try:
-                await self._wait_rate_limit()
-                self._last_request_time = time.time()
+        reply = await self._request(prompt)
+        self._cache_put(key, reply)
+        return reply
 
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt
-                )
-                if not response.text:
-                    print("Gemini API 응답 텍스트 없음")
-                    continue
-                reply = response.text.strip().strip('"').strip("'")
-                if len(reply) > 50:
-                    reply = reply[:50]
-                return reply
-            except Exception as e:
-                error_msg = str(e)
-                if self._is_retryable_error(error_msg) and attempt < 2:
-                    wait = 15 * (2 ** attempt)
-                    print(f"Gemini API 일시적 오류 - {wait}초 후 재시도 ({attempt+1}/3): {error_msg[:80]}")
-                    await asyncio.sleep(wait)
-                    continue
-                print(f"Gemini API 오류 (복구 불가): {e}")
-                return None
-        return None
+    async def generate_replies_batch(self, title: str, body: str,
+                                     comments: List[str],
+                                     comment_nos: Optional[List[str]] = None) -> List[Optional[str]]:
+        """같은 글에 달린 여러 댓글의 답글을 한 번의 요청으로 생성한다.
+        comments와 같은 순서로 답글 목록을 반환하며, 배치 응답에서 빠지거나
+        파싱에 실패한 항목은 generate_reply 단건 호출로 대신 생성한다.
+        배치 요청 자체가 실패(할당량 초과/시간 초과 등)한 묶음은 단건으로 다시 부르지 않고
+        None으로 남겨서, 호출한 쪽이 보류(재시도 큐)로 넘기게 한다.
+        comment_nos를 주면 답글 캐시를 댓글 번호별로 나눈다."""
+        results: List[Optional[str]] = [None] * len(comments)
+        comment_nos = comment_nos or [""] * len(comments)
+        keys = [self._cache_key("reply", title, body, c, no) for c, no in zip(comments, comment_nos)]
+        pending = []
+        failed = set()  # 배치 요청이 응답 없이 실패한 댓글 (단건 대체하지 않음)
+        for i, key in enumerate(keys):
+            cached = self._cache_get(key)
+            if cached:
+                results[i] = cached
+            else:
+                pending.append(i)
+
+        for start in range(0, len(pending), REPLY_BATCH_SIZE):
+            chunk = pending[start:start + REPLY_BATCH_SIZE]
+            numbered = "".join(
+                f"{n + 1}. {comments[i][:200]}\n" for n, i in enumerate(chunk)
+            )
+            prompt = (
+                "너는 30대 여성 네이버 블로거야.\n"
+                "아래는 내 블로그 글과, 다른 사람들이 남긴 댓글 목록이야.\n"
+                "각 댓글에 대한 자연스러운 답글(대댓글)을 하나씩 작성해.\n"
+                "규칙:\n"
+                + _REPLY_RULES +
+                "- 댓글마다 서로 다른 표현으로 작성\n"
+                '- JSON 배열로만 출력: [{"id": 댓글번호, "reply": "답글"}, ...]\n\n'
+                f"제목: {title}\n"
+                f"본문: {body[:500]}\n"
+                f"댓글 목록:\n{numbered}"
+            )
+            raw = await self._request_raw(
+                prompt, config=types.GenerateContentConfig(response_mime_type="application/json")
+            )
+            if raw is None:
+                print(f"배치 요청 실패 - 댓글 {len(chunk)}건은 단건 생성 없이 보류")
+                failed.update(chunk)
+                continue
+            parsed = self._parse_batch(raw, len(chunk))
+            for n, i in enumerate(chunk):
+                reply = parsed.get(n + 1)
+                if reply:
+                    results[i] = reply
+                    self._cache_put(keys[i], reply)
+
+        for i in pending:
+            if results[i] is None and i not in failed:
+                print(f"배치 응답에 {i + 1}번 댓글 답글 없음 - 단건 생성으로 대체")
+                results[i] = await self.generate_reply(title, body, comments[i], comment_nos[i])
+        return results
+
+    def _parse_batch(self, raw: Optional[str], count: int) -> dict:
+        """[{"id": n, "reply": "..."}] 응답을 {n: 답글}로 변환. 실패 시 빈 dict"""
+        if not raw:
+            return {}
+        try:
+            items = json.loads(raw)
+        except ValueError:
+            print(f"배치 응답 JSON 파싱 실패: {raw[:80]}")
+            return {}
+        if not isinstance(items, list):
+            return {}
+        parsed = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                idx = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            reply = item.get("reply")
+            if 1 <= idx <= count and isinstance(reply, str) and reply.strip():
+                parsed[idx] = self._clean(reply)
+        return parsed
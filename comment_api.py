@@ -0,0 +1,116 @@
+import json
+import re
+from typing import Callable, List, Optional
+
+from naver_urls import NaverUrls, DEFAULT_URLS
+
+# 댓글 목록 API 한 번에 받는 부모 댓글 수와 최대 페이지 수
+COMMENT_API_PAGE_SIZE = 50
+COMMENT_API_MAX_PAGES = 40
+
+# (블로그 호스트, blog_id) -> blogNo. 블로그마다 고정이라 세션 동안 재사용한다
+_blog_no_cache: dict = {}
+
+_JSONP_RE = re.compile(r'^\s*[\w.$]+\((.*)\)\s*;?\s*$', re.S)
+
+
+def _parse_blog_no(html: str) -> Optional[str]:
+    match = re.search(r"var\s+blogNo\s*=\s*['\"]?(\d+)", html)
+    return match.group(1) if match else None
+
+
+def _parse_jsonp(text: str) -> dict:
+    match = _JSONP_RE.match(text)
+    return json.loads(match.group(1) if match else text)
+
+
+def _to_comment(item: dict, urls: NaverUrls) -> dict:
+    """API 항목을 extract_comments()와 같은 모양으로 변환"""
+    comment_no = str(item.get("commentNo", ""))
+    profile = item.get("profileUserId") or ""
+    return {
+        "comment_no": comment_no,
+        "parent_comment_no": str(item.get("parentCommentNo") or comment_no),
+        "reply_level": str(item.get("replyLevel", "")),
+        "nick": item.get("userName") or "",
+        "text": (item.get("contents") or "").strip(),
+        "author_href": f"{urls.blog}/{profile}" if profile else "",
+        "is_editor": bool(item.get("isBlogOwner") or item.get("manager")),
+    }
+
+
+async def fetch_blog_no(context, blog_id: str, log_no: str,
+                        urls: NaverUrls = DEFAULT_URLS) -> Optional[str]:
+    """PostView HTML의 `var blogNo`를 읽는다 (댓글 objectId에 필요)"""
+    key = (urls.blog, blog_id)
+    if key in _blog_no_cache:
+        return _blog_no_cache[key]
+    response = await context.request.get(
+        f"{urls.blog}/PostView.naver?blogId={blog_id}&logNo={log_no}", timeout=10000
+    )
+    if not response.ok:
+        return None
+    blog_no = _parse_blog_no(await response.text())
+    if blog_no:
+        _blog_no_cache[key] = blog_no
+    return blog_no
+
+
+async def fetch_comments(context, blog_id: str, log_no: str, log: Callable[[str], None],
+                         urls: NaverUrls = DEFAULT_URLS,
+                         page_size: int = COMMENT_API_PAGE_SIZE) -> Optional[List[dict]]:
+    """글 하나의 댓글 전체를 댓글 위젯(u_cbox)이 쓰는 목록 API로 받는다
+
+    브라우저 탭 없이 context.request(로그인 쿠키 포함)로 모든 페이지를 받아서
+    comment_no, parent_comment_no, reply_level, nick, text, author_href, is_editor
+    목록을 반환한다 (API 순서 그대로, 답글은 부모 댓글 뒤).
+    실패하거나 COMMENT_API_MAX_PAGES 안에 다 받지 못하면 None을 반환하므로 호출한 쪽에서 DOM(load_comments/extract_comments)으로 대체한다.
+    """
+    try:
+        blog_no = await fetch_blog_no(context, blog_id, log_no, urls)
+        if not blog_no:
+            log("  댓글 API: blogNo 못 찾음")
+            return None
+
+        referer = f"{urls.blog}/PostView.naver?blogId={blog_id}&logNo={log_no}"
+        comments = []
+        page = 1
+        total_pages = 1
+        complete = False
+        while page <= COMMENT_API_MAX_PAGES:
+            url = (
+                f"{urls.apis}/commentBox/cbox/web_naver_list_jsonp.json?"
+                f"ticket=blog&templateId=default&pool=blogid&lang=ko&country=KR"
+                f"&objectId={blog_no}_201_{log_no}&groupId={blog_no}"
+                f"&pageSize={page_size}&indexSize=10&page={page}&_callback=_cbox"
+            )
+            response = await context.request.get(url, headers={"Referer": referer}, timeout=10000)
+            if not response.ok:
+                log(f"  댓글 API 응답 오류: {response.status}")
+                return None
+            data = _parse_jsonp(await response.text())
+            if not data.get("success"):
+                log(f"  댓글 API 실패: {data.get('code')} {str(data.get('message', ''))[:50]}")
+                return None
+
+            result = data.get("result") or {}
+            comments.extend(
+                _to_comment(item, urls) for item in result.get("commentList") or []
+                if not item.get("deleted")
+            )
+            total_pages = (result.get("pageModel") or {}).get("totalPages") or 1
+            if page >= total_pages:
+                complete = True
+                break
+            page += 1
+    except Exception as e:
+        log(f"  댓글 API 오류: {str(e)[:80]}")
+        return None
+
+    if not complete:
+        # 일부만 받은 목록으로는 남은 댓글을 판단할 수 없으므로 DOM으로 대체하게 한다
+        log(f"  댓글 API: {total_pages}페이지 중 {COMMENT_API_MAX_PAGES}페이지까지만 조회됨 - 전체 목록 아님")
+        return None
+
+    log(f"  댓글 API: {len(comments)}개 ({page}페이지)")
+    return comments
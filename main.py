@@ -1,15 +1,25 @@
 import customtkinter as ctk
-import asyncio
+import os
+import queue
 import threading
 import subprocess
-from datetime import date
+from datetime import date, datetime
+from browser_session import SessionManager
 from neighbor_request import NeighborRequestBot
 from buddy_comment import BuddyCommentBot
 from reply_bot import ReplyBot
+from utils import DATA_DIR
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+# 로그 창 갱신 주기(ms), 한 번에 넣는 최대 줄 수, 화면에 남기는 최대 줄 수
+UI_TICK_MS = 100
+# 창/브라우저를 닫을 때 실행 중인 작업이 멈추기를 기다리는 최대 시간(초)
+BOT_STOP_TIMEOUT = 20
+LOG_BATCH_MAX = 500
+LOG_MAX_LINES = 2000
+
 class NaverNeighborApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -20,8 +30,20 @@ class NaverNeighborApp(ctk.CTk):
 
         self.bot = None
         self.is_running = False
+        self._worker = None  # 실행 중인 작업 스레드
+        # 실행이 끝나도 브라우저를 유지해 다음 실행(다른 탭 포함)에서 재사용
+        self.sessions = SessionManager()
+
+        # 작업 스레드는 큐에 넣기만 하고, UI 틱에서 모아서 그린다
+        self._log_queue = queue.Queue()
+        self._pending_progress = None
+        self._log_file = self._open_log_file()
+        self._ui_tick_id = None
+        self._closing = None  # 종료 중이면 브라우저 정리 스레드
 
         self._create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._ui_tick()
 
     def _create_widgets(self):
         title_label = ctk.CTkLabel(
@@ -72,6 +94,13 @@ class NaverNeighborApp(ctk.CTk):
         )
         self.stop_btn.grid(row=0, column=1, padx=10)
 
+        self.close_browser_btn = ctk.CTkButton(
+            btn_frame, text="브라우저 닫기", width=150, height=30,
+            command=self._on_close_browser, fg_color="#555555", hover_color="#444444",
+            font=ctk.CTkFont(size=13)
+        )
+        self.close_browser_btn.grid(row=1, column=0, columnspan=2, pady=(5, 0))
+
         self.progress_label = ctk.CTkLabel(self, text="대기 중...")
         self.progress_label.pack(pady=3)
 
@@ -202,13 +231,54 @@ class NaverNeighborApp(ctk.CTk):
         )
         self.t3_dry_run_check.pack(pady=2)
 
+    @staticmethod
+    def _open_log_file():
+        """전체 로그는 파일에 남긴다 (화면에는 최근 LOG_MAX_LINES줄만)"""
+        log_dir = os.path.join(DATA_DIR, "logs")
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            name = f"gui_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+            return open(os.path.join(log_dir, name), "a", encoding="utf-8")
+        except OSError:
+            return None
+
     def _log(self, message: str):
-        self.log_textbox.insert("end", f"{message}\n")
-        self.log_textbox.see("end")
+        """어느 스레드에서든 호출 가능. 다음 UI 틱에 한꺼번에 출력된다."""
+        self._log_queue.put(message)
 
     def _update_progress(self, current: int, total: int):
-        self.progress_label.configure(text=f"진행 중: {current}/{total}")
-        self.progress_bar.set(current / total if total > 0 else 0)
+        """어느 스레드에서든 호출 가능. UI 틱마다 마지막 값만 반영한다."""
+        self._pending_progress = (current, total)
+
+    def _ui_tick(self):
+        self._flush_ui()
+        self._ui_tick_id = self.after(UI_TICK_MS, self._ui_tick)
+
+    def _flush_ui(self):
+        lines = []
+        while len(lines) < LOG_BATCH_MAX:
+            try:
+                lines.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        if lines:
+            text = "\n".join(lines) + "\n"
+            if self._log_file:
+                self._log_file.write(text)
+                self._log_file.flush()
+            self.log_textbox.insert("end", text)
+            # 마지막 빈 줄을 빼고 센 줄 수가 한도를 넘으면 앞에서부터 잘라낸다
+            line_count = int(self.log_textbox.index("end-1c").split(".")[0]) - 1
+            if line_count > LOG_MAX_LINES:
+                self.log_textbox.delete("1.0", f"{line_count - LOG_MAX_LINES + 1}.0")
+            self.log_textbox.see("end")
+
+        progress, self._pending_progress = self._pending_progress, None
+        if progress:
+            current, total = progress
+            self.progress_label.configure(text=f"진행 중: {current}/{total}")
+            self.progress_bar.set(current / total if total > 0 else 0)
 
     def _set_running(self, running: bool):
         self.is_running = running
@@ -216,6 +286,7 @@ class NaverNeighborApp(ctk.CTk):
         state_stop = "normal" if running else "disabled"
         self.start_btn.configure(state=state_start)
         self.stop_btn.configure(state=state_stop)
+        self.close_browser_btn.configure(state=state_start)
 
     def _on_start_dispatch(self):
         current_tab = self.tabview.get()
@@ -251,6 +322,7 @@ class NaverNeighborApp(ctk.CTk):
         )
         thread.daemon = True
         thread.start()
+        self._worker = thread
 
     def _on_start_buddy_comment(self):
         user_id = self.t2_id_entry.get().strip() or "lizidemarron"
@@ -271,6 +343,7 @@ class NaverNeighborApp(ctk.CTk):
         )
         thread.daemon = True
         thread.start()
+        self._worker = thread
 
     def _on_start_reply(self):
         user_id = self.t3_id_entry.get().strip() or "lizidemarron"
@@ -278,7 +351,7 @@ class NaverNeighborApp(ctk.CTk):
         cutoff_date = self.t3_date_entry.get().strip() or date.today().strftime("%Y-%m-%d")
         dry_run = self.t3_dry_run_var.get()
 
-        if not gemini_api_key:
+        if not gemini_api_key and not dry_run:
             self._log("Gemini API 키를 입력해주세요!")
             return
 
@@ -289,76 +362,68 @@ class NaverNeighborApp(ctk.CTk):
         )
         thread.daemon = True
         thread.start()
+        self._worker = thread
 
     def _run_bot(self, blog_url: str, user_id: str,
                  neighbor_message: str, max_success: int):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
         self.bot = NeighborRequestBot(
-            log_callback=lambda msg: self.after(0, self._log, msg)
+            log_callback=self._log,
+            session_manager=self.sessions,
         )
 
         try:
-            loop.run_until_complete(
+            self.sessions.run(
                 self.bot.run(
                     blog_url, user_id,
-                    progress_callback=lambda c, t: self.after(0, self._update_progress, c, t),
+                    progress_callback=self._update_progress,
                     neighbor_message=neighbor_message,
                     max_success=max_success
                 )
             )
         finally:
-            loop.close()
             self.after(0, self._on_complete)
 
     def _run_buddy_comment_bot(self, user_id: str,
                                 gemini_api_key: str, group_name: str,
                                 cutoff_date: str, sort_order: str):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
         self.bot = BuddyCommentBot(
-            log_callback=lambda msg: self.after(0, self._log, msg)
+            log_callback=self._log,
+            session_manager=self.sessions,
         )
 
         try:
-            loop.run_until_complete(
+            self.sessions.run(
                 self.bot.run_buddy_comment(
                     user_id,
                     gemini_api_key=gemini_api_key,
                     group_name=group_name,
                     cutoff_date=cutoff_date,
                     sort_order=sort_order,
-                    progress_callback=lambda c, t: self.after(0, self._update_progress, c, t),
+                    progress_callback=self._update_progress,
                 )
             )
         finally:
-            loop.close()
             self.after(0, self._on_complete)
 
     def _run_reply_bot(self, user_id: str,
                        gemini_api_key: str, cutoff_date: str,
                        dry_run: bool = False):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
         self.bot = ReplyBot(
-            log_callback=lambda msg: self.after(0, self._log, msg)
+            log_callback=self._log,
+            session_manager=self.sessions,
         )
 
         try:
-            loop.run_until_complete(
+            self.sessions.run(
                 self.bot.run_reply(
                     user_id,
                     gemini_api_key=gemini_api_key,
                     cutoff_date=cutoff_date,
                     dry_run=dry_run,
-                    progress_callback=lambda c, t: self.after(0, self._update_progress, c, t),
+                    progress_callback=self._update_progress,
                 )
             )
         finally:
-            loop.close()
             self.after(0, self._on_complete)
 
     def _on_stop(self):
@@ -366,16 +431,79 @@ class NaverNeighborApp(ctk.CTk):
             self.bot.stop()
         self._log("중지 요청됨...")
 
+    def _stop_bot(self) -> bool:
+        """실행 중인 작업이 있으면 중지를 요청하고 True (Tk 스레드에서 호출)"""
+        if not (self.bot and self._worker and self._worker.is_alive()):
+            return False
+        self.bot.stop()
+        self._log("실행 중인 작업을 멈추는 중...")
+        return True
+
+    def _join_worker(self):
+        """작업 스레드가 진행 중인 대상까지 정리하고 끝나기를 기다린다 (Tk 스레드에서 호출 금지)"""
+        worker = self._worker
+        if worker and worker.is_alive():
+            worker.join(BOT_STOP_TIMEOUT)
+
+    def _on_close_browser(self):
+        if not self.sessions.open_profiles():
+            self._log("열려 있는 브라우저가 없습니다.")
+            return
+        self._stop_bot()
+
+        def done(f):
+            try:
+                self._log(f"브라우저 {f.result()}개 종료됨")
+            except Exception as e:
+                self._log(f"브라우저 종료 오류: {str(e)}")
+
+        def close():
+            # 작업이 브라우저를 반납한 뒤에 닫아야 중단이 오류가 아닌 중지로 기록된다
+            self._join_worker()
+            self.sessions.submit(self.sessions.close_all()).add_done_callback(done)
+
+        threading.Thread(target=close, daemon=True).start()
+
+    def _on_close(self):
+        # shutdown()은 세션 루프 작업이 끝날 때까지 기다리므로 Tk 스레드에서 부르지 않는다
+        if self._closing:
+            return
+        self._stop_bot()
+        self._log("브라우저 정리 후 종료합니다...")
+        self._closing = threading.Thread(target=self._shutdown_sessions, daemon=True)
+        self._closing.start()
+        self._wait_close()
+
+    def _shutdown_sessions(self):
+        self._join_worker()
+        self.sessions.shutdown()
+
+    def _wait_close(self):
+        if self._closing.is_alive():
+            self.after(UI_TICK_MS, self._wait_close)
+            return
+        if self._ui_tick_id:
+            self.after_cancel(self._ui_tick_id)
+        # 화면에 못 그린 로그도 파일에는 남긴다
+        while not self._log_queue.empty():
+            self._flush_ui()
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+        self.destroy()
+
     def _on_complete(self):
+        # 남은 로그/진행 상황을 먼저 반영해야 "완료!"가 덮어써지지 않는다
+        self._flush_ui()
         action = self.post_action_var.get()
         if action == "프로그램 종료":
             self._log("작업 완료 — 프로그램을 종료합니다.")
-            self.after(1500, self.destroy)
+            self.after(1500, self._on_close)
             return
         elif action == "잠자기 모드":
             self._log("작업 완료 — 프로그램 종료 후 잠자기 모드로 진입합니다.")
             subprocess.Popen(["bash", "-c", "sleep 4 && pmset sleepnow"])
-            self.after(2000, self.destroy)
+            self.after(2000, self._on_close)
             return
         self._set_running(False)
         self.progress_label.configure(text="완료!")
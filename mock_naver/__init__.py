@@ -0,0 +1,4 @@
+from mock_naver.state import MockNaverState
+from mock_naver.server import MockNaverServer
+
+__all__ = ["MockNaverState", "MockNaverServer"]
@@ -0,0 +1,28 @@
+"""mock 네이버 서버 단독 실행
+
+    python -m mock_naver [--port 8765] [--user mockuser]
+
+브라우저에서 http://127.0.0.1:8765/blog.naver.com/PostList.naver?blogId=mockuser 등으로
+확인하거나, 봇을 base_url=http://127.0.0.1:8765 로 만들어 접속시킨다.
+"""
+import argparse
+import time
+
+from mock_naver import MockNaverServer, MockNaverState
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--user", default="mockuser", help="로그인된 것으로 간주할 계정")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockNaverServer(MockNaverState.sample(my_id=args.user, seed=args.seed),
+                             host=args.host, port=args.port)
+    print(f"mock 네이버 서버 실행 중: {server.start()} (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
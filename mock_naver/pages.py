@@ -0,0 +1,503 @@
+"""mock 서버 HTML 페이지
+
+실제 네이버 페이지에서 봇이 사용하는 선택자/구조만 재현한다. 링크는 모두
+/{호스트명}/... 형태의 절대 경로라서 NaverUrls(base_url)과 그대로 맞물린다.
+"""
+import json
+from datetime import date
+from html import escape
+from urllib.parse import quote
+
+from mock_naver.state import MockNaverState
+
+# 실제 페이지처럼 웹폰트와 통계 스크립트를 붙인다 (scrape_only 차단 효과 측정용)
+_HEAD = ('<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>{title}</title>'
+         '<link rel="stylesheet" href="/ssl.pstatic.net/static/blog/fonts.css">'
+         '<script async src="/wcs.naver.net/wcslog.js"></script></head>')
+
+FONTS_CSS = """
+@font-face { font-family: 'MockNanum'; src: url('/ssl.pstatic.net/static/fonts/nanum.woff2') format('woff2'); }
+body { font-family: 'MockNanum', sans-serif; }
+"""
+
+TRACKER_JS = "/* wcslog mock */\n" + "/* " + "x" * 30000 + " */\n" + """
+(function () {
+  var img = new Image();
+  img.src = '/wcs.naver.net/b?u=' + encodeURIComponent(location.pathname);
+})();
+"""
+
+
+def _page(title: str, body: str) -> str:
+    return _HEAD.format(title=escape(title)) + f"<body>{body}</body></html>"
+
+
+def _post_list_date(d: date) -> str:
+    return f"{d.year}. {d.month}. {d.day}."
+
+
+def _buddy_date(d) -> str:
+    if d is None:
+        return "-"
+    return d.strftime("%y.%m.%d.")
+
+
+def home(state: MockNaverState) -> str:
+    login = ""
+    if not state.logged_in:
+        login = ('<a class="MyView-module__link_login___HpHMW" '
+                 'href="/nid.naver.com/nidlogin.login">NAVER 로그인</a>')
+    return _page("NAVER", f'<div id="account">{login}</div>')
+
+
+def login() -> str:
+    return _page("로그인", """
+<form id="frmNIDLogin" method="get" action="/www.naver.com/">
+  <input type="text" id="id" name="id">
+  <input type="password" id="pw" name="pw">
+  <button type="submit" class="btn_login">로그인</button>
+</form>""")
+
+
+def rss(state: MockNaverState, blog_id: str) -> str:
+    blog = state.blogs.get(blog_id)
+    items = []
+    for p in (blog["posts"] if blog else [])[:10]:
+        link = f"https://blog.naver.com/{quote(blog_id)}/{p['log_no']}?fromRss=true&amp;trackingCode=rss"
+        items.append(
+            f"<item><title><![CDATA[{p['title']}]]></title><link>{link}</link>"
+            f"<pubDate>{p['date'].strftime('%a, %d %b %Y 09:00:00 +0900')}</pubDate></item>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>{escape(blog['nick'] if blog else blog_id)}</title>{''.join(items)}</channel></rss>")
+
+
+def not_found() -> str:
+    return _page("없음", "<p>페이지를 찾을 수 없습니다.</p>")
+
+
+# ── 블로그: PostList / 글 / PostView ──
+
+def post_list(state: MockNaverState, blog_id: str, current_page: int, page_size: int = 10) -> str:
+    blog = state.blogs.get(blog_id)
+    if not blog:
+        return not_found()
+    posts = blog["posts"]
+    total_pages = max(1, (len(posts) + page_size - 1) // page_size)
+    current_page = min(max(current_page, 1), total_pages)
+    chunk = posts[(current_page - 1) * page_size:current_page * page_size]
+
+    frames = ""
+    if posts:
+        latest = posts[0]["log_no"]
+        frames = (f'<iframe name="sympathyFrm{latest}" src="about:blank" '
+                  f'width="1" height="1" frameborder="0"></iframe>')
+
+    rows = []
+    for p in chunk:
+        href = f"/blog.naver.com/PostView.naver?blogId={quote(blog_id)}&logNo={p['log_no']}"
+        rows.append(
+            "<tr>"
+            f'<td class="title"><img class="thumb" src="/mock/img.png?blogId={quote(blog_id)}&logNo={p["log_no"]}&thumb=1" width="50" height="50" alt="">'
+            f'<span class="ell2"><a href="{href}" class="pcol2">{escape(p["title"])}</a></span></td>'
+            f'<td class="date"><div class="wrap_td"><span class="date pcol2">{_post_list_date(p["date"])}</span></div></td>'
+            "</tr>"
+        )
+
+    pages = []
+    for n in range(1, total_pages + 1):
+        if n == current_page:
+            pages.append(f'<strong class="page">{n}</strong>')
+        else:
+            href = (f"/blog.naver.com/PostList.naver?blogId={quote(blog_id)}"
+                    f"&categoryNo=0&from=postList&currentPage={n}")
+            pages.append(f'<a href="{href}" class="page pcol2 _goPageTop _param({n})">{n}</a>')
+
+    return _page(f"{blog['nick']} : 글 목록", f"""
+<div id="postListBody">
+  {frames}
+  <table class="blog2_categorylist"><tbody>{''.join(rows)}</tbody></table>
+  <div class="blog2_paginate">{''.join(pages)}</div>
+</div>""")
+
+
+def blog_shell(blog_id: str, log_no: str) -> str:
+    src = f"/blog.naver.com/PostView.naver?blogId={quote(blog_id)}&logNo={log_no}&redirect=Dlog"
+    return _page(blog_id, f"""
+<div id="whole-border">
+  <iframe id="mainFrame" name="mainFrame" src="{src}" width="100%" height="3000" frameborder="0"></iframe>
+</div>""")
+
+
+_POST_VIEW_SCRIPT = """
+(function () {
+  const ctx = window.__post;
+  const API = '/apis.naver.com/commentBox/cbox/web_naver_list_jsonp.json';
+  const box = document.getElementById('naverComment');
+  const list = box.querySelector('.u_cbox_list');
+  const pager = box.querySelector('.u_cbox_paginate');
+
+  function esc(s) { const d = document.createElement('div'); d.textContent = s; return d.innerHTML; }
+
+  function render(c) {
+    const level = c.replyLevel;
+    const info = "commentNo:'" + c.commentNo + "',parentCommentNo:'" + c.parentCommentNo +
+                 "',replyLevel:" + level + ",deleted:false";
+    const editor = c.isBlogOwner ? '<span class="u_cbox_ico_editor">블로그주인</span>' : '';
+    return '<li class="u_cbox_comment' + (level === 2 ? ' u_cbox_type_reply' : '') + '" data-info="' + info + '">' +
+      '<div class="u_cbox_comment_box"><div class="u_cbox_area">' +
+      '<div class="u_cbox_info"><a class="u_cbox_name" href="https://blog.naver.com/' + esc(c.profileUserId) + '">' +
+      '<span class="u_cbox_nick">' + esc(c.userName) + '</span></a>' + editor + '</div>' +
+      '<div class="u_cbox_text_wrap"><span class="u_cbox_contents">' + esc(c.contents) + '</span></div>' +
+      (level === 1 ? '<div class="u_cbox_tool"><a href="#" class="u_cbox_btn_reply">답글</a></div>' : '') +
+      '</div></div></li>';
+  }
+
+  async function load(page) {
+    const url = API + '?ticket=blog&pool=blogid&lang=ko&objectId=' + ctx.blogNo + '_201_' + ctx.logNo +
+                '&pageSize=' + ctx.pageSize + '&page=' + page;
+    const res = await fetch(url);
+    const data = await res.json();
+    ctx.page = page;
+    list.innerHTML = data.result.commentList.map(render).join('');
+    const total = data.result.pageModel.totalPages;
+    let html = '';
+    for (let i = 1; i <= total; i++) {
+      html += i === page
+        ? '<strong class="u_cbox_num_page">' + i + '</strong>'
+        : '<a href="#" class="u_cbox_page" data-param="' + i + '"><span class="u_cbox_num_page">' + i + '</span></a>';
+    }
+    pager.innerHTML = html;
+  }
+
+  async function post(parentNo, text) {
+    await fetch('/mock/comment', {
+      method: 'POST',
+      headers: {'Content-Type': 'application/json'},
+      body: JSON.stringify({blogId: ctx.blogId, logNo: ctx.logNo, parentCommentNo: parentNo, contents: text}),
+    });
+    await load(ctx.page || 1);
+  }
+
+  document.addEventListener('click', function (ev) {
+    const el = ev.target.closest('a, button, .u_cbox_guide');
+    if (!el) return;
+    if (el.matches('a')) ev.preventDefault();
+
+    if (el.matches('a._cmtList')) {
+      if (box.style.display === 'none') { box.style.display = 'block'; load(1); }
+    } else if (el.matches('.u_cbox_guide')) {
+      el.style.display = 'none';
+      document.getElementById('naverComment__write_textarea').focus();
+    } else if (el.matches('a.u_cbox_page')) {
+      load(parseInt(el.getAttribute('data-param'), 10));
+    } else if (el.matches('a.u_cbox_btn_reply')) {
+      const li = el.closest('li.u_cbox_comment');
+      const no = /commentNo:'(\\d+)'/.exec(li.getAttribute('data-info'))[1];
+      const open = li.querySelector('.u_cbox_reply_area');
+      if (open) { open.remove(); return; }
+      li.insertAdjacentHTML('beforeend',
+        '<div class="u_cbox_reply_area"><div class="u_cbox_write_box">' +
+        '<div contenteditable="true" class="u_cbox_text" id="naverComment__reply_textarea_' + no + '"></div>' +
+        '<button type="button" class="u_cbox_btn_upload">등록</button></div></div>');
+    } else if (el.matches('button.u_cbox_btn_upload')) {
+      const input = el.closest('.u_cbox_write_box').querySelector('.u_cbox_text');
+      const text = input.innerText.trim();
+      if (!text) return;
+      const li = el.closest('li.u_cbox_comment');
+      const parentNo = li ? /commentNo:'(\\d+)'/.exec(li.getAttribute('data-info'))[1] : '';
+      input.innerText = '';
+      post(parentNo, text);
+    } else if (el.matches('a.u_likeit_button._face')) {
+      document.querySelector('.u_likeit_layer').style.display = 'block';
+    } else if (el.matches('a.u_likeit_list_button._button')) {
+      fetch('/mock/sympathy', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({blogId: ctx.blogId, logNo: ctx.logNo}),
+      });
+      el.setAttribute('aria-pressed', 'true');
+      document.querySelector('a.u_likeit_button._face').classList.add('on');
+    }
+  });
+})();
+"""
+
+
+def post_view(state: MockNaverState, blog_id: str, log_no: str) -> str:
+    blog = state.blogs.get(blog_id)
+    post = state.get_post(blog_id, log_no)
+    if not blog or not post:
+        return not_found()
+
+    components = []
+    for i, para in enumerate(post["paragraphs"]):
+        components.append(
+            '<div class="se-component se-text se-l-default"><div class="se-component-content">'
+            f'<div class="se-section se-section-text"><p class="se-text-paragraph"><span>{escape(para)}</span></p>'
+            '</div></div></div>'
+        )
+        if i < post["images"]:
+            components.append(
+                '<div class="se-component se-image se-l-default"><div class="se-component-content">'
+                f'<img class="se-image-resource" src="/mock/img.png?blogId={quote(blog_id)}&logNo={log_no}&n={i}" '
+                'width="600" height="400"></div></div>'
+            )
+
+    liked = (blog_id, log_no) in state.liked
+    comment_count = sum(1 for c in post["comments"] if c["level"] == 1)
+    ctx = json.dumps({
+        "blogId": blog_id,
+        "logNo": log_no,
+        "blogNo": blog["blog_no"],
+        "pageSize": state.comment_page_size,
+    })
+
+    return _page(post["title"], f"""
+<div id="postViewArea">
+  <div class="se-component se-documentTitle"><div class="se-title-text"><span>{escape(post['title'])}</span></div></div>
+  <div class="se-main-container">{''.join(components)}</div>
+</div>
+<div class="my_reaction">
+  <a href="#" class="u_likeit_button _face{' on' if liked else ''}" role="button">공감</a>
+  <div class="u_likeit_layer" style="display:none">
+    <a href="#" class="u_likeit_list_button _button" data-type="like" aria-pressed="{'true' if liked else 'false'}">좋아요</a>
+  </div>
+</div>
+<div class="area_comment">
+  <a href="#" class="btn_comment _cmtList">댓글 {comment_count}</a>
+  <div id="naverComment" class="u_cbox" style="display:none">
+    <div class="u_cbox_write_wrap"><div class="u_cbox_write_box">
+      <div class="u_cbox_guide">댓글을 입력해주세요</div>
+      <div contenteditable="true" class="u_cbox_text" id="naverComment__write_textarea"></div>
+      <button type="button" class="u_cbox_btn_upload">등록</button>
+    </div></div>
+    <ul class="u_cbox_list"></ul>
+    <div class="u_cbox_paginate"></div>
+  </div>
+</div>
+<div style="height:1200px"></div>
+<script>var blogNo = '{blog['blog_no']}'; window.__post = {ctx};</script>
+<script>{_POST_VIEW_SCRIPT}</script>""")
+
+
+def comment_list_json(state: MockNaverState, blog_no: str, log_no: str,
+                      page: int, page_size: int) -> dict:
+    """u_cbox 위젯이 호출하는 댓글 목록 JSON (부모 댓글 단위로 페이지 분할, 답글은 부모 뒤에 포함)"""
+    blog, post = state.find_post_by_blog_no(blog_no, log_no)
+    if not post:
+        return {"success": False, "code": "3999", "message": "not found"}
+    threads = state.comment_threads(post)
+    total_pages = max(1, (len(threads) + page_size - 1) // page_size)
+    page = min(max(page, 1), total_pages)
+    items = []
+    for thread in threads[(page - 1) * page_size:page * page_size]:
+        parent = thread[0]
+        for c in thread:
+            items.append({
+                "commentNo": int(c["comment_no"]),
+                "parentCommentNo": int(c["parent_no"] or c["comment_no"]),
+                "replyLevel": c["level"],
+                "replyCount": len(thread) - 1 if c is parent else 0,
+                "userName": c["nick"],
+                "profileUserId": c["author"],
+                "contents": c["text"],
+                "isBlogOwner": c["is_owner"],
+                "deleted": False,
+            })
+    return {
+        "success": True,
+        "code": "1000",
+        "result": {
+            "commentList": items,
+            "pageModel": {
+                "page": page,
+                "pageSize": page_size,
+                "totalPages": total_pages,
+                "totalRows": len(threads),
+            },
+        },
+    }
+
+
+# ── 공감 목록 / 이웃추가 팝업 ──
+
+_SYMPATHY_SCRIPT = """
+(function () {
+  const ctx = window.__sympathy;
+  const list = document.querySelector('ul.list_sympathy');
+  const more = document.getElementById('_loadNext');
+
+  function esc(s) { const d = document.createElement('div'); d.textContent = s; return d.innerHTML; }
+
+  document.addEventListener('click', async function (ev) {
+    const el = ev.target.closest('a');
+    if (!el) return;
+    if (el.id === '_loadNext') {
+      ev.preventDefault();
+      const res = await fetch('/mock/sympathy_list?blogId=' + ctx.blogId + '&logNo=' + ctx.logNo + '&page=' + (ctx.page + 1));
+      const data = await res.json();
+      ctx.page += 1;
+      list.insertAdjacentHTML('beforeend', data.items.map(a =>
+        '<li><div class="nick"><a href="https://blog.naver.com/' + esc(a.user_id) + '">' + esc(a.nick) + '</a></div>' +
+        (a.can_add ? '<a href="#" class="btn_buddy _addBuddyPop _param(' + esc(a.user_id) + ')">이웃추가</a>' : '') +
+        '</li>').join(''));
+      if (!data.has_more) more.style.display = 'none';
+    } else if (el.classList.contains('_addBuddyPop')) {
+      ev.preventDefault();
+      const id = /_param\\(([^)]+)\\)/.exec(el.className)[1];
+      window.open('/blog.naver.com/BuddyAdd.naver?blogId=' + encodeURIComponent(id), 'buddyAdd', 'width=460,height=560');
+    }
+  });
+})();
+"""
+
+
+def sympathy_items(state: MockNaverState, blog_id: str, log_no: str, page: int) -> tuple:
+    accounts = state.sympathy.get((blog_id, log_no), [])
+    size = state.sympathy_page_size
+    items = accounts[(page - 1) * size:page * size]
+    return items, page * size < len(accounts)
+
+
+def sympathy_history(state: MockNaverState, blog_id: str, log_no: str) -> str:
+    items, has_more = sympathy_items(state, blog_id, log_no, 1)
+    lis = []
+    for a in items:
+        btn = ""
+        if a["can_add"]:
+            btn = f'<a href="#" class="btn_buddy _addBuddyPop _param({escape(a["user_id"])})">이웃추가</a>'
+        lis.append(f'<li><div class="nick"><a href="https://blog.naver.com/{escape(a["user_id"])}">'
+                   f'{escape(a["nick"])}</a></div>{btn}</li>')
+    ctx = json.dumps({"blogId": blog_id, "logNo": log_no, "page": 1})
+    style = "" if has_more else ' style="display:none"'
+    return _page("공감한 사람", f"""
+<ul class="list_sympathy">{''.join(lis)}</ul>
+<a href="#" id="_loadNext" class="btn_more"{style}>더보기</a>
+<script>window.__sympathy = {ctx};</script>
+<script>{_SYMPATHY_SCRIPT}</script>""")
+
+
+def buddy_add(state: MockNaverState, target_id: str, step: int) -> str:
+    already = target_id in state.buddy_requests
+    if step == 1:
+        disabled = " disabled" if already else ""
+        return _page("이웃추가", f"""
+<div class="buddy_add">
+  <p><strong>{escape(target_id)}</strong>님을 이웃으로 추가합니다.</p>
+  <input type="radio" id="each_buddy_add" name="relation"{' disabled' if already else ''}>
+  <label for="each_buddy_add" class="label_each{disabled}">서로이웃을 신청합니다.</label>
+  <a href="/blog.naver.com/BuddyAdd.naver?blogId={quote(target_id)}&step=2" class="button_next">다음</a>
+</div>""")
+
+    target = json.dumps(target_id)
+    return _page("서로이웃 신청", f"""
+<div class="buddy_add">
+  <textarea name="message" rows="4" cols="40">서로이웃 신청합니다.</textarea>
+  <a href="#" class="button_ok">확인</a>
+</div>
+<script>
+document.querySelector('a.button_ok').addEventListener('click', async function (ev) {{
+  ev.preventDefault();
+  await fetch('/mock/buddy_request', {{
+    method: 'POST',
+    headers: {{'Content-Type': 'application/json'}},
+    body: JSON.stringify({{blogId: {target}, message: document.querySelector('textarea').value}}),
+  }});
+  window.close();
+}});
+</script>""")
+
+
+# ── 이웃 관리 (admin) ──
+
+def admin_main(blog_id: str) -> str:
+    src = f"/admin.blog.naver.com/BuddyInfoManage.naver?blogId={quote(blog_id)}"
+    return _page("내 블로그 관리", f"""
+<iframe id="papermain" name="papermain" src="{src}" width="100%" height="2000" frameborder="0"></iframe>""")
+
+
+_ORDERS = ["업데이트순", "이웃추가순"]
+
+_SELECTBOX_SCRIPT = """
+document.addEventListener('click', function (ev) {
+  const box = ev.target.closest('.selectbox-box');
+  if (box) {
+    const list = box.parentNode.querySelector('.selectbox-list');
+    list.style.display = list.style.display === 'none' ? 'block' : 'none';
+    return;
+  }
+  const item = ev.target.closest('.selectbox-list li');
+  if (item) location.href = item.getAttribute('data-href');
+});
+"""
+
+
+def buddy_manage(state: MockNaverState, blog_id: str, group: str, order: str, page: int) -> str:
+    groups = list(state.buddy_groups)
+    if group not in groups and group != "전체":
+        group = "전체"
+    if order not in _ORDERS:
+        order = _ORDERS[0]
+
+    if group == "전체":
+        buddies = [b for g in state.buddy_groups.values() for b in g]
+    else:
+        buddies = list(state.buddy_groups[group])
+    if order == "업데이트순":
+        buddies.sort(key=lambda b: (b["update_date"] or date.min, b["blog_id"]), reverse=True)
+    else:
+        buddies.sort(key=lambda b: (b["added_date"], b["blog_id"]), reverse=True)
+
+    size = state.buddy_page_size
+    total_pages = max(1, (len(buddies) + size - 1) // size)
+    page = min(max(page, 1), total_pages)
+
+    def href(g: str = group, o: str = order, p: int = 1) -> str:
+        return (f"/admin.blog.naver.com/BuddyInfoManage.naver?blogId={quote(blog_id)}"
+                f"&group={quote(g)}&order={quote(o)}&page={p}")
+
+    group_items = "".join(
+        f'<li data-href="{href(g=g)}">{escape(g)}</li>' for g in ["전체"] + groups
+    )
+    order_items = "".join(
+        f'<li data-href="{href(o=o)}">{escape(o)}</li>' for o in _ORDERS
+    )
+
+    rows = []
+    for b in buddies[(page - 1) * size:page * size]:
+        rows.append(
+            "<tr>"
+            '<td class="check"><input type="checkbox"></td>'
+            f'<td class="buddy"><a href="https://blog.naver.com/{escape(b["blog_id"])}" target="_blank">'
+            f'<img class="thumb" src="/mock/img.png?profile={quote(b["blog_id"])}" width="26" height="26" alt="">'
+            f'<span class="nickname">{escape(b["nick"])}</span></a></td>'
+            f'<td class="group">{escape(group)}</td>'
+            '<td class="relation">서로이웃</td>'
+            '<td class="open">전체공개</td>'
+            f'<td class="update">{_buddy_date(b["update_date"])}</td>'
+            f'<td class="add">{_buddy_date(b["added_date"])}</td>'
+            "</tr>"
+        )
+
+    pages = []
+    for n in range(1, total_pages + 1):
+        pages.append(f"<strong>{n}</strong>" if n == page else f'<a href="{href(p=n)}">{n}</a>')
+    if page < total_pages:
+        pages.append(f'<a href="{href(p=page + 1)}" class="next">다음</a>')
+
+    return _page("이웃 관리", f"""
+<div id="buddysel_groupall" class="selectbox">
+  <div class="selectbox-box"><span class="selectbox-label">{escape(group)}</span></div>
+  <ul class="selectbox-list" style="display:none">{group_items}</ul>
+</div>
+<div id="buddysel_order" class="selectbox">
+  <div class="selectbox-box"><span class="selectbox-label">{escape(order)}</span></div>
+  <ul class="selectbox-list" style="display:none">{order_items}</ul>
+</div>
+<table class="tbl_buddymanage">
+  <thead><tr><th></th><th>이웃</th><th>그룹</th><th>관계</th><th>공개</th><th>최근글</th><th>이웃추가일</th></tr></thead>
+  <tbody>{''.join(rows)}</tbody>
+</table>
+<div class="paginate">{''.join(pages)}</div>
+<script>{_SELECTBOX_SCRIPT}</script>""")
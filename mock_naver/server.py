@@ -0,0 +1,190 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from mock_naver import pages
+from mock_naver.state import MockNaverState
+
+# 이미지/폰트 요청 응답 (본문 크기만 의미 있음)
+_IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 20000
+_FONT_BYTES = b"wOF2" + b"\x00" * 60000
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "MockNaver/1.0"
+    state: MockNaverState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    # ── 응답 헬퍼 ──
+
+    def _send(self, status: int, body: bytes, content_type: str, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _html(self, html: str, status: int = 200, headers=()):
+        self._send(status, html.encode("utf-8"), "text/html; charset=utf-8", headers)
+
+    def _json(self, data, callback: Optional[str] = None):
+        raw = json.dumps(data, ensure_ascii=False)
+        if callback:
+            self._send(200, f"{callback}({raw});".encode("utf-8"), "text/javascript; charset=utf-8")
+        else:
+            self._send(200, raw.encode("utf-8"), "application/json; charset=utf-8")
+
+    def _split(self):
+        parts = urlsplit(self.path)
+        segments = [s for s in parts.path.split("/") if s]
+        host = segments[0] if segments else ""
+        rest = segments[1:]
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        return host, rest, query
+
+    # ── 라우팅 ──
+
+    def do_GET(self):
+        host, rest, q = self._split()
+        state = self.state
+        state.hits[f"GET {host}/{'/'.join(rest)}"] += 1
+
+        if host == "www.naver.com":
+            cookies = []
+            if state.logged_in:
+                # 실제 네이버처럼 로그인 세션 쿠키를 내려준다 (NID_SES는 세션 쿠키)
+                cookies = [
+                    ("Set-Cookie", f"NID_AUT=mock-{state.my_id}; Path=/; Max-Age=86400"),
+                    ("Set-Cookie", f"NID_SES=mock-{state.my_id}; Path=/"),
+                ]
+            return self._html(pages.home(state), headers=cookies)
+        if host == "nid.naver.com":
+            return self._html(pages.login())
+        if host == "blog.naver.com":
+            return self._blog_get(rest, q)
+        if host == "admin.blog.naver.com":
+            if rest == ["AdminMain.naver"]:
+                return self._html(pages.admin_main(q.get("blogId", state.my_id)))
+            if rest == ["BuddyInfoManage.naver"]:
+                return self._html(pages.buddy_manage(
+                    state, q.get("blogId", state.my_id), q.get("group", "전체"),
+                    q.get("order", "업데이트순"), int(q.get("page", "1")),
+                ))
+        if host == "apis.naver.com" and rest[-1:] == ["web_naver_list_jsonp.json"]:
+            blog_no, _, log_no = q.get("objectId", "").partition("_201_")
+            data = pages.comment_list_json(
+                state, blog_no, log_no, int(q.get("page", "1")),
+                int(q.get("pageSize", str(state.comment_page_size))),
+            )
+            return self._json(data, q.get("_callback"))
+        if host == "rss.blog.naver.com" and len(rest) == 1 and rest[0].endswith(".xml"):
+            blog_id = rest[0][:-len(".xml")]
+            if blog_id in state.blogs:
+                return self._send(200, pages.rss(state, blog_id).encode("utf-8"),
+                                  "application/xml; charset=utf-8")
+        if host == "ssl.pstatic.net":
+            if rest[-1:] == ["fonts.css"]:
+                return self._send(200, pages.FONTS_CSS.encode("utf-8"), "text/css; charset=utf-8")
+            if rest[-1:] == ["nanum.woff2"]:
+                return self._send(200, _FONT_BYTES, "font/woff2")
+        if host == "wcs.naver.net":
+            if rest == ["wcslog.js"]:
+                return self._send(200, pages.TRACKER_JS.encode("utf-8"), "text/javascript; charset=utf-8")
+            return self._send(200, _IMAGE_BYTES[:43], "image/gif")
+        if host == "mock":
+            if rest == ["img.png"]:
+                return self._send(200, _IMAGE_BYTES, "image/png")
+            if rest == ["sympathy_list"]:
+                items, has_more = pages.sympathy_items(
+                    state, q.get("blogId", ""), q.get("logNo", ""), int(q.get("page", "1"))
+                )
+                return self._json({"items": items, "has_more": has_more})
+        return self._html(pages.not_found(), 404)
+
+    def _blog_get(self, rest, q):
+        state = self.state
+        if rest == ["PostList.naver"]:
+            return self._html(pages.post_list(state, q.get("blogId", ""), int(q.get("currentPage", "1"))))
+        if rest == ["PostView.naver"]:
+            return self._html(pages.post_view(state, q.get("blogId", ""), q.get("logNo", "")))
+        if rest == ["SympathyHistoryList.naver"]:
+            return self._html(pages.sympathy_history(state, q.get("blogId", ""), q.get("logNo", "")))
+        if rest == ["BuddyAdd.naver"]:
+            return self._html(pages.buddy_add(state, q.get("blogId", ""), int(q.get("step", "1"))))
+        if len(rest) == 2 and rest[1].isdigit():
+            return self._html(pages.blog_shell(rest[0], rest[1]))
+        if len(rest) == 1 and rest[0] in state.blogs:
+            posts = state.blogs[rest[0]]["posts"]
+            if posts:
+                return self._html(pages.blog_shell(rest[0], posts[0]["log_no"]))
+        return self._html(pages.not_found(), 404)
+
+    def do_POST(self):
+        host, rest, _ = self._split()
+        state = self.state
+        state.hits[f"POST {host}/{'/'.join(rest)}"] += 1
+        length = int(self.headers.get("Content-Length", "0"))
+        try:
+            data = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            data = {}
+
+        if host == "mock" and rest == ["comment"]:
+            blog_id = data.get("blogId", "")
+            me = state.blogs.get(state.my_id, {}).get("nick", state.my_id)
+            comment_no = state.add_comment(
+                blog_id, data.get("logNo", ""), state.my_id, me,
+                data.get("contents", ""), parent_no=data.get("parentCommentNo") or None,
+            )
+            return self._json({"success": comment_no is not None, "commentNo": comment_no})
+        if host == "mock" and rest == ["sympathy"]:
+            with state.lock:
+                state.liked.add((data.get("blogId", ""), data.get("logNo", "")))
+            return self._json({"success": True})
+        if host == "mock" and rest == ["buddy_request"]:
+            with state.lock:
+                state.buddy_requests.setdefault(data.get("blogId", ""), data.get("message", ""))
+            return self._json({"success": True})
+        return self._json({"success": False})
+
+
+class MockNaverServer:
+    """로컬 mock 네이버 서버 (백그라운드 스레드)
+
+        server = MockNaverServer(MockNaverState.sample())
+        base_url = server.start()
+        bot = ReplyBot(base_url=base_url, headless=True)
+        ...
+        server.stop()
+    """
+
+    def __init__(self, state: Optional[MockNaverState] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.state = state or MockNaverState.sample()
+        handler = type("Handler", (_Handler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
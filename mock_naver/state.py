@@ -0,0 +1,195 @@
+import random
+import threading
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+_WORDS = [
+    "오늘", "카페", "다녀왔어요", "주말", "맛집", "여행", "후기", "정말", "분위기",
+    "추천", "디저트", "산책", "날씨", "좋아서", "사진", "많이", "찍었어요", "다음에",
+    "또", "가고", "싶어요", "아이랑", "함께", "시간", "보냈어요", "레시피", "공유",
+]
+
+_COMMENT_TEXTS = [
+    "사진이 너무 예뻐요 저도 가보고 싶네요",
+    "좋은 정보 감사합니다 😊",
+    "분위기 정말 좋아 보여요",
+    "저도 여기 가봤는데 맛있었어요",
+    "포스팅 잘 보고 갑니다",
+    "오늘도 힐링하고 가요 ㅎㅎ",
+    "레시피 따라 해볼게요!",
+    "아이가 좋아했겠어요",
+]
+
+
+class MockNaverState:
+    """mock 네이버 서버가 제공하는 블로그/댓글/공감/이웃 데이터 (메모리)
+
+    my_id는 mock 서버에 로그인된 계정이다. 댓글/답글 등록, 공감, 서로이웃 신청은
+    모두 이 계정 이름으로 기록된다. hits에는 경로별 요청 수가 쌓인다.
+    """
+
+    def __init__(self, my_id: str = "mockuser",
+                 comment_page_size: int = 10,
+                 sympathy_page_size: int = 10,
+                 buddy_page_size: int = 20):
+        self.my_id = my_id
+        self.logged_in = True
+        self.comment_page_size = comment_page_size
+        self.sympathy_page_size = sympathy_page_size
+        self.buddy_page_size = buddy_page_size
+        self.blogs: Dict[str, dict] = {}
+        self.sympathy: Dict[Tuple[str, str], List[dict]] = {}
+        self.buddy_groups: Dict[str, List[dict]] = {}
+        self.buddy_requests: Dict[str, str] = {}
+        self.liked = set()
+        self.hits = Counter()
+        self.lock = threading.Lock()
+        self._next_log_no = 223000000001
+        self._next_comment_no = 50001
+
+    # ── 데이터 구성 ──
+
+    def add_blog(self, blog_id: str, nick: Optional[str] = None) -> dict:
+        blog = self.blogs.get(blog_id)
+        if blog is None:
+            blog = {
+                "blog_id": blog_id,
+                "blog_no": str(10000000 + len(self.blogs)),
+                "nick": nick or blog_id,
+                "posts": [],
+            }
+            self.blogs[blog_id] = blog
+        return blog
+
+    def add_post(self, blog_id: str, title: str, paragraphs: List[str],
+                 posted: date, images: int = 0) -> str:
+        blog = self.add_blog(blog_id)
+        log_no = str(self._next_log_no)
+        self._next_log_no += 1
+        blog["posts"].append({
+            "log_no": log_no,
+            "title": title,
+            "date": posted,
+            "paragraphs": paragraphs,
+            "images": images,
+            "comments": [],
+        })
+        blog["posts"].sort(key=lambda p: (p["date"], p["log_no"]), reverse=True)
+        return log_no
+
+    def get_post(self, blog_id: str, log_no: str) -> Optional[dict]:
+        blog = self.blogs.get(blog_id)
+        if not blog:
+            return None
+        for post in blog["posts"]:
+            if post["log_no"] == log_no:
+                return post
+        return None
+
+    def find_post_by_blog_no(self, blog_no: str, log_no: str) -> Tuple[Optional[dict], Optional[dict]]:
+        for blog in self.blogs.values():
+            if blog["blog_no"] == blog_no:
+                return blog, self.get_post(blog["blog_id"], log_no)
+        return None, None
+
+    def add_comment(self, blog_id: str, log_no: str, author: str, nick: str,
+                    text: str, parent_no: Optional[str] = None) -> Optional[str]:
+        with self.lock:
+            post = self.get_post(blog_id, log_no)
+            if post is None:
+                return None
+            comment_no = str(self._next_comment_no)
+            self._next_comment_no += 1
+            post["comments"].append({
+                "comment_no": comment_no,
+                "parent_no": parent_no or "",
+                "level": 2 if parent_no else 1,
+                "author": author,
+                "nick": nick,
+                "text": text,
+                "is_owner": author == blog_id,
+            })
+            return comment_no
+
+    def comment_threads(self, post: dict) -> List[List[dict]]:
+        """[부모 댓글, 답글...] 묶음 목록 (등록 순)"""
+        threads = []
+        by_no = {}
+        for c in post["comments"]:
+            if c["level"] == 1:
+                thread = [c]
+                threads.append(thread)
+                by_no[c["comment_no"]] = thread
+        for c in post["comments"]:
+            if c["level"] == 2 and c["parent_no"] in by_no:
+                by_no[c["parent_no"]].append(c)
+        return threads
+
+    # ── 샘플 데이터 ──
+
+    @classmethod
+    def sample(cls, my_id: str = "mockuser", posts: int = 12, comments_per_post: int = 8,
+               buddies: int = 45, sympathy_accounts: int = 60, seed: int = 0,
+               **kwargs) -> "MockNaverState":
+        """결정적인(seed 고정) 샘플 데이터. 날짜는 오늘 기준으로 만든다."""
+        rng = random.Random(seed)
+        state = cls(my_id=my_id, **kwargs)
+        today = date.today()
+
+        def sentence(n: int) -> str:
+            return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+        state.add_blog(my_id, nick=f"{my_id}의 블로그")
+        for i in range(posts):
+            log_no = state.add_post(
+                my_id, f"{sentence(3)} #{i + 1}",
+                [sentence(rng.randint(8, 30)) for _ in range(rng.randint(3, 12))],
+                today - timedelta(days=i // 2), images=rng.randint(0, 6),
+            )
+            for j in range(comments_per_post):
+                visitor = f"visitor{rng.randint(1, 200):03d}"
+                comment_no = state.add_comment(
+                    my_id, log_no, visitor, f"방문자{visitor[-3:]}", rng.choice(_COMMENT_TEXTS)
+                )
+                # 일부 댓글에는 이미 블로그 주인이 답글을 달아둔 상태
+                if j % 3 == 0:
+                    state.add_comment(my_id, log_no, my_id, f"{my_id}의 블로그",
+                                      "감사해요 😊", parent_no=comment_no)
+
+        group = []
+        for i in range(buddies):
+            buddy_id = f"buddy{i + 1:03d}"
+            state.add_blog(buddy_id, nick=f"이웃{i + 1}")
+            state.add_post(
+                buddy_id, sentence(4),
+                [sentence(rng.randint(10, 40)) for _ in range(rng.randint(2, 15))],
+                today - timedelta(days=i + 1), images=rng.randint(0, 8),
+            )
+            state.add_post(
+                buddy_id, sentence(4),
+                [sentence(rng.randint(10, 40)) for _ in range(rng.randint(2, 15))],
+                today - timedelta(days=i // 3), images=rng.randint(0, 8),
+            )
+            group.append({
+                "blog_id": buddy_id,
+                "nick": f"이웃{i + 1}",
+                "update_date": today - timedelta(days=i // 3),
+                "added_date": today - timedelta(days=30 + (i * 7) % 90),
+            })
+        state.buddy_groups["이웃1"] = group
+        state.buddy_groups["이웃2"] = []
+
+        my_posts = state.blogs[my_id]["posts"]
+        if my_posts:
+            accounts = []
+            for i in range(sympathy_accounts):
+                user_id = f"fan{i + 1:03d}"
+                accounts.append({
+                    "user_id": user_id,
+                    "nick": f"공감러{i + 1}",
+                    "can_add": i % 4 != 3,
+                })
+            state.sympathy[(my_id, my_posts[0]["log_no"])] = accounts
+
+        return state
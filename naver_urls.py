@@ -0,0 +1,27 @@
+from typing import Optional
+
+
+class NaverUrls:
+    """네이버 호스트별 기본 URL
+
+    base_url을 주면 모든 호스트를 {base_url}/{호스트명} 아래로 돌린다.
+    (예: http://127.0.0.1:8765/blog.naver.com/PostList.naver) 로컬 mock 서버로
+    전체 흐름을 돌릴 때 사용한다.
+    """
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.home = self._root("www.naver.com")
+        self.nid = self._root("nid.naver.com")
+        self.blog = self._root("blog.naver.com")
+        self.admin_blog = self._root("admin.blog.naver.com")
+        self.rss = self._root("rss.blog.naver.com")
+        self.apis = self._root("apis.naver.com")
+
+    def _root(self, host: str) -> str:
+        if self.base_url:
+            return f"{self.base_url}/{host}"
+        return f"https://{host}"
+
+
+DEFAULT_URLS = NaverUrls()
@@ -1,14 +1,30 @@
 from base_bot import NaverBaseBot
 from utils import HumanDelay, random_sleep, maybe_idle
-import asyncio
 import re
 from typing import Callable, List
 
 
+# 이웃추가 버튼마다 [user_id, 표시 이름, 버튼 순번]을 한 번에 뽑는다
+_EXTRACT_ACCOUNTS_JS = """
+() => Array.from(document.querySelectorAll('a.btn_buddy._addBuddyPop')).map((btn, index) => {
+    const m = (btn.className || '').match(/_param\\(([^)]+)\\)/);
+    const li = btn.closest('li');
+    if (!m || !li) return null;
+    const nameEl = li.querySelector('.nick a, .author, [class*="name"]');
+    const name = nameEl ? (nameEl.innerText || '').trim() : '';
+    return {user_id: m[1], name: name || m[1], index};
+}).filter(Boolean)
+"""
+
+
 class NeighborRequestBot(NaverBaseBot):
-    def __init__(self, log_callback: Callable[[str], None] = print):
-        super().__init__(log_callback)
+    def __init__(self, log_callback: Callable[[str], None] = print, **kwargs):
+        super().__init__(log_callback, **kwargs)
         self.sympathy_url = None
+        # 공감 목록에서 '더보기'를 누른 횟수 (목록을 다시 열면 0)
+        self.page_depth = 0
+        # user_id -> 이웃추가 버튼 순번 (_get_available_accounts에서 갱신)
+        self._button_index = {}
 
     def _parse_blog_url(self, blog_url: str) -> tuple:
         patterns = [
@@ -77,12 +93,13 @@ class NeighborRequestBot(NaverBaseBot):
             self.log(f"URL 파싱 실패: {blog_url}")
             return False
 
-        self.sympathy_url = f"https://blog.naver.com/SympathyHistoryList.naver?blogId={blog_id}&logNo={log_no}&categoryId=3"
+        self.sympathy_url = f"{self.urls.blog}/SympathyHistoryList.naver?blogId={blog_id}&logNo={log_no}&categoryId=3"
         self.log(f"공감 목록 페이지 접속: {self.sympathy_url}")
 
         await self.page.goto(self.sympathy_url)
         await HumanDelay.page_load()
         await random_sleep(3.0, 6.0)
+        self.page_depth = 0
         return True
 
     async def _load_next_page(self) -> bool:
@@ -95,6 +112,7 @@ class NeighborRequestBot(NaverBaseBot):
         await next_btn.evaluate('el => el.click()')
         await HumanDelay.page_load()
         await random_sleep(1.5, 3.0)
+        self.page_depth += 1
         return True
 
     async def _restore_page_depth(self, depth: int) -> int:
@@ -107,36 +125,15 @@ class NeighborRequestBot(NaverBaseBot):
         return restored
 
     async def _get_available_accounts(self) -> List[dict]:
-        accounts = []
-
-        add_buddy_btns = await self.page.query_selector_all('a.btn_buddy._addBuddyPop')
-
-        for btn in add_buddy_btns:
-            try:
-                cls = await btn.get_attribute('class') or ''
-                param_match = re.search(r'_param\(([^)]+)\)', cls)
-                if not param_match:
-                    continue
-
-                user_id = param_match.group(1)
-
-                parent_li = await btn.evaluate_handle('el => el.closest("li")')
-                name_el = await parent_li.as_element().query_selector('.nick a, .author, [class*="name"]')
-
-                display_name = user_id
-                if name_el:
-                    display_name = await name_el.inner_text()
-                    display_name = display_name.strip() or user_id
-
-                accounts.append({
-                    'user_id': user_id,
-                    'name': display_name,
-                })
-
-            except Exception as e:
-                continue
+        """공감 목록의 이웃추가 가능 계정을 evaluate 한 번으로 수집한다."""
+        try:
+            rows = await self.page.evaluate(_EXTRACT_ACCOUNTS_JS)
+        except Exception as e:
+            self.log(f"계정 목록 추출 실패: {str(e)[:50]}")
+            return []
 
-        return accounts
+        self._button_index = {row['user_id']: row['index'] for row in rows}
+        return [{'user_id': row['user_id'], 'name': row['name']} for row in rows]
 
     async def _find_button_for_user(self, user_id: str):
         selector = f'a.btn_buddy._addBuddyPop._param\\({user_id}\\)'
@@ -144,11 +141,13 @@ class NeighborRequestBot(NaverBaseBot):
         if btn:
             return btn
 
-        add_buddy_btns = await self.page.query_selector_all('a.btn_buddy._addBuddyPop')
-        for btn in add_buddy_btns:
-            cls = await btn.get_attribute('class') or ''
-            if f'_param({user_id})' in cls:
-                return btn
+        # CSS 이스케이프가 안 맞는 아이디: 수집 당시 위치로 바로 찾고 클래스만 확인
+        index = self._button_index.get(user_id)
+        if index is None:
+            return None
+        btn = await self.page.query_selector(f'a.btn_buddy._addBuddyPop >> nth={index}')
+        if btn and f'_param({user_id})' in (await btn.get_attribute('class') or ''):
+            return btn
         return None
 
     async def request_neighbor(self, account: dict, neighbor_message: str = "블로그 글 잘 봤습니다. 서로이웃 신청드려요!") -> bool:
@@ -160,6 +159,8 @@ class NeighborRequestBot(NaverBaseBot):
             self.log(f"[{name}] 이웃추가 클릭...")
 
             btn = await self._find_button_for_user(user_id)
+            if not btn and await self._recover_sympathy_page():
+                btn = await self._find_button_for_user(user_id)
             if not btn:
                 self.log(f"[{name}] 버튼 없음 - 스킵")
                 return False
@@ -195,7 +196,7 @@ class NeighborRequestBot(NaverBaseBot):
                     self.log(f"[{name}] 서로이웃 클릭 실패 - 스킵")
                     await self._handle_popup_close(popup)
                     return False
-                await asyncio.sleep(0.5)
+                await random_sleep(0.5, 0.5)
             else:
                 self.log(f"[{name}] 서로이웃 옵션 없음 - 스킵")
                 await self._handle_popup_close(popup)
@@ -220,7 +221,7 @@ class NeighborRequestBot(NaverBaseBot):
             if message_input:
                 await message_input.fill(neighbor_message)
                 self.log(f"[{name}] 메시지 입력 완료")
-                await asyncio.sleep(0.5)
+                await random_sleep(0.5, 0.5)
 
             submit_btn = await popup.query_selector(
                 'a.button_next, a.button_ok, a:has-text("확인"), a:has-text("신청"), button:has-text("확인")'
@@ -260,6 +261,25 @@ class NeighborRequestBot(NaverBaseBot):
             await self.page.goto(self.sympathy_url)
             await HumanDelay.page_load()
             await random_sleep(3.0, 6.0)
+            self.page_depth = 0
+
+    async def _recover_sympathy_page(self) -> bool:
+        """공감 목록이 사라졌을 때만 다시 열고 이전 depth까지 '더보기'를 재생한다.
+
+        신청은 팝업에서 진행되므로 보통은 목록 페이지가 그대로 남아 있다.
+        목록이 이미 열려 있으면 아무것도 하지 않고 False를 반환한다.
+        """
+        if not self.sympathy_url:
+            return False
+        if 'SympathyHistoryList' in self.page.url:
+            return False
+        depth = self.page_depth
+        self.log(f"공감 목록 페이지가 닫혀 다시 엽니다 (depth {depth} 복원)")
+        await self._reload_sympathy_page()
+        restored = await self._restore_page_depth(depth)
+        if restored < depth:
+            self.log(f"페이지 depth 복원 불완전 ({restored}/{depth}), 현재 depth로 조정")
+        return True
 
     async def run(self, blog_url: str, user_id: str,
                   progress_callback: Callable[[int, int], None] = None,
@@ -267,6 +287,7 @@ class NeighborRequestBot(NaverBaseBot):
                   max_success: int = 100):
         self.is_running = True
 
+        self.begin_run(flow="neighbor_request", user_id=user_id, blog_url=blog_url, max_success=max_success)
         try:
             await self.start_browser(user_id)
             await self.ensure_login(user_id)
@@ -277,9 +298,11 @@ class NeighborRequestBot(NaverBaseBot):
                 self.log("공감 목록 페이지 접속 실패")
                 return
 
+            ledger = self.open_ledger(user_id)
             success_count = 0
-            attempted_ids: set = set()
-            page_depth = 0
+            attempted_ids: set = ledger.attempted_neighbors(user_id)
+            if attempted_ids:
+                self.log(f"이전 실행 기록: {len(attempted_ids)}명 신청 완료(또는 재시도 한도 초과) - 해당 계정은 건너뜀")
             total_attempted = 0
 
             self.log(f"서로이웃 신청 시작 (최대 {max_success}명)")
@@ -289,14 +312,15 @@ class NeighborRequestBot(NaverBaseBot):
                 new_accounts = [a for a in accounts if a['user_id'] not in attempted_ids]
 
                 if not new_accounts:
-                    self.log(f"현재 페이지(depth={page_depth})에 새 계정 없음, 다음 페이지 시도...")
-                    if not await self._load_next_page():
+                    self.log(f"현재 페이지(depth={self.page_depth})에 새 계정 없음, 다음 페이지 시도...")
+                    async with self.timed("load_next_page", depth=self.page_depth):
+                        loaded = await self._load_next_page()
+                    if not loaded:
                         self.log("더 이상 페이지가 없습니다.")
                         break
-                    page_depth += 1
                     continue
 
-                self.log(f"페이지(depth={page_depth}): 신규 계정 {len(new_accounts)}개 발견")
+                self.log(f"페이지(depth={self.page_depth}): 신규 계정 {len(new_accounts)}개 발견")
 
                 for account in new_accounts:
                     if success_count >= max_success:
@@ -311,8 +335,15 @@ class NeighborRequestBot(NaverBaseBot):
 
                     self.log(f"  [{success_count+1}/{max_success}] {account['name']} ({account['user_id']})")
 
-                    if await self.request_neighbor(account, neighbor_message):
+                    async with self.timed("request_neighbor", target=account['user_id']):
+                        requested = await self.request_neighbor(account, neighbor_message)
+                    if requested:
                         success_count += 1
+                        ledger.mark_neighbor_attempted(user_id, account['user_id'], "success")
+                        self.event("neighbor", target=account['user_id'], outcome="success")
+                    else:
+                        ledger.mark_neighbor_attempted(user_id, account['user_id'], "failed")
+                        self.event("neighbor", target=account['user_id'], outcome="failed")
 
                     if progress_callback:
                         progress_callback(success_count, max_success)
@@ -320,24 +351,21 @@ class NeighborRequestBot(NaverBaseBot):
                     await HumanDelay.between_requests()
                     await maybe_idle(self.log)
 
-                    await self._reload_sympathy_page()
-                    restored = await self._restore_page_depth(page_depth)
-                    if restored < page_depth:
-                        self.log(f"페이지 depth 복원 불완전 ({restored}/{page_depth}), 현재 depth로 조정")
-                        page_depth = restored
-
                 if not self.is_running or success_count >= max_success:
                     break
 
-                if not await self._load_next_page():
+                async with self.timed("load_next_page", depth=self.page_depth):
+                    loaded = await self._load_next_page()
+                if not loaded:
                     self.log("더 이상 페이지가 없습니다.")
                     break
-                page_depth += 1
 
             self.log(f"서로이웃 신청 완료! 시도 {total_attempted}명, 성공 {success_count}명")
 
         except Exception as e:
-            self.log(f"실행 오류: {str(e)}")
+            self.event("error", f"실행 오류: {str(e)}", reason=type(e).__name__)
         finally:
             await self.close_browser()
+            self.close_ledger()
+            self.finish_run()
             self.is_running = False
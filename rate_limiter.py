@@ -0,0 +1,123 @@
+import asyncio
+import re
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenBucketLimiter:
+    """분당 요청 수(RPM)와 분당 토큰 수(TPM) 두 버킷으로 호출 속도를 제한한다.
+
+    상태는 threading.Lock으로 보호하고 대기는 asyncio.sleep으로 하므로, 서로 다른
+    스레드/이벤트 루프에서 실행 중인 봇끼리도 같은 인스턴스를 공유할 수 있다.
+    429(RESOURCE_EXHAUSTED) 등을 받으면 backoff()로 전체 호출을 잠시 막고,
+    연속 실패할수록 대기 시간을 두 배씩 늘린다 (서버가 준 retry 힌트가 있으면 우선).
+    """
+
+    def __init__(self, rpm: float, tpm: float,
+                 base_backoff: float = 5.0, max_backoff: float = 120.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0)
+        self._updated = now
+
+    def _reserve(self, tokens: int) -> float:
+        """여유가 있으면 차감하고 0을, 없으면 기다려야 할 시간(초)을 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            tokens = min(tokens, self.tpm)
+            wait = max(
+                (1 - self._requests) * 60.0 / self.rpm,
+                (tokens - self._tokens) * 60.0 / self.tpm,
+            )
+            if wait > 0:
+                return wait
+            self._requests -= 1
+            self._tokens -= tokens
+            return 0.0
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """호출 가능할 때까지 대기. 실제로 기다린 시간(초)을 반환"""
+        waited = 0.0
+        while True:
+            wait = self._reserve(tokens)
+            if wait <= 0:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def set_rates(self, rpm: float, tpm: float):
+        """한도 변경. 지금까지 채워진 양은 이전 한도로 계산하고 새 한도를 넘지 않게 자른다"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rpm = rpm
+            self.tpm = tpm
+            self._requests = min(self._requests, float(rpm))
+            self._tokens = min(self._tokens, float(tpm))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def backoff(self, retry_after: Optional[float] = None) -> float:
+        """할당량 초과/일시 오류 발생 시 호출. 모든 호출을 막을 시간(초)을 반환"""
+        with self._lock:
+            self._failures += 1
+            if retry_after is None:
+                retry_after = min(self.base_backoff * (2 ** (self._failures - 1)), self.max_backoff)
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._requests = 0.0
+            return retry_after
+
+
+_RETRY_HINT_PATTERNS = [
+    re.compile(r"retryDelay['\"]?\s*:\s*['\"]?(\d+(?:\.\d+)?)s"),
+    re.compile(r"retry in (\d+(?:\.\d+)?)\s*s", re.IGNORECASE),
+    re.compile(r"Retry-After['\"]?\s*:\s*['\"]?(\d+(?:\.\d+)?)", re.IGNORECASE),
+]
+
+
+def parse_retry_after(error_msg: str) -> Optional[float]:
+    """Gemini 오류 메시지에서 재시도 대기 힌트(초)를 찾는다"""
+    for pattern in _RETRY_HINT_PATTERNS:
+        m = pattern.search(error_msg)
+        if m:
+            return float(m.group(1))
+    return None
+
+
+_shared: Dict[str, TokenBucketLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_limiter(key: str, rpm: float, tpm: float) -> TokenBucketLimiter:
+    """같은 key(모델 이름 등)를 쓰는 모든 생성기가 공유하는 limiter
+
+    할당량은 모델(API 키) 단위라 한 버킷을 계속 공유하고, 다른 rpm/tpm으로 부르면
+    공유 중인 limiter의 한도를 새 값으로 바꾼다 (마지막으로 만든 생성기의 설정이 적용됨).
+    """
+    with _shared_lock:
+        limiter = _shared.get(key)
+        if limiter is None:
+            limiter = TokenBucketLimiter(rpm, tpm)
+            _shared[key] = limiter
+        elif (limiter.rpm, limiter.tpm) != (rpm, tpm):
+            print(f"Rate limit 변경 ({key}): {limiter.rpm:.0f} RPM/{limiter.tpm:.0f} TPM → {rpm:.0f} RPM/{tpm:.0f} TPM")
+            limiter.set_rates(rpm, tpm)
+        return limiter
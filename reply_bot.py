@@ -1,7 +1,12 @@
+from ai_retry import AIRetryQueue
 from base_bot import NaverBaseBot
-from blog_actions import get_post_content, load_comments, write_reply
+from blog_actions import extract_comments, get_post_content, load_comments, write_reply
 from comment_ai import CommentGenerator
+from comment_api import fetch_comments
+from response_cache import ResponseCache
 from utils import HumanDelay, random_sleep, maybe_idle, DAILY_ACTION_LIMIT
+import functools
+import os
 import re
 from datetime import date, timedelta
 from typing import Callable, List, Optional
@@ -35,7 +40,7 @@ class ReplyBot(NaverBaseBot):
         page_num = 1
 
         url = (
-            f"https://blog.naver.com/PostList.naver?"
+            f"{self.urls.blog}/PostList.naver?"
             f"blogId={blog_id}&categoryNo=0&from=postList&currentPage=1"
         )
         self.log(f"PostList 페이지 {page_num} 접속...")
@@ -129,129 +134,210 @@ class ReplyBot(NaverBaseBot):
 
         return posts
 
-    async def _parse_data_info(self, comment_el) -> dict:
-        data_info = await comment_el.get_attribute("data-info") or ""
-        info = {}
-        for kv in data_info.split(","):
-            kv = kv.strip()
-            if ":" in kv:
-                key, val = kv.split(":", 1)
-                info[key.strip()] = val.strip().strip("'")
-        return info
-
-    async def _check_already_replied(self, main_frame, comment_no: str, my_blog_id: str) -> bool:
-        comments = await main_frame.query_selector_all("li.u_cbox_comment")
+    def _build_reply_index(self, comments: list) -> dict:
+        """댓글 목록(로드된 페이지 또는 댓글 API 전체) 기준 parentCommentNo → 대댓글 작성자 정보 인덱스.
+        {"editor": 블로그주인 배지 여부, "authors": 작성자 href(소문자) set}"""
+        index = {}
         for c in comments:
-            info = await self._parse_data_info(c)
-            if info.get("replyLevel") != "2":
+            if c["reply_level"] != "2":
                 continue
-            if info.get("parentCommentNo") != comment_no:
+            entry = index.setdefault(c["parent_comment_no"], {"editor": False, "authors": set()})
+            if c["is_editor"]:
+                entry["editor"] = True
+            if c["author_href"]:
+                entry["authors"].add(c["author_href"].lower())
+        return index
+
+    def _check_already_replied(self, reply_index: dict, comment_no: str, my_blog_id: str) -> bool:
+        entry = reply_index.get(comment_no)
+        if not entry:
+            return False
+
+        # 블로그주인 배지 확인
+        if entry["editor"]:
+            return True
+
+        # blog_id 링크 확인
+        my_id = my_blog_id.lower()
+        return any(my_id in href for href in entry["authors"])
+
+    def _record_reply(self, log_no: str, comment_no: str, outcome: str, dry_run: bool):
+        """실행 기록에 처리한 댓글 저장 (DRY-RUN은 실제 등록이 아니므로 기록하지 않음)"""
+        if self.ledger and not dry_run:
+            self.ledger.mark_comment_replied(self.ledger_owner, log_no, comment_no, outcome)
+
+    def _pending_comments(self, comments: list, my_blog_id: str, log_no: str,
+                          replied_set: set, dry_run: bool = False) -> tuple:
+        """댓글 API 결과에서 답글을 달아야 할 댓글 번호 set과 스킵 수를 반환.
+        이미 답글이 있는 댓글은 여기서 실행 기록에 남기므로 글을 열 필요가 없다."""
+        reply_index = self._build_reply_index(comments)
+        pending = set()
+        skip_count = 0
+        for c in comments:
+            comment_no = c["comment_no"]
+            if c["reply_level"] != "1" or not comment_no:
                 continue
-
-            # 블로그주인 배지 확인
-            editor_badge = await c.query_selector(".u_cbox_ico_editor")
-            if editor_badge:
-                return True
-
-            # blog_id 링크 확인
-            author_link = await c.query_selector(".u_cbox_name")
-            if author_link:
-                href = await author_link.get_attribute("href") or ""
-                if my_blog_id.lower() in href.lower():
-                    return True
-
-        return False
+            if comment_no in replied_set:
+                self.event("comment", target=comment_no, outcome="skipped", reason="ledger")
+                skip_count += 1
+            elif self._check_already_replied(reply_index, comment_no, my_blog_id):
+                self.event("comment", target=comment_no, outcome="skipped", reason="already_replied")
+                replied_set.add(comment_no)
+                self._record_reply(log_no, comment_no, "already", dry_run)
+                skip_count += 1
+            elif not c["text"]:
+                self.event("comment", target=comment_no, outcome="skipped", reason="no_text")
+                skip_count += 1
+            else:
+                pending.add(comment_no)
+        return pending, skip_count
 
     async def _process_comments_on_page(self, main_frame, my_blog_id: str,
                                          post_content: dict, log_no: str,
                                          ai_generator: CommentGenerator,
-                                         deferred: list,
+                                         retry_queue: AIRetryQueue,
                                          replied_set: set,
                                          current_total: int = 0,
-                                         dry_run: bool = False) -> tuple:
+                                         dry_run: bool = False,
+                                         only: Optional[set] = None) -> tuple:
+        """only를 주면(댓글 API로 미리 고른 댓글 번호) 그 댓글만 처리하고, 처리한 번호는 only에서 뺀다"""
         reply_count = 0
         skip_count = 0
 
-        # Phase A: comment_no + nick 목록만 먼저 수집 (stale handle 방지)
+        # Phase A: 댓글 목록을 한 번에 추출 (stale handle 방지)
+        comments = await extract_comments(main_frame)
         comment_entries = []
-        comments = await main_frame.query_selector_all("li.u_cbox_comment")
         for c in comments:
-            info = await self._parse_data_info(c)
-            if info.get("replyLevel") != "1":
+            if c["reply_level"] != "1":
                 continue
-            comment_no = info.get("commentNo", "")
+            comment_no = c["comment_no"]
             if not comment_no:
                 continue
-            nick_el = await c.query_selector(".u_cbox_nick")
-            nick = comment_no
-            if nick_el:
-                nick = (await nick_el.inner_text()).strip()
-            content_el = await c.query_selector(".u_cbox_contents")
-            comment_text = ""
-            if content_el:
-                comment_text = (await content_el.inner_text()).strip()
             comment_entries.append({
                 "comment_no": comment_no,
-                "nick": nick,
-                "comment_text": comment_text,
+                "nick": c["nick"] or comment_no,
+                "comment_text": c["text"],
             })
+        reply_index = self._build_reply_index(comments)
+
+        # 답글 대상 댓글의 대댓글을 한 번의 배치 요청으로 미리 생성 (같은 글 맥락 공유)
+        prepared = {}
+        if not dry_run:
+            remaining = max(DAILY_ACTION_LIMIT - current_total, 0)
+            targets = [
+                e for e in comment_entries
+                if (only is None or e["comment_no"] in only)
+                and e["comment_no"] not in replied_set and e["comment_text"]
+                and not self._check_already_replied(reply_index, e["comment_no"], my_blog_id)
+            ][:remaining]
+            if targets:
+                self.log(f"    AI 대댓글 {len(targets)}건 일괄 생성 중...")
+                async with self.timed("ai_batch", target=log_no, count=len(targets)) as result:
+                    replies = await ai_generator.generate_replies_batch(
+                        post_content["title"], post_content["body"],
+                        [e["comment_text"] for e in targets],
+                        [e["comment_no"] for e in targets],
+                    )
+                    result["generated"] = sum(1 for r in replies if r)
+                # 배치에 넣은 댓글 번호 전부 (생성 실패한 댓글은 None)
+                prepared = {e["comment_no"]: r for e, r in zip(targets, replies)}
 
-        # Phase B: 수집된 목록 순회하며 개별 처리 (매번 fresh DOM query)
+        # Phase B: 수집된 목록 순회하며 개별 처리 (답글 여부는 페이지 단위 인덱스로 조회)
         for entry in comment_entries:
             if not self.is_running:
                 break
 
             if (current_total + reply_count) >= DAILY_ACTION_LIMIT:
-                self.log(f"    일일 액션 제한({DAILY_ACTION_LIMIT}건) 도달 → 중단")
+                self.event("limit", f"    일일 액션 제한({DAILY_ACTION_LIMIT}건) 도달 → 중단",
+                           reason="daily_limit")
                 break
 
             comment_no = entry["comment_no"]
             nick = entry["nick"]
             comment_text = entry["comment_text"]
 
-            # in-memory set으로 중복 방지
+            if only is not None:
+                if comment_no not in only:
+                    continue
+                only.discard(comment_no)
+
+            # 이번 실행 + 실행 기록(ledger) 기준 중복 방지
             if comment_no in replied_set:
-                self.log(f"    [{nick}] 이번 실행에서 이미 처리됨 - skip")
+                self.event("comment", f"    [{nick}] 이미 처리된 댓글 - skip",
+                           target=comment_no, outcome="skipped", reason="ledger")
                 skip_count += 1
                 continue
 
-            already = await self._check_already_replied(main_frame, comment_no, my_blog_id)
+            # 답글 등록 후에는 DOM이 바뀌었으므로 인덱스 재구성
+            if reply_index is None:
+                reply_index = self._build_reply_index(await extract_comments(main_frame))
+
+            already = self._check_already_replied(reply_index, comment_no, my_blog_id)
             if already:
-                self.log(f"    [{nick}] 이미 답글 있음 - skip")
+                self.event("comment", f"    [{nick}] 이미 답글 있음 - skip",
+                           target=comment_no, outcome="skipped", reason="already_replied")
                 replied_set.add(comment_no)
+                self._record_reply(log_no, comment_no, "already", dry_run)
                 skip_count += 1
                 continue
 
             if not comment_text:
+                self.event("comment", target=comment_no, outcome="skipped", reason="no_text")
                 skip_count += 1
                 continue
 
             if dry_run:
                 generated = f"[DRY-RUN] {comment_text[:20]}"
             else:
-                generated = await ai_generator.generate_reply(
-                    post_content["title"], post_content["body"], comment_text
-                )
+                if comment_no in prepared:
+                    generated = prepared[comment_no]
+                else:
+                    # 배치 대상(한도 안의 앞쪽 댓글)이 아니었던 댓글: 앞선 등록 실패로 한도에 자리가 남은 경우
+                    async with self.timed("ai_reply", target=comment_no):
+                        generated = await ai_generator.generate_reply(
+                            post_content["title"], post_content["body"], comment_text, comment_no
+                        )
 
                 if not generated:
-                    self.log(f"    [{nick}] AI 대댓글 생성 실패 - 보류")
-                    deferred.append({
+                    self.event("comment", f"    [{nick}] AI 대댓글 생성 실패 - 보류",
+                               target=comment_no, outcome="deferred", reason="ai_failed")
+                    item = {
                         "comment_no": comment_no,
                         "nick": nick,
                         "comment_text": comment_text,
                         "post_content": post_content,
                         "log_no": log_no,
                         "blog_id": my_blog_id,
-                    })
+                    }
+                    retry_queue.add(item, functools.partial(
+                        ai_generator.generate_reply,
+                        post_content["title"], post_content["body"], comment_text, comment_no,
+                    ))
                     continue
 
+            # 등록 직전에 현재 DOM으로 다시 확인: 댓글 API 응답에 답글(replyLevel 2)이 빠져 있어도
+            # 이미 답글을 단 댓글에 또 달지 않는다
+            reply_index = self._build_reply_index(await extract_comments(main_frame))
+            if self._check_already_replied(reply_index, comment_no, my_blog_id):
+                self.event("comment", f"    [{nick}] 이미 답글 있음 - skip",
+                           target=comment_no, outcome="skipped", reason="already_replied")
+                replied_set.add(comment_no)
+                self._record_reply(log_no, comment_no, "already", dry_run)
+                skip_count += 1
+                continue
+
             self.log(f"    [{nick}] AI 대댓글: '{generated}'")
 
-            result = await write_reply(main_frame, comment_no, generated, self.log, dry_run=dry_run)
+            async with self.timed("write_reply", target=comment_no):
+                result = await write_reply(main_frame, comment_no, generated, self.log, dry_run=dry_run)
             if result:
+                self.event("comment", target=comment_no, outcome="replied")
                 reply_count += 1
                 replied_set.add(comment_no)
+                self._record_reply(log_no, comment_no, "replied", dry_run)
+                reply_index = None
             else:
+                self.event("comment", target=comment_no, outcome="failed", reason="write_failed")
                 skip_count += 1
 
             await HumanDelay.between_requests()
@@ -262,9 +348,16 @@ class ReplyBot(NaverBaseBot):
                         gemini_api_key: str, blog_id: str = "",
                         cutoff_date: str = "",
                         dry_run: bool = False,
-                        progress_callback: Callable[[int, int], None] = None):
+                        progress_callback: Callable[[int, int], None] = None,
+                        ai_generator: Optional[CommentGenerator] = None):
+        """ai_generator를 넘기면 그 생성기를 쓰고 닫지 않는다 (호출한 쪽 소유).
+        dry_run이면 Gemini를 부르지 않으므로 gemini_api_key 없이도 실행된다."""
         self.is_running = True
-        ai_generator = CommentGenerator(gemini_api_key)
+        owns_generator = ai_generator is None and not dry_run
+        if owns_generator:
+            ai_generator = CommentGenerator(
+                gemini_api_key, cache=ResponseCache(os.path.join(self.data_dir, "ai_cache.db"))
+            )
         if dry_run:
             self.log("AI 대댓글 DRY-RUN 모드 (실제 등록 없이 검증만)")
         else:
@@ -276,16 +369,23 @@ class ReplyBot(NaverBaseBot):
         if not cutoff_date:
             cutoff_date = date.today().strftime("%Y-%m-%d")
 
+        self.begin_run(flow="reply", user_id=user_id, blog_id=blog_id,
+                       cutoff_date=cutoff_date, dry_run=dry_run)
+        # AI 생성 실패 항목은 글 순회와 동시에 백그라운드에서 다시 생성한다
+        retry_queue = AIRetryQueue(self.log)
         try:
             await self.start_browser(user_id)
             await self.ensure_login(user_id)
+            self.open_ledger(user_id)
 
             self.log("=" * 50)
             self.log("Phase 1: 내 블로그 글 수집")
             self.log(f"블로그: {blog_id} | 기준일: {cutoff_date}")
             self.log("=" * 50)
 
-            posts = await self._collect_posts_from_postlist(blog_id, cutoff_date)
+            async with self.scrape_only(), self.timed("collect_posts", target=blog_id) as result:
+                posts = await self._collect_posts_from_postlist(blog_id, cutoff_date)
+                result["count"] = len(posts)
             self.log(f"\nPhase 1 완료: {len(posts)}개 글 수집됨")
 
             if not posts:
@@ -299,8 +399,12 @@ class ReplyBot(NaverBaseBot):
             total_posts = len(posts)
             total_replies = 0
             total_skips = 0
-            all_deferred = []
-            replied_set = set()
+            replied_set = self.ledger.replied_comment_nos(user_id)
+            if blog_id != user_id:
+                # 이전 버전은 대상 블로그 ID로 기록했다
+                replied_set |= self.ledger.replied_comment_nos(blog_id)
+            if replied_set:
+                self.log(f"실행 기록: 이전에 처리한 댓글 {len(replied_set)}개는 건너뜀")
 
             for i, post in enumerate(posts):
                 if not self.is_running:
@@ -308,7 +412,7 @@ class ReplyBot(NaverBaseBot):
                     break
 
                 if total_replies >= DAILY_ACTION_LIMIT:
-                    self.log(f"\n일일 액션 제한({DAILY_ACTION_LIMIT}건) 도달 → 중단")
+                    self.event("limit", f"\n일일 액션 제한({DAILY_ACTION_LIMIT}건) 도달 → 중단", reason="daily_limit")
                     break
 
                 log_no = post["log_no"]
@@ -317,12 +421,28 @@ class ReplyBot(NaverBaseBot):
                 if progress_callback:
                     progress_callback(i + 1, total_posts)
 
-                content, main_frame = await get_post_content(
-                    self.page, blog_id, log_no, self.log, self._get_main_frame
-                )
+                # 댓글 API로 답글 달 댓글을 먼저 고른다. 없으면 글을 열지 않는다 (API 실패 시 DOM 순회)
+                async with self.timed("comment_api", target=log_no) as fetched:
+                    api_comments = await fetch_comments(self.context, blog_id, log_no, self.log, urls=self.urls)
+                    fetched["outcome"] = "ok" if api_comments is not None else "failed"
+                pending = None
+                if api_comments is not None:
+                    pending, skips = self._pending_comments(api_comments, blog_id, log_no, replied_set, dry_run)
+                    total_skips += skips
+                    if not pending:
+                        self.event("post", f"  새로 답글 달 댓글 없음 - 글 방문 생략",
+                                   target=log_no, outcome="skipped", reason="no_pending_comments")
+                        continue
+                    self.log(f"  답글 대상 댓글 {len(pending)}개")
+
+                async with self.timed("post_open", target=log_no):
+                    content, main_frame = await get_post_content(
+                        self.page, blog_id, log_no, self.log, self._get_main_frame, urls=self.urls
+                    )
 
                 if not main_frame:
-                    self.log(f"  mainFrame 못 찾음 - skip")
+                    self.event("post", f"  mainFrame 못 찾음 - skip",
+                               target=log_no, outcome="skipped", reason="no_main_frame")
                     total_skips += 1
                     continue
 
@@ -331,8 +451,10 @@ class ReplyBot(NaverBaseBot):
                 await main_frame.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                 await random_sleep(1.5, 3.0)
 
-                loaded = await load_comments(main_frame, self.log)
+                async with self.timed("load_comments", target=log_no):
+                    loaded = await load_comments(main_frame, self.log)
                 if not loaded:
+                    self.event("post", target=log_no, outcome="skipped", reason="comments_not_loaded")
                     total_skips += 1
                     continue
 
@@ -349,13 +471,17 @@ class ReplyBot(NaverBaseBot):
                     self.log(f"  댓글 페이지 {comment_page}")
 
                     replies, skips = await self._process_comments_on_page(
-                        main_frame, blog_id, content, log_no, ai_generator, all_deferred,
+                        main_frame, blog_id, content, log_no, ai_generator, retry_queue,
                         replied_set=replied_set, current_total=total_replies,
-                        dry_run=dry_run
+                        dry_run=dry_run, only=pending
                     )
                     total_replies += replies
                     total_skips += skips
 
+                    # 미리 고른 댓글을 모두 처리했으면 나머지 페이지는 넘기지 않는다
+                    if pending is not None and not pending:
+                        break
+
                     next_page_btn = await main_frame.query_selector(
                         f".u_cbox_paginate a.u_cbox_page[data-param='{comment_page + 1}']"
                     )
@@ -366,37 +492,54 @@ class ReplyBot(NaverBaseBot):
                     await random_sleep(1.5, 3.0)
                     comment_page += 1
 
+                if pending and self.is_running and total_replies < DAILY_ACTION_LIMIT:
+                    for comment_no in pending:
+                        self.event("comment", target=comment_no, outcome="skipped", reason="not_in_page")
+                    self.log(f"  댓글 API에 있던 {len(pending)}개를 페이지에서 찾지 못함 - skip")
+                    total_skips += len(pending)
+
                 await HumanDelay.between_requests()
                 await maybe_idle(self.log)
 
-            # 보류 목록 재시도
-            if all_deferred and self.is_running and total_replies < DAILY_ACTION_LIMIT:
+            # 보류 항목: 백그라운드 재시도에서 생성에 성공한 것만 다시 방문
+            ready = []
+            if len(retry_queue) and self.is_running and total_replies < DAILY_ACTION_LIMIT:
+                ready, failed = await retry_queue.drain()
+                for item in failed:
+                    self.event("comment", f"  [{item['nick']}] AI 대댓글 재시도 {item['attempts']}회 실패 - skip",
+                               target=item["comment_no"], outcome="failed", reason="ai_failed", retry=True)
+                total_skips += len(failed)
+
+            if ready and self.is_running:
                 self.log(f"\n{'=' * 50}")
-                self.log(f"보류 목록 재시도: {len(all_deferred)}건")
+                self.log(f"보류 목록 재방문: 재생성 성공 {len(ready)}건 / 실패 {len(retry_queue) - len(ready)}건")
                 self.log("=" * 50)
 
-                for i, item in enumerate(all_deferred):
+                for i, item in enumerate(ready):
                     if not self.is_running:
                         break
 
                     if total_replies >= DAILY_ACTION_LIMIT:
-                        self.log(f"\n일일 액션 제한({DAILY_ACTION_LIMIT}건) 도달 → 중단")
+                        self.event("limit", f"\n일일 액션 제한({DAILY_ACTION_LIMIT}건) 도달 → 중단", reason="daily_limit")
                         break
 
-                    self.log(f"\n[보류 {i+1}/{len(all_deferred)}] {item['nick']} (댓글#{item['comment_no']})")
+                    self.log(f"\n[보류 {i+1}/{len(ready)}] {item['nick']} (댓글#{item['comment_no']})")
 
                     if item["comment_no"] in replied_set:
-                        self.log(f"  이번 실행에서 이미 처리됨 - skip")
+                        self.event("comment", f"  이미 처리된 댓글 - skip", target=item["comment_no"],
+                                   outcome="skipped", reason="ledger", retry=True)
                         total_skips += 1
                         continue
 
-                    content, main_frame = await get_post_content(
-                        self.page, item["blog_id"], item["log_no"],
-                        self.log, self._get_main_frame
-                    )
+                    async with self.timed("post_open", target=item["log_no"], retry=True):
+                        content, main_frame = await get_post_content(
+                            self.page, item["blog_id"], item["log_no"],
+                            self.log, self._get_main_frame, urls=self.urls
+                        )
 
                     if not main_frame:
-                        self.log(f"  mainFrame 못 찾음 - skip")
+                        self.event("comment", f"  mainFrame 못 찾음 - skip", target=item["comment_no"],
+                                   outcome="skipped", reason="no_main_frame", retry=True)
                         total_skips += 1
                         continue
 
@@ -407,36 +550,35 @@ class ReplyBot(NaverBaseBot):
 
                     loaded = await load_comments(main_frame, self.log)
                     if not loaded:
+                        self.event("comment", target=item["comment_no"], outcome="skipped",
+                                   reason="comments_not_loaded", retry=True)
                         total_skips += 1
                         continue
 
-                    already = await self._check_already_replied(
-                        main_frame, item["comment_no"], item["blog_id"]
+                    reply_index = self._build_reply_index(await extract_comments(main_frame))
+                    already = self._check_already_replied(
+                        reply_index, item["comment_no"], item["blog_id"]
                     )
                     if already:
-                        self.log(f"  이미 답글 있음 - skip")
+                        self.event("comment", f"  이미 답글 있음 - skip", target=item["comment_no"],
+                                   outcome="skipped", reason="already_replied", retry=True)
+                        self._record_reply(item["log_no"], item["comment_no"], "already", dry_run)
                         total_skips += 1
                         continue
 
-                    if dry_run:
-                        generated = f"[DRY-RUN] {item['comment_text'][:20]}"
-                    else:
-                        generated = await ai_generator.generate_reply(
-                            item["post_content"]["title"],
-                            item["post_content"]["body"],
-                            item["comment_text"],
-                        )
-                        if not generated:
-                            self.log(f"  AI 대댓글 재시도 실패 - skip")
-                            total_skips += 1
-                            continue
-
+                    generated = item["generated"]
                     self.log(f"  AI 대댓글: '{generated}'")
 
-                    result = await write_reply(main_frame, item["comment_no"], generated, self.log, dry_run=dry_run)
+                    async with self.timed("write_reply", target=item["comment_no"], retry=True):
+                        result = await write_reply(main_frame, item["comment_no"], generated, self.log, dry_run=dry_run)
                     if result:
+                        self.event("comment", target=item["comment_no"], outcome="replied", retry=True)
                         total_replies += 1
+                        replied_set.add(item["comment_no"])
+                        self._record_reply(item["log_no"], item["comment_no"], "replied", dry_run)
                     else:
+                        self.event("comment", target=item["comment_no"], outcome="failed",
+                                   reason="write_failed", retry=True)
                         total_skips += 1
 
                     await HumanDelay.between_requests()
@@ -446,7 +588,12 @@ class ReplyBot(NaverBaseBot):
             self.log("=" * 50)
 
         except Exception as e:
-            self.log(f"실행 오류: {str(e)}")
+            self.event("error", f"실행 오류: {str(e)}", reason=type(e).__name__)
         finally:
+            retry_queue.cancel()
             await self.close_browser()
+            self.close_ledger()
+            if owns_generator:
+                ai_generator.close()
+            self.finish_run()
             self.is_running = False
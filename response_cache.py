@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Optional
+
+
+class ResponseCache:
+    """AI 생성 결과 캐시 (SQLite)
+
+    프롬프트 입력의 해시를 키로 생성 결과를 저장한다. ttl이 지난 항목은 무시하고,
+    max_entries를 넘으면 가장 오래 사용하지 않은 항목부터 지운다 (LRU).
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_entries: int = 2000):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        raw = json.dumps(parts, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        value, created_at = row
+        now = time.time()
+        if now - created_at > self.ttl:
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.conn.commit()
+            return None
+        self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        self.conn.commit()
+        return value
+
+    def put(self, key: str, value: str):
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+            (key, value, now, now),
+        )
+        self._evict(now)
+        self.conn.commit()
+
+    def _evict(self, now: float):
+        self.conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        count = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,113 @@
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Optional
+
+# 단계 소요 시간 히스토그램 구간 (초)
+HISTOGRAM_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 30, 60)
+
+
+class EventRecorder:
+    """실행 중 일어난 일을 구조화 이벤트로 기록 (JSONL + 메모리 집계)
+
+    이벤트 필드: event(종류), target(댓글 번호/이웃 ID 등), phase(단계),
+    duration(초), outcome(결과), reason(스킵/실패 사유 코드) + 임의 필드.
+    directory를 주면 실행마다 {directory}/{시각}_{source}.jsonl 파일에 한 줄씩 남긴다.
+    counters/reasons/durations는 run_end 요약에 들어간다.
+    """
+
+    def __init__(self, directory: Optional[str] = None, source: str = "bot"):
+        self.directory = directory
+        self.source = source
+        self.path: Optional[str] = None
+        self._file = None
+        self._reset()
+
+    def _reset(self):
+        self.started = time.perf_counter()
+        self.counters = Counter()
+        self.reasons = Counter()
+        self.durations = defaultdict(list)
+
+    def start_run(self, **fields) -> dict:
+        """새 실행 시작: 집계를 비우고 새 파일을 연다"""
+        self.close()
+        self._reset()
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.source}.jsonl"
+            self.path = os.path.join(self.directory, name)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self.emit("run_start", **fields)
+
+    def emit(self, event: str, target=None, phase: Optional[str] = None,
+             duration: Optional[float] = None, outcome: Optional[str] = None,
+             reason: Optional[str] = None, **fields) -> dict:
+        record = {"ts": datetime.now().isoformat(timespec="milliseconds"), "event": event}
+        for key, value in (("target", target), ("phase", phase), ("duration", duration),
+                           ("outcome", outcome), ("reason", reason)):
+            if value is not None:
+                record[key] = round(value, 4) if key == "duration" else value
+        record.update(fields)
+
+        self.counters[f"{event}/{outcome}" if outcome else event] += 1
+        if reason:
+            self.reasons[f"{event}/{reason}"] += 1
+        if duration is not None:
+            self.durations[phase or event].append(duration)
+
+        if self._file:
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            self._file.flush()
+        return record
+
+    @staticmethod
+    def _histogram(values: list) -> dict:
+        hist = {f"<={b}s": 0 for b in HISTOGRAM_BUCKETS}
+        hist[f">{HISTOGRAM_BUCKETS[-1]}s"] = 0
+        for v in values:
+            for b in HISTOGRAM_BUCKETS:
+                if v <= b:
+                    hist[f"<={b}s"] += 1
+                    break
+            else:
+                hist[f">{HISTOGRAM_BUCKETS[-1]}s"] += 1
+        return hist
+
+    def phase_stats(self) -> dict:
+        stats = {}
+        for phase, values in self.durations.items():
+            ordered = sorted(values)
+            n = len(ordered)
+            stats[phase] = {
+                "count": n,
+                "total_s": round(sum(ordered), 3),
+                "mean_s": round(sum(ordered) / n, 3),
+                "p50_s": round(ordered[n // 2], 3),
+                "p90_s": round(ordered[min(n - 1, int(n * 0.9))], 3),
+                "max_s": round(ordered[-1], 3),
+                "histogram": self._histogram(ordered),
+            }
+        return stats
+
+    def summary(self) -> dict:
+        return {
+            "wall_s": round(time.perf_counter() - self.started, 3),
+            "counters": dict(self.counters),
+            "reasons": dict(self.reasons),
+            "phases": self.phase_stats(),
+        }
+
+    def end_run(self, **fields) -> dict:
+        """run_end 이벤트(요약 포함)를 남기고 파일을 닫는다. 요약을 반환"""
+        summary = self.summary()
+        self.emit("run_end", summary=summary, **fields)
+        self.close()
+        return summary
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
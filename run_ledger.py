@@ -0,0 +1,180 @@
+import os
+import sqlite3
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+# 서로이웃 신청 실패(시간 초과, 팝업 못 찾음 등)를 이 횟수까지는 다음 실행에서 다시 시도
+NEIGHBOR_MAX_FAILURES = 3
+
+
+class RunLedger:
+    """실행 기록 (SQLite)
+
+    처리한 댓글/이웃신청/이웃 글 댓글을 디스크에 남겨서, 중단 후 재시작해도
+    이미 끝난 대상은 페이지 로드 없이 건너뛸 수 있게 한다.
+    owner는 로그인한 계정 ID(user_id)이고, 세 봇 모두 같은 owner로 기록한다.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS replied_comments (
+                owner TEXT NOT NULL,
+                comment_no TEXT NOT NULL,
+                log_no TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                processed_at TEXT NOT NULL,
+                PRIMARY KEY (owner, comment_no)
+            );
+            CREATE TABLE IF NOT EXISTS neighbor_requests (
+                owner TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                attempted_at TEXT NOT NULL,
+                failures INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (owner, user_id)
+            );
+            CREATE TABLE IF NOT EXISTS buddy_comments (
+                owner TEXT NOT NULL,
+                target_id TEXT NOT NULL,
+                log_no TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                commented_at TEXT NOT NULL,
+                PRIMARY KEY (owner, target_id, log_no)
+            );
+            CREATE TABLE IF NOT EXISTS buddy_snapshots (
+                owner TEXT NOT NULL,
+                group_name TEXT NOT NULL,
+                sort_order TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                blog_id TEXT NOT NULL,
+                nick TEXT NOT NULL,
+                update_date TEXT NOT NULL,
+                added_date TEXT NOT NULL,
+                synced_at TEXT NOT NULL,
+                PRIMARY KEY (owner, group_name, sort_order, position)
+            );
+        """)
+        # 이전 버전 ledger.db에는 failures 열이 없다
+        columns = {r[1] for r in self.conn.execute("PRAGMA table_info(neighbor_requests)")}
+        if "failures" not in columns:
+            self.conn.execute(
+                "ALTER TABLE neighbor_requests ADD COLUMN failures INTEGER NOT NULL DEFAULT 0"
+            )
+        self.conn.commit()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def close(self):
+        self.conn.close()
+
+    # ── 대댓글 ──
+
+    def replied_comment_nos(self, owner: str) -> Set[str]:
+        rows = self.conn.execute(
+            "SELECT comment_no FROM replied_comments WHERE owner = ?", (owner,)
+        )
+        return {r[0] for r in rows}
+
+    def mark_comment_replied(self, owner: str, log_no: str, comment_no: str,
+                             outcome: str = "replied"):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO replied_comments VALUES (?, ?, ?, ?, ?)",
+            (owner, comment_no, log_no, outcome, self._now()),
+        )
+        self.conn.commit()
+
+    # ── 서로이웃 신청 ──
+
+    def attempted_neighbors(self, owner: str) -> Set[str]:
+        """다시 신청하지 않을 계정 (성공했거나 NEIGHBOR_MAX_FAILURES번 실패한 계정)"""
+        rows = self.conn.execute(
+            "SELECT user_id FROM neighbor_requests "
+            "WHERE owner = ? AND (outcome != 'failed' OR failures >= ?)",
+            (owner, NEIGHBOR_MAX_FAILURES),
+        )
+        return {r[0] for r in rows}
+
+    def mark_neighbor_attempted(self, owner: str, user_id: str, outcome: str):
+        """outcome이 "failed"면 실패 횟수를 하나 올린다 (일시적인 실패는 다음 실행에서 재시도)"""
+        self.conn.execute(
+            "INSERT INTO neighbor_requests (owner, user_id, outcome, attempted_at, failures) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (owner, user_id) DO UPDATE SET outcome = excluded.outcome, "
+            "attempted_at = excluded.attempted_at, "
+            "failures = neighbor_requests.failures + excluded.failures",
+            (owner, user_id, outcome, self._now(), 1 if outcome == "failed" else 0),
+        )
+        self.conn.commit()
+
+    # ── 서로이웃 댓글 ──
+
+    def is_post_commented(self, owner: str, target_id: str, log_no: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM buddy_comments WHERE owner = ? AND target_id = ? AND log_no = ?",
+            (owner, target_id, log_no),
+        ).fetchone()
+        return row is not None
+
+    def mark_post_commented(self, owner: str, target_id: str, log_no: str,
+                            outcome: str = "commented"):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO buddy_comments VALUES (?, ?, ?, ?, ?)",
+            (owner, target_id, log_no, outcome, self._now()),
+        )
+        self.conn.commit()
+
+    # ── 이웃 목록 스냅샷 ──
+
+    def buddy_snapshot(self, owner: str, group_name: str,
+                       sort_order: str) -> Tuple[List[dict], Optional[str]]:
+        """마지막으로 저장한 이웃 관리 표 (표시 순서대로)와 가장 오래된 행의 수집 시각
+
+        스냅샷에서 이어 붙인 행은 처음 수집한 시각을 그대로 유지하므로, 반환하는 시각이
+        오래됐으면 목록 일부를 그동안 다시 읽지 않았다는 뜻이다.
+        """
+        rows = self.conn.execute(
+            "SELECT blog_id, nick, update_date, added_date, synced_at FROM buddy_snapshots "
+            "WHERE owner = ? AND group_name = ? AND sort_order = ? ORDER BY position",
+            (owner, group_name, sort_order),
+        ).fetchall()
+        if not rows:
+            return [], None
+        buddies = [
+            {"blog_id": r[0], "nick": r[1], "update_date": r[2], "added_date": r[3],
+             "synced_at": r[4]}
+            for r in rows
+        ]
+        return buddies, min(r[4] for r in rows)
+
+    def drop_buddy_snapshot_row(self, owner: str, group_name: str, sort_order: str,
+                                blog_id: str):
+        """스냅샷에서 가져온 이웃이 더 이상 확인되지 않을 때 (삭제된 이웃 등) 그 행만 지운다"""
+        self.conn.execute(
+            "DELETE FROM buddy_snapshots "
+            "WHERE owner = ? AND group_name = ? AND sort_order = ? AND blog_id = ?",
+            (owner, group_name, sort_order, blog_id),
+        )
+        self.conn.commit()
+
+    def save_buddy_snapshot(self, owner: str, group_name: str, sort_order: str,
+                            buddies: List[dict]):
+        """synced_at이 있는 행(스냅샷에서 이어 붙인 행)은 그 시각을, 없으면 지금 시각을 기록"""
+        now = self._now()
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM buddy_snapshots WHERE owner = ? AND group_name = ? AND sort_order = ?",
+                (owner, group_name, sort_order),
+            )
+            self.conn.executemany(
+                "INSERT INTO buddy_snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (owner, group_name, sort_order, i, b["blog_id"], b["nick"],
+                     b["update_date"], b["added_date"], b.get("synced_at") or now)
+                    for i, b in enumerate(buddies)
+                ],
+            )
@@ -1,37 +1,85 @@
+import os
 import random
 import asyncio
 
+# 브라우저 프로필, 실행 기록 등이 저장되는 디렉터리
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".naver_automation")
+
+# 딜레이 프로필: 모든 인위적 대기에 곱하는 배율
+#   production = 1.0 (실제 운영), zero = 0 (벤치마크/로컬 mock), 그 외 숫자는 그대로 배율
+DELAY_PROFILES = {"production": 1.0, "zero": 0.0}
+# zero 프로필에서도 클릭 뒤 페이지/위젯이 갱신될 틈은 남겨둔다
+ZERO_DELAY_FLOOR = 0.05
+
+_delay_scale = 1.0
+_slept_total = 0.0
+
+
+def set_delay_profile(profile) -> float:
+    """딜레이 프로필 설정 ('production' | 'zero' | 배율 숫자). 적용된 배율을 반환"""
+    global _delay_scale
+    if isinstance(profile, str) and profile in DELAY_PROFILES:
+        scale = DELAY_PROFILES[profile]
+    else:
+        scale = float(profile)
+    if scale < 0:
+        raise ValueError(f"딜레이 배율은 0 이상이어야 합니다: {profile}")
+    _delay_scale = scale
+    return scale
+
+
+def get_delay_scale() -> float:
+    return _delay_scale
+
+
+def slept_total() -> float:
+    """지금까지 인위적 대기로 보낸 시간(초) 합계"""
+    return _slept_total
+
+
+async def _sleep(min_sec: float, max_sec: float) -> float:
+    """모든 인위적 대기가 거치는 곳. 프로필 배율을 적용하고 실제 대기 시간을 반환"""
+    global _slept_total
+    if _delay_scale > 0:
+        wait = random.uniform(min_sec, max_sec) * _delay_scale
+    else:
+        wait = min(ZERO_DELAY_FLOOR, max_sec)
+    _slept_total += wait
+    await asyncio.sleep(wait)
+    return wait
+
+
 class HumanDelay:
     """자동화 탐지 회피를 위한 인간적인 딜레이"""
 
     @staticmethod
     async def page_load():
         """페이지 로드 후 대기 (2~5초)"""
-        await asyncio.sleep(random.uniform(2.0, 5.0))
+        await _sleep(2.0, 5.0)
 
     @staticmethod
     async def before_click():
         """클릭 전 대기 (0.5~2.0초)"""
-        await asyncio.sleep(random.uniform(0.5, 2.0))
+        await _sleep(0.5, 2.0)
 
     @staticmethod
     async def between_requests():
         """이웃 신청 간 대기 (2.0~5.0초)"""
-        await asyncio.sleep(random.uniform(2.0, 5.0))
+        await _sleep(2.0, 5.0)
 
 
 async def random_sleep(min_sec: float, max_sec: float):
     """고정 sleep 대체용 랜덤 sleep"""
-    await asyncio.sleep(random.uniform(min_sec, max_sec))
+    await _sleep(min_sec, max_sec)
 
 
 async def maybe_idle(log=None):
     """10% 확률로 5~15초 idle (사람처럼 잠깐 멈추기)"""
-    if random.random() < 0.10:
+    if random.random() < 0.10 and _delay_scale > 0:
         wait = random.uniform(5.0, 15.0)
         if log:
-            log(f"  [idle] {wait:.1f}초 대기...")
-        await asyncio.sleep(wait)
+            log(f"  [idle] {wait * _delay_scale:.1f}초 대기...")
+        await _sleep(wait, wait)
 
 
 DAILY_ACTION_LIMIT = 50  # 계정당 일일 액션(댓글/대댓글) 최대 수
@@ -39,11 +87,12 @@ DAILY_ACTION_LIMIT = 50  # 계정당 일일 액션(댓글/대댓글) 최대 수
 
 async def simulate_reading(body_length: int = 0, log=None):
     if body_length > 1000:
-        wait = random.uniform(8.0, 15.0)
+        low, high = 8.0, 15.0
     elif body_length > 300:
-        wait = random.uniform(5.0, 10.0)
+        low, high = 5.0, 10.0
     else:
-        wait = random.uniform(3.0, 7.0)
+        low, high = 3.0, 7.0
+    wait = random.uniform(low, high)
     if log:
-        log(f"  [읽는 중] {wait:.1f}초 체류...")
-    await asyncio.sleep(wait)
+        log(f"  [읽는 중] {wait * _delay_scale:.1f}초 체류...")
+    await _sleep(wait, wait)